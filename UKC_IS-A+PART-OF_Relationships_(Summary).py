@@ -0,0 +1,14 @@
+"""
+UKC ISA + PART-OF (SUMMARY)
+This script generates hierarchical tree visualizations of the UKC example for both ISA and PART-OF relationships, reduced automatically to a node budget.
+"""
+
+from kfm import ukc
+from kfm.cache import render
+
+# Create the visualization
+tree_viz = ukc.isa_part_of_summary_figure()
+
+# Save the visualization as a PDF file
+render(tree_viz, "UKC_ISA_PARTOF_SUMMARY", format="pdf")
+print("ISA and PART-OF tree visualization saved as 'UKC_ISA_PARTOF_SUMMARY.pdf'")
@@ -0,0 +1,14 @@
+"""
+IS-A UKC (SUMMARY)
+This script generates an IS-A hierarchical tree visualization of the UKC example, reduced automatically to a node budget.
+"""
+
+from kfm import ukc
+from kfm.cache import render
+
+# Create the visualization
+tree_viz = ukc.isa_summary_figure()
+
+# Save the visualization as a PDF file
+render(tree_viz, "UKC_ISA_SUMMARY", format="pdf")
+print("Tree visualization saved as 'UKC_ISA_SUMMARY.pdf'")
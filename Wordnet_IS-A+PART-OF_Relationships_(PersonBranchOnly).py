@@ -4,141 +4,12 @@ This script generates hierarchical tree visualizations of a WordNet example for
 Here we focus on the PERSON branch.
 """
 
-import graphviz
-
-
-def create_node(graph, node, parent=None, relationship="ISA"):
-    """
-    Creates a node in the graph and links it to the parent node if specified.
-
-    Args:
-        graph (graphviz.Digraph): The Graphviz Digraph object.
-        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
-        parent (str, optional): The ID of the parent node. Default is None.
-        relationship (str): The type of relationship for the edge ("ISA" or "PART-OF").
-    """
-    node_id = f"{node['name']}_{node['id']}"
-    # Adding the node to the graph with a specific shape and style
-    graph.node(node_id, f"{node['name']}\n{node['id']}", shape="rect", style="rounded")
-    if parent:
-        # Creating an edge based on the relationship type
-        if relationship == "ISA":
-            graph.edge(node_id, parent, label="IS-A")
-        elif relationship == "PART-OF":
-            graph.edge(parent, node_id, label="PART-OF", style="dashed", dir="back")
-    # Recursively creating child nodes if present
-    for child in node.get("children", []):
-        create_node(graph, child, node_id, relationship)
-
-
-def create_tree_visualization(isa_trees, part_of_trees):
-    """
-    Creates a combined ISA and PART-OF tree visualization from the given trees.
-
-    Args:
-        isa_trees (list): A list of ISA trees, each represented as a list of dictionaries.
-        part_of_trees (list): A list of PART-OF trees, each represented as a list of dictionaries.
-
-    Returns:
-        graphviz.Digraph: The resulting Graphviz Digraph object.
-    """
-    dot = graphviz.Digraph(comment="WordNet Hierarchical Trees")
-    dot.attr(rankdir="BT")  # Bottom to Top direction
-
-    # Create nodes for ISA trees
-    root_id = "entityisa_01740"
-    # dot.node(root_id, "contextual entity\n47321", shape='rect', style='rounded')
-    dot.node(root_id, "entity\n47321", shape="rect", style="rounded")
-    for tree in isa_trees:
-        for subtree in tree:
-            create_node(dot, subtree, root_id, "ISA")
-
-    # Create nodes for PART-OF tree
-    part_of_root_id = "entitypartof_01740"
-    dot.node(part_of_root_id, "entity\n01740", shape="rect", style="rounded")
-    for tree in part_of_trees:
-        for subtree in tree:
-            create_node(dot, subtree, part_of_root_id, "PART-OF")
-
-    # dot.node("contentity_01740", "entity\n01740", shape='box', style='rounded')
-    # dot.edge("entityisa_01740", "contentity_01740", "IS-A")
-
-    return dot
-
-
-# Definizione dell'albero PART-OF
-part_of_tree_education = [
-    {
-        "id": "00100",
-        "name": "education",
-        "children": [
-            {"id": "28560", "name": "academic"},
-            {"id": "08660", "name": "Ph.D."},
-        ],
-    }
-]
-
-part_of_tree_people = [
-    {
-        "id": "00600",
-        "name": "people",
-        "children": [
-            {"id": "07698", "name": "child"},
-            {"id": "56237", "name": "undergraduate"},
-            {"id": "65489", "name": "graduate"},
-        ],
-    },
-]
-
-# Definizione degli alberi IS-A
-tree_person = [
-    {
-        "id": "10502",
-        "name": "person",
-        "children": [
-            {
-                "id": "07846",
-                "name": "adult",
-                "children": [
-                    {
-                        "id": "08659",
-                        "name": "professional",
-                        "children": [
-                            {
-                                "id": "25323",
-                                "name": "professor",
-                                "children": [
-                                    {"id": "28560", "name": "academic"},
-                                    {"id": "08660", "name": "Ph.D."},
-                                ],
-                            },
-                        ],
-                    },
-                    {
-                        "id": "45356",
-                        "name": "student",
-                        "children": [
-                            {"id": "56237", "name": "undergraduate"},
-                            {"id": "65489", "name": "graduate"},
-                        ],
-                    },
-                ],
-            },
-            {
-                "id": "07698",
-                "name": "child",
-            },
-        ],
-    }
-]
-
-# Combine all trees
-isa_trees = [tree_person]
-part_of_trees = [part_of_tree_people, part_of_tree_education]
+from kfm import wordnet
+from kfm.cache import render
 
 # Create the visualization
-tree_viz = create_tree_visualization(isa_trees, part_of_trees)
+tree_viz = wordnet.person_branch_figure()
 
 # Save the visualization as a PDF file
-tree_viz.render("wordnet_ISA&PARTOF_PERSON", format="pdf", cleanup=True)
+render(tree_viz, "wordnet_ISA&PARTOF_PERSON", format="pdf")
 print("Tree visualization saved as 'wordnet_ISA&PARTOF_PERSON.pdf'")
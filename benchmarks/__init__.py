@@ -0,0 +1,4 @@
+"""
+KFM BENCHMARKS
+Benchmarks for the kfm package, run from the repository root with `python -m benchmarks.<name>`.
+"""
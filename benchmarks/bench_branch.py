@@ -0,0 +1,75 @@
+"""
+BRANCH BENCHMARK
+Reports kfm.branch extraction time against scanning the master trees, for branches of several sizes.
+
+Run from the repository root:
+    python -m benchmarks.bench_branch --size 1000000 --depths 9,7,5,3
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm.branch import BranchIndex
+from kfm.hierarchy import Hierarchy
+from kfm.walk import flatten
+
+
+def scan(isa, part_of, root_id):
+    """
+    Extracts a branch without an index: walks the IS-A tree to the root, then scans every PART-OF edge.
+
+    Args:
+        isa (list): The master IS-A tree.
+        part_of (list): The master PART-OF tree.
+        root_id (str): The identifier of the root concept.
+
+    Returns:
+        tuple: The number of concepts and of touching PART-OF edges.
+    """
+    nodes = flatten(isa)[0]
+    root = next(node for node in nodes if node["id"] == root_id)
+    members = {node["id"] for node in flatten([root])[0]}
+    nodes, keys, parents, _ = flatten(part_of, key=lambda node: node["id"])
+    touching = [
+        (child, parent)
+        for child, parent in zip(keys, parents)
+        if parent is not None and (child in members or parent in members)
+    ]
+    return len(members), len(touching)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--depths", default="9,7,5,3")
+    args = parser.parse_args()
+
+    isa = make_tree(args.size, 4)
+    part_of = make_tree(args.size, 7)
+    start = time.perf_counter()
+    branches = BranchIndex(Hierarchy.from_trees([isa], [part_of]))
+    print(f"index built in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'depth':>6}{'concepts':>10}{'attached':>10}{'scan s':>9}{'index s':>10}")
+    for depth in (int(d) for d in args.depths.split(",")):
+        # The first concept at that depth of a complete 4-ary tree
+        root_id = f"{(4**depth - 1) // 3:07d}"
+        start = time.perf_counter()
+        expected = scan(isa, part_of, root_id)
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        branch = branches.extract([root_id])
+        index_time = time.perf_counter() - start
+        concepts = len(flatten(branch.trees[0])[0])
+        attached = sum(len(flatten(tree)[0]) - 1 for tree in branch.attached)
+        assert (concepts, attached) == expected
+        print(
+            f"{depth:>6}{concepts:>10}{attached:>10}{scan_time:>9.2f}"
+            f"{index_time:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+CLOSURE BENCHMARK
+Reports subsumption queries per second of kfm.closure against walking up the parents.
+
+The tree case indexes one IS-A tree; the DAG case indexes the union of that tree
+and a PART-OF tree of different fanout over the same concepts, so that most
+concepts have two parents.
+
+Run from the repository root:
+    python -m benchmarks.bench_closure --sizes 100000,1000000
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm.closure import ClosureIndex
+from kfm.hierarchy import Hierarchy
+
+
+def naive_subsumes(parents_of, ancestor, descendant):
+    """
+    Checks subsumption by walking up the parents of `descendant`.
+
+    Args:
+        parents_of (list): The parent concepts of every concept.
+        ancestor (int): The candidate ancestor.
+        descendant (int): The candidate descendant.
+
+    Returns:
+        bool: True if `ancestor` is reached.
+    """
+    seen = set()
+    stack = list(parents_of[descendant])
+    while stack:
+        concept = stack.pop()
+        if concept == ancestor:
+            return True
+        if concept not in seen:
+            seen.add(concept)
+            stack.extend(parents_of[concept])
+    return False
+
+
+def rate(function, pairs):
+    """Returns the calls per second of `function` over the query pairs."""
+    start = time.perf_counter()
+    for ancestor, descendant in pairs:
+        function(ancestor, descendant)
+    return len(pairs) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--queries", type=int, default=200000)
+    args = parser.parse_args()
+
+    rnd = random.Random(1234)
+    print(
+        f"{'case':>5}{'concepts':>10}{'build s':>9}{'naive q/s':>12}"
+        f"{'index q/s':>12}{'speedup':>9}{'descendants s':>15}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        isa = make_tree(size, 4)
+        part_of = make_tree(size, 7)
+        for case, hierarchy, relationship in (
+            ("tree", Hierarchy.from_trees([isa]), "IS-A"),
+            ("dag", Hierarchy.from_trees([isa], [part_of]), None),
+        ):
+            start = time.perf_counter()
+            index = ClosureIndex(hierarchy, relationship)
+            build = time.perf_counter() - start
+
+            parents_of = [[] for _ in range(size)]
+            for edges in hierarchy.edges.values():
+                for child, parent in zip(*edges):
+                    parents_of[child].append(parent)
+            # Half the queries are true: an ancestor of a random concept
+            pairs = []
+            for _ in range(args.queries // 2):
+                concept = rnd.randrange(size)
+                ancestors = index.ancestors(concept) or [0]
+                pairs.append((rnd.choice(ancestors), concept))
+                pairs.append((rnd.randrange(size), concept))
+            for ancestor, descendant in pairs[:1000]:
+                assert index.subsumes(ancestor, descendant) == naive_subsumes(
+                    parents_of, ancestor, descendant
+                )
+
+            naive = rate(lambda a, d: naive_subsumes(parents_of, a, d), pairs)
+            indexed = rate(index.subsumes, pairs)
+            start = time.perf_counter()
+            total = sum(len(index.descendants(c)) for c in range(0, size, 97))
+            enumerate_time = time.perf_counter() - start
+            assert total
+            print(
+                f"{case:>5}{size:>10}{build:>9.2f}{naive:>12.0f}"
+                f"{indexed:>12.0f}{indexed / naive:>8.1f}x{enumerate_time:>15.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+DATABASE BENCHMARK
+Reports kfm.database bulk write, open and indexed lookup times for a large hierarchy and entity graph.
+
+Run from the repository root:
+    python -m benchmarks.bench_database --size 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm.database import GraphDatabase
+
+
+def graph(size, seed=0):
+    """
+    Creates a synthetic EG graph of students attending lectures.
+
+    Args:
+        size (int): The number of relationships.
+        seed (int, optional): The seed of the random generator. Default is 0.
+
+    Returns:
+        tuple: The entity and relationship lists.
+    """
+    rng = random.Random(seed)
+    students = max(1, size // 10)
+    lectures = max(1, size // 100)
+    entities = [
+        {"id": f"{i:07d}", "name": "student", "attributes": {"name": f"student {i}"}}
+        for i in range(students)
+    ]
+    entities += [{"id": f"{i:07d}", "name": "lecture"} for i in range(lectures)]
+    relationships = [
+        {
+            "source": {"name": "student", "id": f"{i % students:07d}"},
+            "target": {"name": "lecture", "id": f"{rng.randrange(lectures):07d}"},
+            "label": "attends",
+        }
+        for i in range(size)
+    ]
+    return entities, relationships
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    args = parser.parse_args()
+
+    trees = [make_tree(args.size, 4)]
+    entities, relationships = graph(args.size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "kfm.db")
+        with GraphDatabase(path) as database:
+            start = time.perf_counter()
+            database.write_trees("synthetic", "IS-A", trees)
+            print(
+                f"{args.size} tree nodes written in {time.perf_counter() - start:.2f}s"
+            )
+            start = time.perf_counter()
+            database.write_graph("synthetic", entities, relationships)
+            print(
+                f"{len(entities)} entities and {len(relationships)} relationships "
+                f"written in {time.perf_counter() - start:.2f}s"
+            )
+        print(f"database size {os.path.getsize(path) / 2**20:.1f} MB")
+
+        start = time.perf_counter()
+        database = GraphDatabase(path)
+        print(f"opened in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        rng = random.Random(1)
+        concept_ids = [f"{rng.randrange(args.size):07d}" for _ in range(args.lookups)]
+        for name, lookup in (
+            ("children", lambda i: database.children("synthetic", "IS-A", i)),
+            ("parents", lambda i: database.parents("synthetic", "IS-A", i)),
+            (
+                "relationships",
+                lambda i: database.relationships("synthetic", target=("lecture", i)),
+            ),
+        ):
+            start = time.perf_counter()
+            for concept_id in concept_ids:
+                lookup(concept_id)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>14}: {elapsed / args.lookups * 1e6:.1f}us per lookup")
+
+        start = time.perf_counter()
+        assert database.read_trees("synthetic", "IS-A") == trees
+        print(f"trees read back in {time.perf_counter() - start:.2f}s")
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
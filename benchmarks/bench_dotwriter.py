@@ -0,0 +1,77 @@
+"""
+DOTWRITER BENCHMARK
+Reports time and peak memory of building a large figure with graphviz.Digraph and with kfm.dotwriter.
+
+Run from the repository root:
+    python -m benchmarks.bench_dotwriter --sizes 100000,500000
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import graphviz
+
+from benchmarks.synthetic import make_tree
+from kfm import wordnet
+from kfm.dotwriter import dot_file
+
+
+def measure(function):
+    """
+    Runs a function once for time and once under tracemalloc for memory.
+
+    Args:
+        function (callable): The function to run.
+
+    Returns:
+        tuple: The elapsed seconds and the peak traced memory in bytes.
+    """
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="100000,500000")
+    args = parser.parse_args()
+
+    path = "bench_dotwriter.gv"
+    print(
+        f"{'nodes':>8}{'digraph s':>11}{'digraph MB':>12}"
+        f"{'stream s':>10}{'stream MB':>11}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        trees = [make_tree(size)]
+
+        def digraph():
+            graph = wordnet.create_isa_tree_visualization(trees, graphviz.Digraph)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(graph.source)
+
+        def stream():
+            with dot_file(path) as graph:
+                wordnet.create_isa_tree_visualization(trees, graph)
+
+        digraph_time, digraph_peak = measure(digraph)
+        with open(path, encoding="utf-8") as file:
+            expected = file.read()
+        stream_time, stream_peak = measure(stream)
+        with open(path, encoding="utf-8") as file:
+            assert file.read() == expected
+        os.remove(path)
+        print(
+            f"{size:>8}{digraph_time:>11.2f}{digraph_peak / 2**20:>12.1f}"
+            f"{stream_time:>10.2f}{stream_peak / 2**20:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
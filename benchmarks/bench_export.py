@@ -0,0 +1,46 @@
+"""
+EXPORT BENCHMARK
+Reports throughput and peak memory of every kfm.export format on a large hierarchy.
+
+Run from the repository root:
+    python -m benchmarks.bench_export --size 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_tree
+from kfm.export import FORMATS, export, hierarchy_edges, hierarchy_nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000000)
+    args = parser.parse_args()
+
+    relations = {"IS-A": [make_tree(args.size)]}
+    print(f"{'format':>10}{'size MB':>9}{'seconds':>9}{'edges/s':>11}{'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for format in FORMATS:
+            path = os.path.join(directory, f"export.{format}")
+            start = time.perf_counter()
+            export(path, hierarchy_nodes(relations), hierarchy_edges(relations))
+            elapsed = time.perf_counter() - start
+            # Memory is traced in a second run, as tracemalloc slows the first down
+            tracemalloc.start()
+            export(path, hierarchy_nodes(relations), hierarchy_edges(relations))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            size = os.path.getsize(path) / 2**20
+            rate = (args.size - 1) / elapsed
+            print(
+                f"{format:>10}{size:>9.1f}{elapsed:>9.2f}{rate:>11.0f}"
+                f"{peak / 2**20:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
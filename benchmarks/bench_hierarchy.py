@@ -0,0 +1,67 @@
+"""
+HIERARCHY BENCHMARK
+Reports memory per concept of the nested-dict trees against the kfm.hierarchy store.
+
+Run from the repository root:
+    python -m benchmarks.bench_hierarchy --sizes 100000,1000000
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm.hierarchy import Hierarchy
+
+
+def dict_nbytes(trees):
+    """
+    Returns the memory used by nested-dict trees: dicts, children lists and strings.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+
+    Returns:
+        int: The total size in bytes.
+    """
+    size = 0
+    stack = [node for tree in trees for node in tree]
+    while stack:
+        node = stack.pop()
+        size += sys.getsizeof(node)
+        size += sys.getsizeof(node["id"]) + sys.getsizeof(node["name"])
+        children = node.get("children")
+        if children:
+            size += sys.getsizeof(children)
+            stack.extend(children)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--fanout", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'concepts':>10}{'dict B/node':>13}{'store B/node':>14}"
+        f"{'compact B/node':>16}{'ratio':>8}{'convert s':>11}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        tree = make_tree(size, args.fanout)
+        dicts = dict_nbytes([tree])
+        start = time.perf_counter()
+        hierarchy = Hierarchy.from_trees([tree])
+        elapsed = time.perf_counter() - start
+        assert hierarchy.to_trees() == [tree]
+        indexed = hierarchy.nbytes()
+        hierarchy.compact()
+        compact = hierarchy.nbytes()
+        print(
+            f"{size:>10}{dicts / size:>13.1f}{indexed / size:>14.1f}"
+            f"{compact / size:>16.1f}{dicts / compact:>7.1f}x{elapsed:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+INCREMENTAL BENCHMARK
+Reports full build time against kfm.incremental rebuild time after editing subtrees of several sizes.
+
+Run from the repository root:
+    python -m benchmarks.bench_incremental --size 200000 --depths 8,6,4,2
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm import wordnet
+from kfm.incremental import IncrementalBuilder, diff
+
+
+def subtree_at(tree, depth):
+    """
+    Returns the first node at a given depth, following the first child from the root.
+
+    Args:
+        tree (list): A tree represented as a list holding the root dictionary.
+        depth (int): The depth of the node, 0 being the root.
+
+    Returns:
+        dict: The node.
+    """
+    node = tree[0]
+    for _ in range(depth):
+        node = node["children"][0]
+    return node
+
+
+def rename(node):
+    """
+    Renames every concept of a subtree in place.
+
+    Args:
+        node (dict): The root of the subtree.
+
+    Returns:
+        int: The number of renamed concepts.
+    """
+    count, stack = 0, [node]
+    while stack:
+        current = stack.pop()
+        current["name"] += " (edited)"
+        count += 1
+        stack.extend(current.get("children", ()))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--size", type=int, default=200000)
+    parser.add_argument("--depths", default="8,6,4,2")
+    parser.add_argument("--levels", type=int, default=8)
+    args = parser.parse_args()
+
+    trees = [make_tree(args.size)]
+    incremental = IncrementalBuilder(levels=args.levels)
+    wordnet.create_isa_tree_visualization(trees, create_node=incremental.create_node)
+    incremental.commit()
+
+    print(
+        f"{'depth':>6}{'edited':>9}{'changed':>9}{'full s':>9}"
+        f"{'rebuild s':>11}{'generated':>11}{'reused':>9}"
+    )
+    for depth in (int(d) for d in args.depths.split(",")):
+        old_trees = [make_tree(args.size)]
+        edited = rename(subtree_at(trees[0], depth))
+        report = diff(old_trees, trees)
+
+        start = time.perf_counter()
+        expected = wordnet.create_isa_tree_visualization(trees).source
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph = wordnet.create_isa_tree_visualization(
+            trees, create_node=incremental.create_node
+        )
+        rebuild_time = time.perf_counter() - start
+        generated, reused = incremental.commit()
+        assert graph.source == expected
+        print(
+            f"{depth:>6}{edited:>9}{len(report.changed):>9}{full_time:>9.2f}"
+            f"{rebuild_time:>11.3f}{generated:>11}{reused:>9}"
+        )
+        # The next edit is measured against a tree without this one
+        trees = old_trees
+        wordnet.create_isa_tree_visualization(
+            trees, create_node=incremental.create_node
+        )
+        incremental.commit()
+
+
+if __name__ == "__main__":
+    main()
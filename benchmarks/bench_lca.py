@@ -0,0 +1,84 @@
+"""
+LCA BENCHMARK
+Reports pairs per second of kfm.lca against intersecting the ancestor chains of each pair.
+
+Run from the repository root:
+    python -m benchmarks.bench_lca --sizes 100000,1000000 --pairs 1000000
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.synthetic import make_deep_tree, make_tree
+from kfm.hierarchy import NONE, Hierarchy
+from kfm.lca import LCAIndex
+
+
+def naive_lca(parent, source, target):
+    """
+    Finds the lowest common ancestor by walking up both parent chains.
+
+    Args:
+        parent (array): The parent of every concept, or NONE for roots.
+        source (int): The first concept.
+        target (int): The second concept.
+
+    Returns:
+        int: The lowest common ancestor, or NONE.
+    """
+    ancestors = set()
+    while source != NONE:
+        ancestors.add(source)
+        source = parent[source]
+    while target != NONE and target not in ancestors:
+        target = parent[target]
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--pairs", type=int, default=1000000)
+    args = parser.parse_args()
+
+    rnd = random.Random(1234)
+    print(
+        f"{'shape':>6}{'concepts':>10}{'build s':>9}{'naive pairs/s':>15}"
+        f"{'lca pairs/s':>13}{'wup pairs/s':>13}{'speedup':>9}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        for shape, tree in (
+            ("wide", make_tree(size, 4)),
+            ("deep", make_deep_tree(size, 1000)),
+        ):
+            hierarchy = Hierarchy.from_trees([tree])
+            start = time.perf_counter()
+            index = LCAIndex(hierarchy)
+            build = time.perf_counter() - start
+
+            sources = [rnd.randrange(size) for _ in range(args.pairs)]
+            targets = [rnd.randrange(size) for _ in range(args.pairs)]
+            sample = min(args.pairs, 20000)
+            start = time.perf_counter()
+            expected = [
+                naive_lca(index.parent, source, target)
+                for source, target in zip(sources[:sample], targets[:sample])
+            ]
+            naive = sample / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            result = index.lca(sources, targets)
+            lca = args.pairs / (time.perf_counter() - start)
+            assert result[:sample].tolist() == expected
+            start = time.perf_counter()
+            index.wu_palmer(sources, targets)
+            wup = args.pairs / (time.perf_counter() - start)
+            print(
+                f"{shape:>6}{size:>10}{build:>9.2f}{naive:>15.0f}"
+                f"{lca:>13.0f}{wup:>13.0f}{lca / naive:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+LEXICON BENCHMARK
+Reports load time and lookup rate of kfm.lexicon for every storage format.
+
+Run from the repository root:
+    python -m benchmarks.bench_lexicon --concepts 200000 --languages it,de,fr
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from kfm.lexicon import Lexicon, load
+
+
+def write_sources(directory, lexicalizations):
+    """
+    Writes the same lexicalizations as TSV, JSON and SQLite.
+
+    Args:
+        directory (str): The output directory.
+        lexicalizations (dict): Language code -> {concept ID: lemma}.
+
+    Returns:
+        list: The paths of the written files.
+    """
+    languages = list(lexicalizations)
+    concept_ids = sorted(next(iter(lexicalizations.values())))
+    tsv = os.path.join(directory, "lexicon.tsv")
+    with open(tsv, "w", encoding="utf-8") as file:
+        file.write("\t".join(["id"] + languages) + "\n")
+        for concept_id in concept_ids:
+            lemmas = [lexicalizations[language][concept_id] for language in languages]
+            file.write("\t".join([concept_id] + lemmas) + "\n")
+    path_json = os.path.join(directory, "lexicon.json")
+    with open(path_json, "w", encoding="utf-8") as file:
+        json.dump(lexicalizations, file)
+    path_sqlite = os.path.join(directory, "lexicon.sqlite")
+    connection = sqlite3.connect(path_sqlite)
+    connection.execute("CREATE TABLE lexicalizations(concept_id, language, lemma)")
+    connection.executemany(
+        "INSERT INTO lexicalizations VALUES (?, ?, ?)",
+        (
+            (concept_id, language, lemma)
+            for language, lemmas in lexicalizations.items()
+            for concept_id, lemma in lemmas.items()
+        ),
+    )
+    connection.commit()
+    connection.close()
+    return [tsv, path_json, path_sqlite]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--concepts", type=int, default=200000)
+    parser.add_argument("--languages", default="it,de,fr")
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+
+    rnd = random.Random(1234)
+    languages = args.languages.split(",")
+    # Few distinct lemmas per language, as many concepts share a lexicalization
+    lexicalizations = {
+        language: {
+            f"{i:07d}": f"{language} lemma {rnd.randrange(args.concepts // 3)}"
+            for i in range(args.concepts)
+        }
+        for language in languages
+    }
+    queries = [
+        (f"{rnd.randrange(args.concepts):07d}", rnd.choice(languages))
+        for _ in range(args.lookups)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_sources(directory, lexicalizations)
+        lex = os.path.join(directory, "lexicon.lex")
+        Lexicon.from_dict(lexicalizations).save(lex)
+        paths.append(lex)
+
+        print(f"{'format':>8}{'size MB':>9}{'load s':>9}{'lookups/s':>12}")
+        for path in paths:
+            start = time.perf_counter()
+            lexicon = load(path)
+            elapsed = time.perf_counter() - start
+            for concept_id, language in queries[:1000]:
+                assert (
+                    lexicon.get(concept_id, language)
+                    == lexicalizations[language][concept_id]
+                )
+            start = time.perf_counter()
+            for concept_id, language in queries:
+                lexicon.get(concept_id, language)
+            rate = len(queries) / (time.perf_counter() - start)
+            size = os.path.getsize(path) / 2**20
+            extension = os.path.splitext(path)[1][1:]
+            print(f"{extension:>8}{size:>9.1f}{elapsed:>9.3f}{rate:>12.0f}")
+            del lexicon
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+PARTITION BENCHMARK
+Reports partitioned layout time against a single dot run, for hierarchies of several sizes.
+
+Run from the repository root (needs Graphviz on the PATH):
+    python -m benchmarks.bench_partition --sizes 1000,10000,50000 --max-nodes 500
+"""
+
+import argparse
+import subprocess
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm.partition import layout_source, partition, tiled_layout
+from kfm.wordnet import create_isa_tree_visualization
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--max-nodes", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument(
+        "--timeout", type=float, default=600, help="seconds allowed to the single run"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'nodes':>8}{'parts':>7}{'split s':>9}{'single s':>10}{'tiled s':>9}{'stitch s':>10}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        trees = [make_tree(size, 4)]
+        source = create_isa_tree_visualization(trees).source
+        start = time.perf_counter()
+        try:
+            layout_source(source, timeout=args.timeout)
+            single = f"{time.perf_counter() - start:>10.2f}"
+        except subprocess.TimeoutExpired:
+            single = f"{'>' + str(int(args.timeout)):>10}"
+
+        # Partitioning and building the parts, the share of the tiled run spent in Python
+        start = time.perf_counter()
+        parts = partition(trees, args.max_nodes)
+        for part in parts:
+            create_isa_tree_visualization(part).source
+        split = time.perf_counter() - start
+        start = time.perf_counter()
+        graph = tiled_layout(
+            trees, create_isa_tree_visualization, args.max_nodes, jobs=args.jobs
+        )
+        tiled = time.perf_counter() - start
+        # Rendering the stitched graph runs neato -n2, which keeps the positions
+        start = time.perf_counter()
+        subprocess.run(
+            ["neato", "-n2", "-Tsvg"],
+            input=graph.source.encode(),
+            capture_output=True,
+            check=True,
+        )
+        stitch = time.perf_counter() - start
+        print(
+            f"{size:>8}{len(parts):>7}{split:>9.2f}{single}{tiled:>9.2f}{stitch:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
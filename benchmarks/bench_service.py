@@ -0,0 +1,69 @@
+"""
+SERVICE BENCHMARK
+Reports kfm.service wall time and latency for bursts of concurrent figure requests, many of them identical.
+
+Run from the repository root (needs Graphviz on the PATH):
+    python -m benchmarks.bench_service --requests 200 --jobs 4
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from kfm.figures import FIGURES
+from kfm.service import Job, RenderService
+
+
+async def burst(service, jobs):
+    """
+    Sends all requests at once and waits for every result.
+
+    Args:
+        service (RenderService): The render service.
+        jobs (list): The Job of every request.
+
+    Returns:
+        list: The latency of every request, in seconds.
+    """
+
+    async def request(job):
+        start = time.perf_counter()
+        await service.render(job)
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(request(job) for job in jobs))
+
+
+async def run(args):
+    rng = random.Random(0)
+    names = list(FIGURES)
+    jobs = [Job(rng.choice(names), (), args.format) for _ in range(args.requests)]
+    with tempfile.TemporaryDirectory() as directory:
+        service = RenderService(directory, jobs=args.jobs, cache_dir=directory)
+        print(f"{'burst':>6}{'requests':>10}{'wall s':>8}{'p50 s':>8}{'max s':>8}")
+        # The second burst is served from the render cache
+        for number in (1, 2):
+            start = time.perf_counter()
+            latencies = sorted(await burst(service, jobs))
+            wall = time.perf_counter() - start
+            print(
+                f"{number:>6}{len(jobs):>10}{wall:>8.2f}"
+                f"{latencies[len(latencies) // 2]:>8.2f}{latencies[-1]:>8.2f}"
+            )
+        print(service.metrics()["counts"])
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--format", default="svg")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
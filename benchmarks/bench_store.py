@@ -0,0 +1,120 @@
+"""
+STORE BENCHMARK
+Reports kfm.store build and query times on a synthetic university against scanning the relationship arrays.
+
+Run from the repository root:
+    python -m benchmarks.bench_store --students 1000000 --attends 10
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+from kfm.store import EntityStore
+
+
+def university(students, lectures, classrooms, attends, seed=0):
+    """
+    Builds a synthetic university: students attending lectures held in classrooms.
+
+    Args:
+        students (int): The number of students.
+        lectures (int): The number of lectures.
+        classrooms (int): The number of classrooms.
+        attends (int): The number of lectures attended by every student.
+        seed (int, optional): The seed of the random generator. Default is 0.
+
+    Returns:
+        EntityStore: The store.
+    """
+    rng = random.Random(seed)
+    store = EntityStore()
+    student_handles = store.add_entities(
+        "student",
+        [f"s{i}" for i in range(students)],
+        {"name": [f"student {i}" for i in range(students)]},
+    )
+    lecture_handles = store.add_entities(
+        "lecture",
+        [f"l{i}" for i in range(lectures)],
+        {"title": [f"lecture {i}" for i in range(lectures)]},
+    )
+    classroom_handles = store.add_entities(
+        "classroom",
+        [f"c{i}" for i in range(classrooms)],
+        {"number": [f"A{i}" for i in range(classrooms)]},
+    )
+    store.add_relationships(
+        "held in",
+        lecture_handles,
+        array("i", (rng.choice(classroom_handles) for _ in lecture_handles)),
+    )
+    first = lecture_handles[0]
+    sources = array("i")
+    targets = array("i")
+    for student in student_handles:
+        sources.extend([student] * attends)
+        targets.extend([first + rng.randrange(lectures) for _ in range(attends)])
+    store.add_relationships("attends", sources, targets)
+    return store
+
+
+def scan(store, number):
+    """
+    Answers the query without indexes, scanning every relationship of both labels.
+
+    Args:
+        store (EntityStore): The store.
+        number (str): The number of the classroom.
+
+    Returns:
+        set: The handles of the students attending lectures held in the classroom.
+    """
+    classroom = store.handle("classroom", f"c{number[1:]}")
+    sources, targets = store.edges("held in")
+    lectures = {lecture for lecture, room in zip(sources, targets) if room == classroom}
+    sources, targets = store.edges("attends")
+    return {
+        student for student, lecture in zip(sources, targets) if lecture in lectures
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--lectures", type=int, default=100000)
+    parser.add_argument("--classrooms", type=int, default=2000)
+    parser.add_argument("--attends", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = university(args.students, args.lectures, args.classrooms, args.attends)
+    print(
+        f"{len(store)} entities, {store.count()} relationships "
+        f"built in {time.perf_counter() - start:.2f}s"
+    )
+    start = time.perf_counter()
+    store.find("classroom", number="A0")
+    store.traverse([0], ["^held in", "^attends"])
+    print(f"indexes built in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'classroom':>10}{'students':>10}{'scan s':>9}{'index s':>10}")
+    for i in range(args.queries):
+        number = f"A{i}"
+        start = time.perf_counter()
+        expected = scan(store, number)
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        students = store.traverse(
+            store.find("classroom", number=number), ["^held in", "^attends"]
+        )
+        index_time = time.perf_counter() - start
+        assert set(students) == expected
+        print(f"{number:>10}{len(students):>10}{scan_time:>9.2f}{index_time:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
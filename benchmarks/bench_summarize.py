@@ -0,0 +1,43 @@
+"""
+SUMMARIZE BENCHMARK
+Reports kfm.summarize time and the size of the reduced figure for growing hierarchies.
+
+Run from the repository root:
+    python -m benchmarks.bench_summarize --sizes 10000,100000,1000000 --max-nodes 200
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm import wordnet
+from kfm.summarize import summarize
+from kfm.walk import flatten
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--max-nodes", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'concepts':>10}{'summarize s':>13}{'nodes':>7}{'hidden':>9}{'DOT KB':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        trees = [make_tree(size)]
+        start = time.perf_counter()
+        reduced = summarize(trees, max_nodes=args.max_nodes, top_k=args.top_k)
+        elapsed = time.perf_counter() - start
+        nodes = flatten([node for tree in reduced for node in tree])[0]
+        assert len(nodes) <= args.max_nodes
+        hidden = sum(node.get("count", 0) for node in nodes)
+        assert len(nodes) - sum("count" in node for node in nodes) + hidden == size
+        source = wordnet.create_isa_tree_visualization(reduced).source
+        print(
+            f"{size:>10}{elapsed:>13.2f}{len(nodes):>7}{hidden:>9}"
+            f"{len(source) / 1024:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
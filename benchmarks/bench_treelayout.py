@@ -0,0 +1,48 @@
+"""
+TREELAYOUT BENCHMARK
+Reports the kfm.treelayout record, layout and SVG write times of large IS-A trees.
+
+Run from the repository root:
+    python -m benchmarks.bench_treelayout --sizes 10000,100000,1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm import wordnet
+from kfm.treelayout import TreeGraph, layout, write_svg
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--fanout", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'nodes':>9}{'record s':>10}{'layout s':>10}{'svg s':>8}{'total s':>9}{'svg MB':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tree.svg")
+        for size in map(int, args.sizes.split(",")):
+            trees = [make_tree(size, args.fanout)]
+            start = time.perf_counter()
+            graph = wordnet.create_isa_tree_visualization(trees, graph=TreeGraph)
+            recorded = time.perf_counter()
+            positions = layout(graph)
+            laid_out = time.perf_counter()
+            with open(path, "w", encoding="utf-8") as stream:
+                write_svg(graph, stream, positions)
+            written = time.perf_counter()
+            print(
+                f"{len(graph):>9}{recorded - start:>10.2f}{laid_out - recorded:>10.2f}"
+                f"{written - laid_out:>8.2f}{written - start:>9.2f}"
+                f"{os.path.getsize(path) / 2**20:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
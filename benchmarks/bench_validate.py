@@ -0,0 +1,112 @@
+"""
+VALIDATE BENCHMARK
+Reports kfm.validate throughput and peak memory on a stream of synthetic EG relationships.
+
+Run from the repository root:
+    python -m benchmarks.bench_validate --relationships 20000000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from kfm import etg
+from kfm.validate import university
+
+
+def entities(count):
+    """
+    Yields synthetic EG entities of every type of the ETG figure.
+
+    Args:
+        count (int): The number of entities of every type.
+
+    Yields:
+        dict: The entities, with ids f"{i:07d}".
+    """
+    for type_entity in etg.entities:
+        for i in range(count):
+            yield {
+                "id": f"{i:07d}",
+                "name": type_entity["name"],
+                "attributes": (
+                    {"name": f"{type_entity['name']} {i}", "age": str(i % 90)}
+                    if type_entity["name"] in ("professor", "student")
+                    else {}
+                ),
+            }
+
+
+def relationships(count, entity_count, error_rate=0.001, seed=0):
+    """
+    Yields synthetic relationships, one at a time, each of an ETG relationship type.
+
+    Args:
+        count (int): The number of relationships.
+        entity_count (int): The number of entities of every type.
+        error_rate (float, optional): The share of relationships with a wrong target type.
+            Default is 0.001.
+        seed (int, optional): The seed of the random generator. Default is 0.
+
+    Yields:
+        dict: The relationships.
+    """
+    rng = random.Random(seed)
+    # A pool of distinct records, cycled, so generating them costs little next to validating
+    pool = []
+    for _ in range(4096):
+        rel = rng.choice(etg.relationships)
+        target = rel["target"]["name"]
+        if rng.random() < error_rate:
+            target = "classroom" if target != "classroom" else "course"
+        pool.append(
+            {
+                "source": {
+                    "name": rel["source"]["name"],
+                    "id": f"{rng.randrange(entity_count):07d}",
+                },
+                "target": {"name": target, "id": f"{rng.randrange(entity_count):07d}"},
+                "label": rel["label"],
+            }
+        )
+    for i in range(count):
+        yield pool[i % len(pool)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--relationships", type=int, default=20000000)
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--memory-sample", type=int, default=1000000)
+    args = parser.parse_args()
+
+    validator = university()
+    start = time.perf_counter()
+    violations = sum(
+        1
+        for _ in validator.validate(
+            entities(args.entities),
+            relationships(args.relationships, args.entities),
+        )
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{args.relationships} relationships, {violations} violations "
+        f"in {elapsed:.2f}s ({args.relationships / elapsed / 1e6:.2f}M/s)"
+    )
+
+    # Memory is measured on a separate run: tracing slows the validation down
+    for count in (args.memory_sample // 10, args.memory_sample):
+        tracemalloc.start()
+        for _ in validator.validate(
+            entities(args.entities), relationships(count, args.entities)
+        ):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{count:>10} relationships: peak {peak / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+VIEWER BENCHMARK
+Reports the kfm.viewer export time and the size of the first load against the whole hierarchy.
+
+Run from the repository root:
+    python -m benchmarks.bench_viewer --sizes 10000,100000,1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_tree
+from kfm.viewer import export
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--fanout", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'nodes':>9}{'export s':>10}{'shards':>8}{'index KB':>10}"
+        f"{'max shard KB':>14}{'total MB':>10}"
+    )
+    for size in map(int, args.sizes.split(",")):
+        trees = [make_tree(size, args.fanout)]
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            shards = export(directory, trees, [])
+            elapsed = time.perf_counter() - start
+            shard_dir = os.path.join(directory, "shards")
+            sizes = [
+                os.path.getsize(os.path.join(shard_dir, name))
+                for name in os.listdir(shard_dir)
+            ]
+            index = os.path.getsize(os.path.join(directory, "index.json"))
+            print(
+                f"{size:>9}{elapsed:>10.2f}{shards:>8}{index / 1024:>10.1f}"
+                f"{max(sizes, default=0) / 1024:>14.1f}"
+                f"{(index + sum(sizes)) / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+WALK BENCHMARK
+Compares the recursive create_node traversal with the iterative kfm.walk engine.
+
+Every traversal produces the same node and edge records: the key of each node and
+the key of its parent, in pre-order. Run from the repository root:
+    python -m benchmarks.bench_walk --sizes 10000,100000,1000000
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import make_deep_tree, make_tree
+from kfm.walk import flatten, walk
+
+
+def recursive_walk(tree):
+    """
+    Reference traversal with the same structure as the scripts' recursive create_node.
+
+    Args:
+        tree (list): The tree represented as a list holding the root dictionary.
+
+    Returns:
+        tuple: The node keys and parent keys.
+    """
+    keys, parents = [], []
+
+    def create_node(node, parent=None):
+        node_id = f"{node['name']}_{node['id']}"
+        keys.append(node_id)
+        parents.append(parent)
+        for child in node.get("children", []):
+            create_node(child, node_id)
+
+    create_node(tree[0])
+    return keys, parents
+
+
+def iterative_walk(tree):
+    """
+    The same traversal using the explicit-stack walk generator.
+
+    Args:
+        tree (list): The tree represented as a list holding the root dictionary.
+
+    Returns:
+        tuple: The node keys and parent keys.
+    """
+    keys, parents = [], []
+    for step in walk(tree):
+        keys.append(step.key)
+        parents.append(step.parent)
+    return keys, parents
+
+
+def flattened_walk(tree):
+    """
+    The same traversal using the columnar flatten pass.
+
+    Args:
+        tree (list): The tree represented as a list holding the root dictionary.
+
+    Returns:
+        tuple: The node keys and parent keys.
+    """
+    _, keys, parents, _ = flatten(tree)
+    return keys, parents
+
+
+def timed(function, tree):
+    """
+    Times a single traversal of the tree.
+
+    Args:
+        function (callable): The traversal to run.
+        tree (list): The tree represented as a list holding the root dictionary.
+
+    Returns:
+        tuple: (seconds, records), or (None, None) if the recursion limit was hit.
+    """
+    start = time.perf_counter()
+    try:
+        records = function(tree)
+    except RecursionError:
+        return None, None
+    return time.perf_counter() - start, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(
+        f"{'tree':<6}{'nodes':>9}{'recursive s':>15}{'walk s':>9}{'flatten s':>11}"
+        f"{'walk x':>8}{'flatten x':>11}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        for shape, tree in (
+            ("wide", make_tree(size, args.fanout)),
+            ("deep", make_deep_tree(size, args.depth)),
+        ):
+            recursive, expected = timed(recursive_walk, tree)
+            iterative, records = timed(iterative_walk, tree)
+            flat, flat_records = timed(flattened_walk, tree)
+            assert records == flat_records
+            if recursive is None:
+                print(
+                    f"{shape:<6}{size:>9}{'RecursionError':>15}{iterative:>9.3f}"
+                    f"{flat:>11.3f}{'-':>8}{'-':>11}"
+                )
+                continue
+            assert records == expected
+            print(
+                f"{shape:<6}{size:>9}{recursive:>15.3f}{iterative:>9.3f}{flat:>11.3f}"
+                f"{recursive / iterative:>7.2f}x{recursive / flat:>10.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
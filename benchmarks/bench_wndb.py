@@ -0,0 +1,94 @@
+"""
+WNDB BENCHMARK
+Reports the time kfm.wndb takes to load WordNet-sized WNDB files and convert them to trees.
+
+Run from the repository root, on synthetic files of the size of WordNet 3.0:
+    python -m benchmarks.bench_wndb --synsets 117659
+or on a real WordNet "dict" directory:
+    python -m benchmarks.bench_wndb --directory /usr/share/wordnet
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from kfm.wndb import WordNet
+
+HEADER = "  1 This software and database is being provided to you, the LICENSEE, by\n"
+
+
+def write_wndb(directory, synsets, seed=1234):
+    """
+    Writes a synthetic data.noun and index.noun in the WNDB format.
+
+    Every synset has one or two hypernyms among the earlier synsets, some have
+    holonyms, and all have hyponym pointers and a gloss, as in WordNet.
+
+    Args:
+        directory (str): The output directory.
+        synsets (int): The number of synsets.
+        seed (int, optional): The seed of the random generator. Default is 1234.
+    """
+    rnd = random.Random(seed)
+    # Offsets are byte positions in WordNet; any unique 8-digit numbers parse the same
+    offsets = [f"{1740 + 64 * i:08d}" for i in range(synsets)]
+    pointers = [[] for _ in range(synsets)]
+    for i in range(1, synsets):
+        parents = {rnd.randrange(max(0, i - 5000), i)}
+        if rnd.random() < 0.02:
+            parents.add(rnd.randrange(i))
+        for parent in parents:
+            pointers[i].append(f"@ {offsets[parent]} n 0000")
+            pointers[parent].append(f"~ {offsets[i]} n 0000")
+        if rnd.random() < 0.1:
+            whole = rnd.randrange(i)
+            pointers[i].append(f"#p {offsets[whole]} n 0000")
+            pointers[whole].append(f"%p {offsets[i]} n 0000")
+    with open(os.path.join(directory, "data.noun"), "w", encoding="utf-8") as data:
+        data.write(HEADER * 29)
+        for i, offset in enumerate(offsets):
+            words = f"concept_{i} 0" + (f" synonym_{i} 0" if i % 3 == 0 else "")
+            count = 2 if i % 3 == 0 else 1
+            data.write(
+                f"{offset} 03 n {count:02x} {words} {len(pointers[i]):03d} "
+                f"{' '.join(pointers[i])} | a gloss of concept {i}; "
+                f'"an example sentence"  \n'
+            )
+    with open(os.path.join(directory, "index.noun"), "w", encoding="utf-8") as index:
+        index.write(HEADER * 29)
+        for i, offset in enumerate(offsets):
+            index.write(f"concept_{i} n 1 2 @ ~ 1 0 {offset}  \n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--synsets", type=int, default=117659)
+    parser.add_argument("--directory", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pos = ("n", "v")
+        if args.directory is None:
+            write_wndb(directory, args.synsets)
+            pos = ("n",)
+        start = time.perf_counter()
+        wordnet = WordNet.load(args.directory or directory, pos=pos)
+        load_time = time.perf_counter() - start
+
+        print(f"{'step':>10}{'seconds':>9}{'count':>9}")
+        print(f"{'load':>10}{load_time:>9.2f}{len(wordnet):>9}")
+        for relationship in ("IS-A", "PART-OF"):
+            start = time.perf_counter()
+            trees = wordnet.trees(relationship)
+            elapsed = time.perf_counter() - start
+            print(f"{relationship:>10}{elapsed:>9.2f}{len(trees):>9}")
+        start = time.perf_counter()
+        senses = wordnet.synsets("entity" if args.directory else "concept_0")
+        elapsed = time.perf_counter() - start
+        print(f"{'index':>10}{elapsed:>9.2f}{len(senses):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+SYNTHETIC HIERARCHIES
+Generators of large nested-dict hierarchies in the same format as the scripts' trees.
+"""
+
+
+def make_tree(n_nodes, fanout=4):
+    """
+    Creates a complete tree where every node has `fanout` children.
+
+    Args:
+        n_nodes (int): The total number of nodes.
+        fanout (int, optional): The number of children per node. Default is 4.
+
+    Returns:
+        list: A tree represented as a list holding the root dictionary.
+    """
+    nodes = [{"id": f"{i:07d}", "name": f"concept {i}"} for i in range(n_nodes)]
+    for i in range(1, n_nodes):
+        parent = nodes[(i - 1) // fanout]
+        parent.setdefault("children", []).append(nodes[i])
+    return nodes[:1]
+
+
+def make_deep_tree(n_nodes, depth):
+    """
+    Creates a tree with a spine `depth` nodes long and the remaining nodes as leaves along it.
+
+    Args:
+        n_nodes (int): The total number of nodes.
+        depth (int): The length of the spine.
+
+    Returns:
+        list: A tree represented as a list holding the root dictionary.
+    """
+    nodes = [{"id": f"{i:07d}", "name": f"concept {i}"} for i in range(n_nodes)]
+    depth = min(depth, n_nodes)
+    for i in range(1, depth):
+        nodes[i - 1]["children"] = [nodes[i]]
+    for i in range(depth, n_nodes):
+        nodes[i % depth].setdefault("children", []).append(nodes[i])
+    return nodes[:1]
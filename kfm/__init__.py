@@ -0,0 +1,6 @@
+"""
+KFM
+Shared building blocks for the Knowledge Formal Modelling scripts.
+
+Importing this package has no side effects: submodules are imported on demand.
+"""
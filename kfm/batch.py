@@ -0,0 +1,203 @@
+"""
+KFM BATCH
+Renders every figure of the repository in one run, in parallel.
+
+The graphs are built in-process from the kfm.figures registry, then their DOT
+sources are handed to Graphviz layout subprocesses over a bounded pool of
+workers, with a timeout per figure. Figures whose DOT source is unchanged are
+copied from the render cache (see kfm.cache) without running Graphviz.
+
+Run from the repository root:
+    python -m kfm.batch                      # all figures, one worker per core
+    python -m kfm.batch --jobs 4 --timeout 60 UKC_ISA EG
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+
+from kfm import cache
+from kfm.figures import FIGURES, build
+
+# Outcome of one figure: status is "cached", "rendered", "timeout" or "failed"
+Result = namedtuple("Result", ["name", "status", "seconds", "output", "error"])
+
+
+def render_source(source, output, format="pdf", engine="dot", timeout=None):
+    """
+    Runs a Graphviz layout subprocess on a DOT source.
+
+    Args:
+        source (str): The DOT source of the graph.
+        output (str): The path of the output file.
+        format (str, optional): The output format. Default is "pdf".
+        engine (str, optional): The Graphviz layout engine. Default is "dot".
+        timeout (float, optional): Seconds after which the subprocess is killed. Default is None.
+
+    Raises:
+        subprocess.TimeoutExpired: If the layout takes longer than `timeout`.
+        subprocess.CalledProcessError: If Graphviz fails.
+    """
+    subprocess.run(
+        [engine, f"-T{format}", "-o", output],
+        input=source.encode(),
+        capture_output=True,
+        timeout=timeout,
+        check=True,
+    )
+
+
+def render_job(
+    name, source, engine, output, format="pdf", timeout=None, cache_dir=None
+):
+    """
+    Renders one figure, from the cache when possible.
+
+    Args:
+        name (str): The name of the figure.
+        source (str): The DOT source of the graph.
+        engine (str): The Graphviz layout engine.
+        output (str): The path of the output file.
+        format (str, optional): The output format. Default is "pdf".
+        timeout (float, optional): Seconds after which the layout is abandoned. Default is None.
+        cache_dir (str, optional): The cache directory, or None to disable the cache.
+
+    Returns:
+        Result: The outcome of the job.
+    """
+    start = time.perf_counter()
+    if cache_dir is not None and cache.fetch(source, output, format, engine, cache_dir):
+        return Result(name, "cached", time.perf_counter() - start, output, None)
+    try:
+        # Rendered aside and moved into place, so readers never see a partial file
+        with cache.replacing(output) as temporary:
+            render_source(source, temporary, format, engine, timeout)
+    except subprocess.TimeoutExpired:
+        error = f"timed out after {timeout}s"
+        return Result(name, "timeout", time.perf_counter() - start, output, error)
+    except (OSError, subprocess.CalledProcessError) as exception:
+        stderr = getattr(exception, "stderr", None)
+        error = stderr.decode(errors="replace").strip() if stderr else str(exception)
+        return Result(name, "failed", time.perf_counter() - start, output, error)
+    if cache_dir is not None:
+        cache.store(source, output, format, engine, cache_dir)
+    return Result(name, "rendered", time.perf_counter() - start, output, None)
+
+
+def render_all(
+    names=None,
+    format="pdf",
+    output_dir=".",
+    jobs=None,
+    timeout=None,
+    cache_dir=None,
+    progress=None,
+):
+    """
+    Builds figures in-process and renders them over a bounded pool of workers.
+
+    Args:
+        names (list, optional): The figures to render, as listed in FIGURES. Default is all of them.
+        format (str, optional): The output format. Default is "pdf".
+        output_dir (str, optional): The directory of the output files. Default is ".".
+        jobs (int, optional): The number of concurrent Graphviz processes. Default is the number of cores.
+        timeout (float, optional): Seconds after which a figure is abandoned. Default is None.
+        cache_dir (str, optional): The cache directory, or None to disable the cache.
+        progress (callable, optional): Called with (done, total, Result) as each figure finishes.
+
+    Returns:
+        list: The Result of every figure, in the order of `names`; a figure whose
+            graph cannot be built is "failed", and the others are still rendered.
+    """
+    names = list(FIGURES) if names is None else list(names)
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+    # Each worker only waits on its Graphviz subprocess, so threads are enough
+    # to keep `jobs` layout processes running side by side
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = []
+        failed = []
+        for name in names:
+            output = os.path.join(output_dir, f"{name}.{format}")
+            start = time.perf_counter()
+            try:
+                graph = build(name)
+            except Exception as exception:
+                error = f"{type(exception).__name__}: {exception}"
+                seconds = time.perf_counter() - start
+                failed.append(Result(name, "failed", seconds, output, error))
+                continue
+            futures.append(
+                pool.submit(
+                    render_job,
+                    name,
+                    graph.source,
+                    graph.engine,
+                    output,
+                    format,
+                    timeout,
+                    cache_dir,
+                )
+            )
+        total = len(failed) + len(futures)
+        rendered = (future.result() for future in as_completed(futures))
+        for done, result in enumerate(chain(failed, rendered), 1):
+            results[result.name] = result
+            if progress is not None:
+                progress(done, total, result)
+    return [results[name] for name in names]
+
+
+def print_progress(done, total, result):
+    """Prints one line per finished figure to stderr."""
+    print(
+        f"[{done:>{len(str(total))}}/{total}] {result.status:<8} "
+        f"{result.seconds:6.2f}s  {result.name}",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("names", nargs="*", help="figures to render (default: all)")
+    parser.add_argument("--format", default="pdf")
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in FIGURES]
+    if unknown:
+        parser.error(f"unknown figures: {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    results = render_all(
+        args.names or None,
+        format=args.format,
+        output_dir=args.output_dir,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        cache_dir=None if args.no_cache else cache.cache_dir(),
+        progress=print_progress,
+    )
+    elapsed = time.perf_counter() - start
+
+    # Summary, slowest figures first
+    width = max(len(result.name) for result in results)
+    print(f"{'figure':<{width}}  {'status':<8}{'seconds':>8}")
+    for result in sorted(results, key=lambda result: -result.seconds):
+        print(f"{result.name:<{width}}  {result.status:<8}{result.seconds:>8.2f}")
+        if result.error:
+            print(f"{'':<{width}}  {result.error}")
+    print(f"{len(results)} figures in {elapsed:.2f}s")
+    return 0 if all(r.status in ("cached", "rendered") for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+KFM BRANCH
+Extraction of branches (induced subtrees) from a master hierarchy.
+
+A branch is everything below one or more root concepts in a relation, usually
+IS-A, plus every edge of an attached relation, usually PART-OF, that touches
+one of its concepts. The members of a branch are read from the descendant
+intervals of a ClosureIndex, and the children and attached edges of every
+member from adjacency arrays built once, so extracting a branch costs time
+proportional to the branch, not to the hierarchy:
+
+    branches = BranchIndex(Hierarchy.from_trees(isa_trees, part_of_trees))
+    branch = branches.extract(["46884"])  # the event branch
+    dot = wordnet.create_tree_visualization(branch.trees, branch.attached)
+"""
+
+from collections import namedtuple
+
+from kfm.closure import ClosureIndex
+from kfm.hierarchy import adjacency
+
+# The trees of a branch and the trees of the attached edges touching it, both
+# lists of trees, each represented as a list holding its root dictionary
+Branch = namedtuple("Branch", ["trees", "attached"])
+
+
+class BranchIndex:
+    """
+    Extracts branches of a hierarchy.
+
+    Attributes:
+        hierarchy (Hierarchy): The master hierarchy.
+        closure (ClosureIndex): The descendant intervals of the branch relation.
+    """
+
+    def __init__(self, hierarchy, relationship="IS-A", attached="PART-OF"):
+        """
+        Builds the index.
+
+        Args:
+            hierarchy (Hierarchy): The master hierarchy.
+            relationship (str, optional): The relation of the branches. Default is "IS-A".
+            attached (str, optional): The relation whose touching edges are extracted with a branch,
+                or None for none. Default is "PART-OF".
+        """
+        self.hierarchy = hierarchy
+        self.closure = ClosureIndex(hierarchy, relationship)
+        size = len(hierarchy)
+
+        # Children of every concept, deduplicated, in the order of the trees
+        children, parents = hierarchy.edges[relationship]
+        pairs = list(dict.fromkeys(zip(parents, children)))
+        self._child_offsets, self._children = adjacency(
+            size, [parent for parent, _ in pairs], [child for _, child in pairs]
+        )
+
+        # Attached edges (child, parent) and, for every concept, the edges touching it
+        if attached is None:
+            self._edges = []
+        else:
+            self._edges = list(dict.fromkeys(zip(*hierarchy.edges[attached])))
+        edges = range(len(self._edges))
+        self._edge_offsets, self._incident = adjacency(
+            size,
+            [child for child, _ in self._edges] + [parent for _, parent in self._edges],
+            list(edges) * 2,
+        )
+
+    def _node(self, concept):
+        hierarchy = self.hierarchy
+        return {"id": hierarchy.ids[concept], "name": hierarchy.name(concept)}
+
+    def members(self, concept):
+        """
+        Returns a concept and all its descendants in the branch relation.
+
+        Args:
+            concept (int): The integer ID of the root concept.
+
+        Returns:
+            list: The concept followed by its descendants, in post-order.
+        """
+        return [concept] + self.closure.descendants(concept)
+
+    def extract(self, root_ids):
+        """
+        Extracts the branches below one or more concepts.
+
+        Args:
+            root_ids (list): The identifiers of the root concepts, e.g. ["46884"].
+
+        Returns:
+            Branch: One tree per root, and the trees formed by the attached edges
+                touching the branches, in the order of the master hierarchy.
+
+        Raises:
+            KeyError: If a root concept is not in the hierarchy.
+        """
+        roots = []
+        for root_id in root_ids:
+            concept = self.hierarchy.find(root_id)
+            if concept is None:
+                raise KeyError(f"Unknown concept {root_id}")
+            roots.append(concept)
+
+        nodes = {}
+        for root in roots:
+            for concept in self.members(root):
+                if concept not in nodes:
+                    nodes[concept] = self._node(concept)
+        # Every descendant of a member is a member, so children need no filtering
+        offsets, children = self._child_offsets, self._children
+        for concept, node in nodes.items():
+            start, end = offsets[concept], offsets[concept + 1]
+            if start < end:
+                node["children"] = [nodes[child] for child in children[start:end]]
+        trees = [[nodes[root]] for root in roots]
+
+        # Attached edges touching a member, in the order of the master hierarchy
+        offsets, incident = self._edge_offsets, self._incident
+        touching = sorted(
+            {
+                edge
+                for concept in nodes
+                for edge in incident[offsets[concept] : offsets[concept + 1]]
+            }
+        )
+        attached_nodes, is_child = {}, set()
+        for edge in touching:
+            child, parent = self._edges[edge]
+            for concept in (parent, child):
+                if concept not in attached_nodes:
+                    attached_nodes[concept] = self._node(concept)
+            attached_nodes[parent].setdefault("children", []).append(
+                attached_nodes[child]
+            )
+            is_child.add(child)
+        attached = [
+            [node]
+            for concept, node in attached_nodes.items()
+            if concept not in is_child
+        ]
+        return Branch(trees, attached)
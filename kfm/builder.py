@@ -0,0 +1,41 @@
+"""
+KFM BUILDER
+Generic Graphviz builders shared by the WordNet, UKC and teleology figures.
+"""
+
+from kfm.walk import add_edge, walk
+
+
+def create_node(graph, node, parent=None, relationship="IS-A", shape="rect"):
+    """
+    Creates a node in the graph and links it to the parent node if specified.
+
+    Args:
+        graph (graphviz.Digraph): The Graphviz Digraph object.
+        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+        parent (str, optional): The ID of the parent node. Default is None.
+        relationship (str, optional): The relationship type ("IS-A" or "PART-OF"). Default is "IS-A".
+        shape (str, optional): The Graphviz shape of the nodes. Default is "rect".
+    """
+    # Walking the subtree iteratively, so deep hierarchies do not hit the recursion limit
+    for step in walk([node], parent, relationship):
+        # Adding the node to the graph with a specific shape and style
+        name, concept_id = step.node["name"], step.node["id"]
+        graph.node(step.key, f"{name}\n{concept_id}", shape=shape, style="rounded")
+        # Creating an edge based on the relationship type
+        add_edge(graph, step)
+
+
+def roots_only(trees):
+    """
+    Returns copies of the trees keeping only their root concepts.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+
+    Returns:
+        list: The trees with the children of every root removed.
+    """
+    return [
+        [{"id": node["id"], "name": node["name"]} for node in tree] for tree in trees
+    ]
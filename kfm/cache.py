@@ -0,0 +1,211 @@
+"""
+KFM CACHE
+Content-addressed cache of rendered Graphviz output.
+
+Rendered files are stored on disk under a hash of the DOT source, the output
+format and the layout engine, so a figure whose graph has not changed is copied
+from the cache instead of running the Graphviz layout again:
+
+    from kfm.cache import render
+    render(wordnet.isa_figure(), "wordnet_ISA", format="pdf")
+
+The cache lives in the directory named by the KFM_CACHE_DIR environment variable,
+or ~/.cache/kfm by default, and is bounded in size: the least recently used files
+are evicted first. Setting KFM_CACHE_DIR to an empty string disables the cache.
+"""
+
+import contextlib
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+# Default bound on the total size of the cache
+MAX_BYTES = 256 * 1024 * 1024
+
+# Age after which a temporary file is a leftover of a killed process, in seconds
+STALE_SECONDS = 60 * 60
+
+
+def cache_dir():
+    """
+    Returns the cache directory.
+
+    Returns:
+        str: The directory, or None if the cache is disabled.
+    """
+    directory = os.environ.get("KFM_CACHE_DIR")
+    if directory is None:
+        return os.path.join(os.path.expanduser("~"), ".cache", "kfm")
+    return directory or None
+
+
+def cache_key(source, format="pdf", engine="dot"):
+    """
+    Computes the cache key of a rendering.
+
+    Args:
+        source (str): The DOT source of the graph.
+        format (str, optional): The output format. Default is "pdf".
+        engine (str, optional): The Graphviz layout engine. Default is "dot".
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the source, format and engine.
+    """
+    digest = hashlib.sha256()
+    for part in (engine, format, source):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def replacing(path):
+    """
+    Yields a temporary path next to `path`, moved over `path` when the block succeeds.
+
+    Readers of `path` see the previous file or the complete new one, never a file
+    being written; the temporary file is removed if the block fails.
+
+    Args:
+        path (str): The path of the file to write.
+
+    Yields:
+        str: The temporary path to write to.
+    """
+    # Not created here, so the writer creates it with the usual permissions
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        yield temporary
+        os.replace(temporary, path)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary)
+
+
+def render(graph, filename, format="pdf", directory=None, max_bytes=MAX_BYTES):
+    """
+    Renders a graph to `filename.format`, reusing a cached rendering when the graph is unchanged.
+
+    Args:
+        graph (graphviz.Digraph): The graph to render.
+        filename (str): The output file name, without the extension.
+        format (str, optional): The output format. Default is "pdf".
+        directory (str, optional): The cache directory. Default is cache_dir().
+        max_bytes (int, optional): The size bound of the cache. Default is MAX_BYTES.
+
+    Returns:
+        str: The path of the rendered file.
+    """
+    directory = directory or cache_dir()
+    output = f"{filename}.{format}"
+    if directory is not None and fetch(
+        graph.source, output, format, graph.engine, directory
+    ):
+        return output
+
+    output = graph.render(filename, format=format, cleanup=True)
+    if directory is not None:
+        store(graph.source, output, format, graph.engine, directory, max_bytes)
+    return output
+
+
+def fetch(source, output, format="pdf", engine="dot", directory=None):
+    """
+    Copies the cached rendering of a DOT source to `output`, if there is one.
+
+    Args:
+        source (str): The DOT source of the graph.
+        output (str): The path of the output file.
+        format (str, optional): The output format. Default is "pdf".
+        engine (str, optional): The Graphviz layout engine. Default is "dot".
+        directory (str, optional): The cache directory. Default is cache_dir().
+
+    Returns:
+        bool: True if the rendering was found in the cache.
+    """
+    directory = directory or cache_dir()
+    if directory is None:
+        return False
+    cached = os.path.join(directory, f"{cache_key(source, format, engine)}.{format}")
+    try:
+        # Replaced whole, so a reader of a previous rendering never sees it truncated
+        with replacing(output) as temporary:
+            shutil.copyfile(cached, temporary)
+        # The modification time records the last use, for LRU eviction
+        os.utime(cached)
+    except FileNotFoundError:
+        # Not cached, or evicted by a concurrent render since
+        return False
+    return True
+
+
+def store(
+    source, output, format="pdf", engine="dot", directory=None, max_bytes=MAX_BYTES
+):
+    """
+    Adds the rendering of a DOT source to the cache and evicts old entries.
+
+    Args:
+        source (str): The DOT source of the graph.
+        output (str): The path of the rendered file.
+        format (str, optional): The output format. Default is "pdf".
+        engine (str, optional): The Graphviz layout engine. Default is "dot".
+        directory (str, optional): The cache directory. Default is cache_dir().
+        max_bytes (int, optional): The size bound of the cache. Default is MAX_BYTES.
+    """
+    directory = directory or cache_dir()
+    if directory is None:
+        return
+    cached = os.path.join(directory, f"{cache_key(source, format, engine)}.{format}")
+    os.makedirs(directory, exist_ok=True)
+    # Write under a temporary name so concurrent renders never see partial files
+    with replacing(cached) as temporary:
+        shutil.copyfile(output, temporary)
+    evict(directory, max_bytes)
+
+
+def evict(directory, max_bytes=MAX_BYTES):
+    """
+    Removes the least recently used files until the cache fits in `max_bytes`.
+
+    Temporary files older than STALE_SECONDS, left by killed processes, are removed too.
+
+    Args:
+        directory (str): The cache directory.
+        max_bytes (int, optional): The size bound of the cache. Default is MAX_BYTES.
+
+    Returns:
+        int: The number of evicted files.
+    """
+    entries = []
+    stale = time.time() - STALE_SECONDS
+    for entry in os.scandir(directory):
+        # Only regular files are cache entries
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            # Evicted by a concurrent render
+            continue
+        if entry.name.endswith(".tmp"):
+            # Temporary files are being written, unless they are stale
+            if stat.st_mtime < stale:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(entry.path)
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        total -= size
+        evicted += 1
+    return evicted
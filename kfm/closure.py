@@ -0,0 +1,216 @@
+"""
+KFM CLOSURE
+Precomputed transitive-closure (subsumption) index over the IS-A and PART-OF relations.
+
+Concepts are numbered in post-order along a spanning tree of the relation, so that
+the descendants of a concept in a tree occupy one contiguous interval. Ancestor /
+descendant checks are then a single range comparison. Concepts reachable through
+more than one parent, such as 'lecture' under both 'education' and 'events' in the
+UKC PART-OF trees, fall back to a short sorted list of merged intervals searched
+with bisect. Descendants are slices of the post-order array, so they are
+enumerated without traversal; ancestors are collected on demand from flat parent
+arrays, in time proportional to their number.
+
+    hierarchy = Hierarchy.from_trees(wordnet.isa_trees, wordnet.part_of_trees)
+    isa = ClosureIndex(hierarchy, "IS-A")
+    isa.subsumes(hierarchy.find("46884"), hierarchy.find("48450"))  # graduation IS-A event
+"""
+
+from array import array
+from bisect import bisect_right
+
+
+class ClosureIndex:
+    """
+    Subsumption index over one relation (or all relations) of a Hierarchy.
+
+    Concepts are the integer IDs of the hierarchy. Subsumption is strict: a
+    concept is neither its own ancestor nor its own descendant.
+
+    Attributes:
+        low (array): First post-order number of every concept's spanning-tree subtree.
+        post (array): Post-order number of every concept.
+        order (array): Concept at every post-order number.
+        extra (dict): Concept -> (starts, ends) merged intervals, for concepts with
+            descendants outside their spanning-tree subtree.
+    """
+
+    def __init__(self, hierarchy, relationship="IS-A"):
+        """
+        Builds the index.
+
+        Args:
+            hierarchy (Hierarchy): The hierarchy store.
+            relationship (str, optional): The relation to index, or None for the union of all
+                relations. Default is "IS-A".
+
+        Raises:
+            ValueError: If the relation contains a cycle.
+        """
+        size = len(hierarchy)
+        relations = list(hierarchy.edges) if relationship is None else [relationship]
+
+        # Deduplicated child and parent lists of every concept, in insertion order
+        children_of = [[] for _ in range(size)]
+        parents_of = [[] for _ in range(size)]
+        seen = set()
+        for relation in relations:
+            children, parents = hierarchy.edges[relation]
+            for child, parent in zip(children, parents):
+                if (child, parent) not in seen:
+                    seen.add((child, parent))
+                    children_of[parent].append(child)
+                    parents_of[child].append(parent)
+
+        self.low = array("i", [0]) * size
+        self.post = array("i", [0]) * size
+        self.order = array("i", [0]) * size
+        self._number(children_of, parents_of)
+        self.extra = self._merge_intervals(children_of)
+        # Parents of every concept as flat CSR arrays, for `ancestors`
+        self._parent_offsets = array("q", [0])
+        self._parents = array("i")
+        for parents in parents_of:
+            self._parents.extend(parents)
+            self._parent_offsets.append(len(self._parents))
+
+    def _number(self, children_of, parents_of):
+        """Numbers the concepts in post-order with an iterative depth-first search."""
+        low, post, order = self.low, self.post, self.order
+        # 0: unvisited, 1: on the stack, 2: finished
+        state = bytearray(len(post))
+        counter = 0
+        roots = [c for c in range(len(post)) if not parents_of[c]]
+        # Concepts left unvisited after the roots can only be part of a cycle
+        for root in roots + list(range(len(post))):
+            if state[root]:
+                continue
+            state[root] = 1
+            low[root] = counter
+            stack = [(root, iter(children_of[root]))]
+            while stack:
+                concept, children = stack[-1]
+                for child in children:
+                    if state[child] == 1:
+                        raise ValueError(f"Cycle through concept {child}")
+                    if not state[child]:
+                        state[child] = 1
+                        low[child] = counter
+                        stack.append((child, iter(children_of[child])))
+                        break
+                else:
+                    stack.pop()
+                    state[concept] = 2
+                    post[concept] = counter
+                    order[counter] = concept
+                    counter += 1
+
+    def _merge_intervals(self, children_of):
+        """Computes merged descendant intervals, keeping those that differ from the subtree."""
+        low, post = self.low, self.post
+        extra = {}
+        # Post-order visits children before their parents
+        for concept in self.order:
+            intervals = None
+            for child in children_of[concept]:
+                child_intervals = extra.get(child)
+                if child_intervals is not None:
+                    pairs = list(zip(*child_intervals))
+                elif low[concept] <= post[child] <= post[concept]:
+                    # A spanning-tree descendant: already inside the concept's interval
+                    continue
+                else:
+                    pairs = [(low[child], post[child])]
+                if intervals is None:
+                    intervals = [(low[concept], post[concept])]
+                intervals += pairs
+            if intervals is None:
+                continue
+            intervals.sort()
+            merged = [intervals[0]]
+            for start, end in intervals[1:]:
+                if start <= merged[-1][1] + 1:
+                    if end > merged[-1][1]:
+                        merged[-1] = (merged[-1][0], end)
+                else:
+                    merged.append((start, end))
+            if merged != [(low[concept], post[concept])]:
+                extra[concept] = (
+                    array("i", (start for start, _ in merged)),
+                    array("i", (end for _, end in merged)),
+                )
+        return extra
+
+    def subsumes(self, ancestor, descendant):
+        """
+        Checks whether a concept is a (transitive) ancestor of another.
+
+        Args:
+            ancestor (int): The candidate ancestor, e.g. 'event'.
+            descendant (int): The candidate descendant, e.g. 'graduation'.
+
+        Returns:
+            bool: True if `descendant` is reachable from `ancestor` through the relation.
+        """
+        if ancestor == descendant:
+            return False
+        position = self.post[descendant]
+        intervals = self.extra.get(ancestor)
+        if intervals is None:
+            return self.low[ancestor] <= position <= self.post[ancestor]
+        starts, ends = intervals
+        i = bisect_right(starts, position) - 1
+        return i >= 0 and position <= ends[i]
+
+    def is_a(self, concept, ancestor):
+        """
+        Checks whether `concept` is subsumed by `ancestor`, e.g. "is graduation an event?".
+
+        Args:
+            concept (int): The more specific concept.
+            ancestor (int): The more general concept.
+
+        Returns:
+            bool: The same as `subsumes(ancestor, concept)`.
+        """
+        return self.subsumes(ancestor, concept)
+
+    def descendants(self, concept):
+        """
+        Returns every concept below `concept`, e.g. all the parts of a whole.
+
+        Args:
+            concept (int): The concept.
+
+        Returns:
+            list: The descendant concepts, in post-order.
+        """
+        intervals = self.extra.get(concept)
+        if intervals is None:
+            intervals = ([self.low[concept]], [self.post[concept]])
+        result = []
+        for start, end in zip(*intervals):
+            result.extend(self.order[start : end + 1])
+        result.remove(concept)
+        return result
+
+    def ancestors(self, concept):
+        """
+        Returns every concept above `concept`, nearest parents first.
+
+        Args:
+            concept (int): The concept.
+
+        Returns:
+            array: The ancestor concepts, in breadth-first order.
+        """
+        offsets, parents = self._parent_offsets, self._parents
+        found = dict.fromkeys(parents[offsets[concept] : offsets[concept + 1]])
+        ancestors = list(found)
+        # The list grows while it is read, so this is a breadth-first search
+        for ancestor in ancestors:
+            for parent in parents[offsets[ancestor] : offsets[ancestor + 1]]:
+                if parent not in found:
+                    found[parent] = None
+                    ancestors.append(parent)
+        return array("i", ancestors)
@@ -0,0 +1,463 @@
+"""
+KFM DATABASE
+Persistent SQLite storage of the hierarchies, lexicalizations and knowledge graphs.
+
+A database file holds every dataset of the figures, so services open a prebuilt
+graph and query it instead of re-executing the scripts:
+    - concepts(dataset, id, name): the concepts of the WordNet, UKC, ... hierarchies;
+    - tree_nodes(dataset, relation, tree, slot, parent, concept_id, data): every
+      occurrence of a concept in a tree, slots numbered in pre-order;
+    - lexicalizations(concept_id, language, lemma): the UKC lemmas, in the table
+      read by kfm.lexicon.load_sqlite;
+    - entities(graph, type, id, attributes) and relationships(graph, source_type,
+      source_id, label, target_type, target_id): the EG and ETG graphs.
+Lookups by concept ID, relation and parent, and by entity or label, are indexed.
+Writes go through executemany in one transaction per dataset, and the database
+runs in WAL mode so readers are not blocked while it is rebuilt:
+
+    python -m kfm.database kfm.db
+
+    with GraphDatabase("kfm.db") as database:
+        database.children("wordnet", "IS-A", "46884")
+        entities, relationships = database.read_graph("eg")
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from itertools import count
+
+from kfm.walk import flatten
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS concepts (
+    dataset TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (dataset, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tree_nodes (
+    dataset TEXT NOT NULL,
+    relation TEXT NOT NULL,
+    tree INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    parent INTEGER,
+    concept_id TEXT NOT NULL,
+    data TEXT,
+    PRIMARY KEY (dataset, relation, slot)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tree_nodes_concept
+    ON tree_nodes (dataset, concept_id, relation);
+CREATE INDEX IF NOT EXISTS tree_nodes_parent
+    ON tree_nodes (dataset, relation, parent);
+CREATE TABLE IF NOT EXISTS lexicalizations (
+    concept_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    lemma TEXT NOT NULL,
+    PRIMARY KEY (concept_id, language)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entities (
+    graph TEXT NOT NULL,
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    attributes TEXT,
+    PRIMARY KEY (graph, type, id)
+);
+CREATE TABLE IF NOT EXISTS relationships (
+    graph TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    target_type TEXT NOT NULL,
+    target_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS relationships_source
+    ON relationships (graph, source_type, source_id, label);
+CREATE INDEX IF NOT EXISTS relationships_target
+    ON relationships (graph, target_type, target_id, label);
+CREATE INDEX IF NOT EXISTS relationships_label
+    ON relationships (graph, label);
+"""
+
+# Node keys stored in their own columns; any other key goes to the JSON `data` column
+_NODE_KEYS = ("id", "name", "children")
+
+
+class GraphDatabase:
+    """
+    A SQLite database of hierarchies, lexicalizations and entity graphs.
+
+    Attributes:
+        path (str): The path of the database file.
+        connection (sqlite3.Connection): The open connection.
+    """
+
+    def __init__(self, path):
+        """
+        Opens a database, creating its tables if needed.
+
+        Args:
+            path (str): The path of the database file.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA cache_size=-65536")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the connection."""
+        self.connection.close()
+
+    def write_trees(self, dataset, relation, trees):
+        """
+        Stores the trees of one relation of a dataset, replacing the ones stored before.
+
+        Concepts of the dataset no longer in any of its trees are removed.
+
+        Args:
+            dataset (str): The dataset, e.g. "wordnet".
+            relation (str): The relation of the trees, e.g. "IS-A".
+            trees (list): A list of trees, each represented as a list of dictionaries.
+        """
+        slots = count()
+        rows = []
+        concepts = {}
+        for tree_index, tree in enumerate(trees):
+            nodes, keys, parents, _ = flatten(tree, key=lambda node: next(slots))
+            for node, slot, parent in zip(nodes, keys, parents):
+                data = {
+                    key: value for key, value in node.items() if key not in _NODE_KEYS
+                }
+                rows.append(
+                    (
+                        dataset,
+                        relation,
+                        tree_index,
+                        slot,
+                        parent,
+                        node["id"],
+                        json.dumps(data, ensure_ascii=False) if data else None,
+                    )
+                )
+                concepts[node["id"]] = node["name"]
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM tree_nodes WHERE dataset = ? AND relation = ?",
+                (dataset, relation),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO concepts VALUES (?, ?, ?)",
+                ((dataset, concept_id, name) for concept_id, name in concepts.items()),
+            )
+            self.connection.executemany(
+                "INSERT INTO tree_nodes VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            # Concepts dropped from these trees and not in another relation of the dataset
+            self.connection.execute(
+                "DELETE FROM concepts WHERE dataset = ? AND NOT EXISTS ("
+                "SELECT 1 FROM tree_nodes n "
+                "WHERE n.dataset = concepts.dataset AND n.concept_id = concepts.id)",
+                (dataset,),
+            )
+
+    def read_trees(self, dataset, relation):
+        """
+        Loads the trees of one relation of a dataset.
+
+        Args:
+            dataset (str): The dataset.
+            relation (str): The relation of the trees.
+
+        Returns:
+            list: The trees in the nested-dict format, as written by `write_trees`.
+        """
+        trees = []
+        nodes = {}
+        for tree_index, slot, parent, concept_id, name, data in self.connection.execute(
+            "SELECT n.tree, n.slot, n.parent, n.concept_id, c.name, n.data "
+            "FROM tree_nodes n JOIN concepts c "
+            "ON c.dataset = n.dataset AND c.id = n.concept_id "
+            "WHERE n.dataset = ? AND n.relation = ? ORDER BY n.slot",
+            (dataset, relation),
+        ):
+            node = {"id": concept_id, "name": name}
+            if data is not None:
+                node.update(json.loads(data))
+            nodes[slot] = node
+            if parent is None:
+                # Empty trees have no rows
+                while len(trees) <= tree_index:
+                    trees.append([])
+                trees[tree_index].append(node)
+            else:
+                nodes[parent].setdefault("children", []).append(node)
+        return trees
+
+    def name(self, dataset, concept_id):
+        """
+        Returns the name of a concept.
+
+        Args:
+            dataset (str): The dataset.
+            concept_id (str): The identifier of the concept.
+
+        Returns:
+            str: The name, or None if the concept is unknown.
+        """
+        row = self.connection.execute(
+            "SELECT name FROM concepts WHERE dataset = ? AND id = ?",
+            (dataset, concept_id),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def children(self, dataset, relation, concept_id):
+        """
+        Returns the children of a concept, under every occurrence of it.
+
+        Args:
+            dataset (str): The dataset.
+            relation (str): The relation, e.g. "IS-A".
+            concept_id (str): The identifier of the concept.
+
+        Returns:
+            list: The identifiers of the children, without duplicates, in tree order.
+        """
+        # Without statistics the planner scans the dataset for the children
+        rows = self.connection.execute(
+            "SELECT child.concept_id "
+            "FROM tree_nodes node INDEXED BY tree_nodes_concept "
+            "CROSS JOIN tree_nodes child INDEXED BY tree_nodes_parent ON child.dataset = node.dataset AND child.relation = node.relation "
+            "AND child.parent = node.slot "
+            "WHERE node.dataset = ? AND node.concept_id = ? AND node.relation = ? "
+            "ORDER BY child.slot",
+            (dataset, concept_id, relation),
+        )
+        return list(dict.fromkeys(row[0] for row in rows))
+
+    def parents(self, dataset, relation, concept_id):
+        """
+        Returns the parents of a concept, over every occurrence of it.
+
+        Args:
+            dataset (str): The dataset.
+            relation (str): The relation, e.g. "IS-A".
+            concept_id (str): The identifier of the concept.
+
+        Returns:
+            list: The identifiers of the parents, without duplicates.
+        """
+        rows = self.connection.execute(
+            "SELECT parent.concept_id "
+            "FROM tree_nodes node INDEXED BY tree_nodes_concept "
+            "CROSS JOIN tree_nodes parent ON parent.dataset = node.dataset AND parent.relation = node.relation "
+            "AND parent.slot = node.parent "
+            "WHERE node.dataset = ? AND node.concept_id = ? AND node.relation = ? "
+            "ORDER BY node.slot",
+            (dataset, concept_id, relation),
+        )
+        return list(dict.fromkeys(row[0] for row in rows))
+
+    def write_lexicalizations(self, rows):
+        """
+        Stores lexicalizations, replacing the lemma of (concept, language) pairs stored before.
+
+        Args:
+            rows (iterable): (concept ID, language, lemma) triples.
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO lexicalizations VALUES (?, ?, ?)", rows
+            )
+
+    def lemma(self, concept_id, language):
+        """
+        Returns the lemma of a concept in a language.
+
+        Args:
+            concept_id (str): The identifier of the concept.
+            language (str): The language code, e.g. "it".
+
+        Returns:
+            str: The lemma, or None if there is none.
+        """
+        row = self.connection.execute(
+            "SELECT lemma FROM lexicalizations WHERE concept_id = ? AND language = ?",
+            (concept_id, language),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def write_graph(self, graph, entities, relationships):
+        """
+        Stores an entity graph, replacing the one stored before under the same name.
+
+        Args:
+            graph (str): The name of the graph, e.g. "eg".
+            entities (iterable): Entity dictionaries with 'id', 'name' and optional
+                'attributes' keys.
+            relationships (iterable): Relationship dictionaries with 'source', 'target'
+                ({'name', 'id'}) and 'label' keys.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM entities WHERE graph = ?", (graph,))
+            self.connection.execute(
+                "DELETE FROM relationships WHERE graph = ?", (graph,)
+            )
+            self.connection.executemany(
+                "INSERT INTO entities VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        graph,
+                        entity["name"],
+                        entity["id"],
+                        (
+                            json.dumps(entity["attributes"], ensure_ascii=False)
+                            if "attributes" in entity
+                            else None
+                        ),
+                    )
+                    for entity in entities
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO relationships VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        graph,
+                        rel["source"]["name"],
+                        rel["source"]["id"],
+                        rel["label"],
+                        rel["target"]["name"],
+                        rel["target"]["id"],
+                    )
+                    for rel in relationships
+                ),
+            )
+
+    def entities(self, graph, type=None):
+        """
+        Returns the entities of a graph.
+
+        Args:
+            graph (str): The name of the graph.
+            type (str, optional): Only return the entities of this type. Default is None.
+
+        Returns:
+            list: The entity dictionaries, in insertion order.
+        """
+        query = "SELECT type, id, attributes FROM entities WHERE graph = ?"
+        parameters = (graph,)
+        if type is not None:
+            query += " AND type = ?"
+            parameters += (type,)
+        return [
+            _entity(*row)
+            for row in self.connection.execute(query + " ORDER BY rowid", parameters)
+        ]
+
+    def relationships(self, graph, label=None, source=None, target=None):
+        """
+        Returns the relationships of a graph, optionally filtered.
+
+        Args:
+            graph (str): The name of the graph.
+            label (str, optional): Only return the relationships with this label. Default is None.
+            source (tuple, optional): Only return the relationships from this
+                (type, id) entity. Default is None.
+            target (tuple, optional): Only return the relationships to this
+                (type, id) entity. Default is None.
+
+        Returns:
+            list: The relationship dictionaries, in insertion order.
+        """
+        query = (
+            "SELECT source_type, source_id, label, target_type, target_id "
+            "FROM relationships WHERE graph = ?"
+        )
+        parameters = (graph,)
+        if label is not None:
+            query += " AND label = ?"
+            parameters += (label,)
+        if source is not None:
+            query += " AND source_type = ? AND source_id = ?"
+            parameters += tuple(source)
+        if target is not None:
+            query += " AND target_type = ? AND target_id = ?"
+            parameters += tuple(target)
+        return [
+            {
+                "source": {"name": source_type, "id": source_id},
+                "target": {"name": target_type, "id": target_id},
+                "label": label,
+            }
+            for source_type, source_id, label, target_type, target_id in (
+                self.connection.execute(query + " ORDER BY rowid", parameters)
+            )
+        ]
+
+    def read_graph(self, graph):
+        """
+        Loads an entity graph.
+
+        Args:
+            graph (str): The name of the graph.
+
+        Returns:
+            tuple: The entity and relationship lists, as written by `write_graph`.
+        """
+        return self.entities(graph), self.relationships(graph)
+
+
+def _entity(type, id, attributes):
+    entity = {"id": id, "name": type}
+    if attributes is not None:
+        entity["attributes"] = json.loads(attributes)
+    return entity
+
+
+def build(path):
+    """
+    Stores every dataset of the figures in a database.
+
+    Args:
+        path (str): The path of the database file.
+    """
+    from kfm import eg, etg, ukc, wordnet
+    from kfm.lexicon import default_lexicon
+
+    with GraphDatabase(path) as database:
+        for dataset, module in (("wordnet", wordnet), ("ukc", ukc)):
+            database.write_trees(dataset, "IS-A", module.isa_trees)
+            database.write_trees(dataset, "PART-OF", module.part_of_trees)
+        lexicon = default_lexicon()
+        database.write_lexicalizations(
+            (concept_id, language, lemma)
+            for concept_id in lexicon
+            for language, lemma in lexicon.lexicalizations(concept_id).items()
+        )
+        database.write_graph("eg", eg.entities, eg.relationships)
+        database.write_graph("etg", etg.entities, etg.relationships)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("path", help="database file to create or update")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    build(args.path)
+    print(f"{args.path} built in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
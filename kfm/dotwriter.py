@@ -0,0 +1,282 @@
+"""
+KFM DOTWRITER
+Streaming DOT emitter with the node/edge/attr/subgraph API of graphviz.Digraph.
+
+graphviz.Digraph keeps every statement in a list of strings until the source is
+joined. DotWriter writes each statement to a stream as soon as it is added, so
+the memory of a build does not grow with the graph, and the output can go
+straight into a Graphviz process. Statements are formatted with the quoting
+functions of graphviz itself and the output is byte-identical to Digraph.source.
+
+Every builder takes the graph factory as its `graph` argument:
+
+    with dot_file("wordnet_ISA.gv") as graph:
+        wordnet.isa_figure(graph=graph)
+
+    with dot_process("wordnet_ISA.pdf") as graph:
+        wordnet.isa_figure(graph=graph)
+"""
+
+import contextlib
+import io
+import subprocess
+import tempfile
+
+from graphviz.quoting import a_list, attr_list, quote, quote_edge
+
+
+class DotWriter:
+    """
+    Writes a DOT graph to a text stream, statement by statement.
+
+    The header is written when the writer is created and the closing brace by
+    `close`. As in graphviz.Digraph, a subgraph is written where its `with`
+    block is, so the parent graph must not be written to inside that block.
+
+    Attributes:
+        comment (str): The comment written before the header.
+        engine (str): The Graphviz layout engine, for API compatibility with Digraph.
+    """
+
+    def __init__(
+        self,
+        stream,
+        name=None,
+        comment=None,
+        graph_attr=None,
+        node_attr=None,
+        edge_attr=None,
+        strict=False,
+        engine="dot",
+        _indent="",
+    ):
+        """
+        Starts a graph by writing its header.
+
+        Args:
+            stream (io.TextIOBase): The stream the DOT source is written to.
+            name (str, optional): The name of the graph. Default is None.
+            comment (str, optional): The comment written before the header. Default is None.
+            graph_attr (dict, optional): Graph-level attributes. Default is None.
+            node_attr (dict, optional): Default node attributes. Default is None.
+            edge_attr (dict, optional): Default edge attributes. Default is None.
+            strict (bool, optional): Whether the graph is strict. Default is False.
+            engine (str, optional): The Graphviz layout engine. Default is "dot".
+        """
+        self.comment = comment
+        self.engine = engine
+        self._stream = stream
+        self._indent = _indent
+        self._open_subgraph = None
+        self._closed = False
+
+        if comment:
+            self._line(f"// {comment}\n")
+        name = f"{quote(name)} " if name else ""
+        if _indent:
+            self._line(f"subgraph {name}{{\n" if name else "{\n")
+        else:
+            self._line(f"{'strict ' if strict else ''}digraph {name}{{\n")
+        for kw, attrs in (
+            ("graph", graph_attr),
+            ("node", node_attr),
+            ("edge", edge_attr),
+        ):
+            if attrs:
+                self._line(f"\t{kw}{attr_list(None, kwargs=attrs)}\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _line(self, line):
+        if self._open_subgraph is not None:
+            raise RuntimeError(
+                "Cannot write to a graph while one of its subgraphs is open"
+            )
+        if self._closed:
+            raise RuntimeError("Cannot write to a closed graph")
+        self._stream.write(self._indent + line)
+
+    def node(self, name, label=None, _attributes=None, **attrs):
+        """
+        Writes a node statement, see graphviz.Digraph.node.
+
+        Args:
+            name (str): The unique identifier of the node.
+            label (str, optional): The caption of the node. Default is None.
+            **attrs: Any other node attribute.
+        """
+        self._line(
+            f"\t{quote(name)}{attr_list(label, kwargs=attrs, attributes=_attributes)}\n"
+        )
+
+    def edge(self, tail_name, head_name, label=None, _attributes=None, **attrs):
+        """
+        Writes an edge statement, see graphviz.Digraph.edge.
+
+        Args:
+            tail_name (str): The start node identifier.
+            head_name (str): The end node identifier.
+            label (str, optional): The caption of the edge. Default is None.
+            **attrs: Any other edge attribute.
+        """
+        attributes = attr_list(label, kwargs=attrs, attributes=_attributes)
+        self._line(
+            f"\t{quote_edge(tail_name)} -> {quote_edge(head_name)}{attributes}\n"
+        )
+
+    def edges(self, tail_head_iter):
+        """
+        Writes edge statements without attributes, see graphviz.Digraph.edges.
+
+        Args:
+            tail_head_iter (iterable): The (tail, head) pairs.
+        """
+        for tail_name, head_name in tail_head_iter:
+            self._line(f"\t{quote_edge(tail_name)} -> {quote_edge(head_name)}\n")
+
+    def attr(self, kw=None, _attributes=None, **attrs):
+        """
+        Writes an attribute statement, see graphviz.Digraph.attr.
+
+        Args:
+            kw (str, optional): The target: None for the graph itself, "graph", "node" or "edge".
+            **attrs: The attributes to set.
+
+        Raises:
+            ValueError: If `kw` is not a valid target.
+        """
+        if kw is not None and kw.lower() not in ("graph", "node", "edge"):
+            raise ValueError(f"attr statement must target graph, node, or edge: {kw!r}")
+        if not (attrs or _attributes):
+            return
+        if kw is None:
+            self._line(f"\t{a_list(None, kwargs=attrs, attributes=_attributes)}\n")
+        else:
+            self._line(
+                f"\t{kw}{attr_list(None, kwargs=attrs, attributes=_attributes)}\n"
+            )
+
+    @contextlib.contextmanager
+    def subgraph(
+        self, name=None, comment=None, graph_attr=None, node_attr=None, edge_attr=None
+    ):
+        """
+        Writes a subgraph, see graphviz.Digraph.subgraph.
+
+        Args:
+            name (str, optional): The name of the subgraph; "cluster" names are drawn as clusters.
+            comment (str, optional): The comment written before the subgraph. Default is None.
+            graph_attr (dict, optional): Graph-level attributes. Default is None.
+            node_attr (dict, optional): Default node attributes. Default is None.
+            edge_attr (dict, optional): Default edge attributes. Default is None.
+
+        Yields:
+            DotWriter: The writer of the subgraph.
+        """
+        # Subgraph lines are indented one level deeper, as graphviz.Digraph does
+        subgraph = DotWriter(
+            self._stream,
+            name,
+            comment,
+            graph_attr,
+            node_attr,
+            edge_attr,
+            engine=self.engine,
+            _indent=self._indent + "\t",
+        )
+        self._open_subgraph = subgraph
+        try:
+            yield subgraph
+        finally:
+            self._open_subgraph = None
+            subgraph.close()
+
+    def close(self):
+        """Writes the closing brace of the graph, once."""
+        if not self._closed:
+            self._line("}\n")
+            self._closed = True
+
+
+@contextlib.contextmanager
+def dot_file(path, encoding="utf-8"):
+    """
+    Streams a graph into a DOT file.
+
+    Args:
+        path (str): The path of the DOT file.
+        encoding (str, optional): The encoding of the file. Default is "utf-8".
+
+    Yields:
+        callable: A graph factory for the `graph` argument of the builders.
+    """
+    with open(path, "w", encoding=encoding) as stream:
+        graphs = []
+
+        def graph(**kwargs):
+            graphs.append(DotWriter(stream, **kwargs))
+            return graphs[-1]
+
+        yield graph
+        for writer in graphs:
+            writer.close()
+
+
+@contextlib.contextmanager
+def dot_process(output, format="pdf", engine="dot", timeout=None):
+    """
+    Streams a graph straight into the standard input of a Graphviz process.
+
+    Args:
+        output (str): The path of the rendered file.
+        format (str, optional): The output format. Default is "pdf".
+        engine (str, optional): The Graphviz layout engine. Default is "dot".
+        timeout (float, optional): Seconds to wait for the layout after the graph is written.
+
+    Yields:
+        callable: A graph factory for the `graph` argument of the builders.
+
+    Raises:
+        subprocess.CalledProcessError: If Graphviz fails.
+        subprocess.TimeoutExpired: If the layout takes longer than `timeout`.
+    """
+    # stderr goes to a file, so a chatty Graphviz never blocks on a full pipe
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(
+            [engine, f"-T{format}", "-o", output],
+            stdin=subprocess.PIPE,
+            stderr=errors,
+        )
+        stream = io.TextIOWrapper(process.stdin, encoding="utf-8")
+        graphs = []
+
+        def graph(**kwargs):
+            graphs.append(DotWriter(stream, engine=engine, **kwargs))
+            return graphs[-1]
+
+        try:
+            try:
+                yield graph
+                for writer in graphs:
+                    writer.close()
+                stream.close()
+            except BrokenPipeError:
+                # Graphviz exited before reading the whole graph: report its error
+                process.wait(timeout=timeout)
+                if not process.returncode:
+                    raise
+            else:
+                process.wait(timeout=timeout)
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        if process.returncode:
+            errors.seek(0)
+            raise subprocess.CalledProcessError(
+                process.returncode, process.args, stderr=errors.read()
+            )
@@ -0,0 +1,106 @@
+"""
+KFM ETG
+Builders and data of the ETG (Entity Type Knowledge Graph) figure.
+"""
+
+import graphviz
+
+from kfm.eg import create_relationship_graph
+from kfm.schema import bundled
+
+
+def create_entity_type_node(graph, node):
+    """
+    Creates an entity type node in the graph with a custom label.
+
+    Args:
+        graph (graphviz.Digraph): The Graphviz Digraph object.
+        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+    """
+    node_id = f"{node['name']}_{node['id']}"
+
+    # The label lists the attribute types of the entity type, see kfm/data/university.schema.json
+    label = bundled("university").type_label(node)
+
+    # Adding the node to the graph with the specified label
+    graph.node(node_id, label, shape="record", style="rounded")
+
+
+# Definition of entities
+entities = [
+    {"id": "25323", "name": "professor"},
+    {"id": "45356", "name": "student"},
+    {"id": "30127", "name": "university"},
+    {"id": "48472", "name": "lecture"},
+    {"id": "52830", "name": "department"},
+    {"id": "19473", "name": "course"},
+    {"id": "37549", "name": "classroom"},
+    {"id": "65984", "name": "research project"},
+    {"id": "84321", "name": "administrative staff"},
+]
+
+# Definition of relationships
+relationships = [
+    {
+        "source": {"name": "student", "id": "45356"},
+        "target": {"name": "lecture", "id": "48472"},
+        "label": "attends",
+    },
+    {
+        "source": {"name": "professor", "id": "25323"},
+        "target": {"name": "lecture", "id": "48472"},
+        "label": "holds",
+    },
+    {
+        "source": {"name": "professor", "id": "25323"},
+        "target": {"name": "department", "id": "52830"},
+        "label": "belongs to",
+    },
+    {
+        "source": {"name": "department", "id": "52830"},
+        "target": {"name": "university", "id": "30127"},
+        "label": "part of",
+    },
+    {
+        "source": {"name": "course", "id": "19473"},
+        "target": {"name": "department", "id": "52830"},
+        "label": "offered by",
+    },
+    {
+        "source": {"name": "student", "id": "45356"},
+        "target": {"name": "course", "id": "19473"},
+        "label": "enrolls in",
+    },
+    {
+        "source": {"name": "lecture", "id": "48472"},
+        "target": {"name": "course", "id": "19473"},
+        "label": "part of",
+    },
+    {
+        "source": {"name": "lecture", "id": "48472"},
+        "target": {"name": "classroom", "id": "37549"},
+        "label": "held in",
+    },
+    {
+        "source": {"name": "professor", "id": "25323"},
+        "target": {"name": "research project", "id": "65984"},
+        "label": "supervises",
+    },
+    {
+        "source": {"name": "research project", "id": "65984"},
+        "target": {"name": "university", "id": "30127"},
+        "label": "funded by",
+    },
+    {
+        "source": {"name": "administrative staff", "id": "84321"},
+        "target": {"name": "department", "id": "52830"},
+        "label": "manages",
+    },
+]
+
+
+def etg_figure(graph=graphviz.Digraph):
+    """Builds the 'ETG' figure."""
+    return create_relationship_graph(
+        entities, relationships, create_entity_type_node, graph=graph
+    )
@@ -0,0 +1,386 @@
+"""
+KFM EXPORT
+Streaming exporters of the hierarchies and knowledge graphs to data formats.
+
+The IS-A/PART-OF trees and the EG/ETG entity and relationship lists are turned
+into two streams of records, Node(id, name, attributes) and Edge(source, target,
+label), which the writers serialize one record at a time. Nothing is joined in
+memory, so exports of millions of edges only hold the IDs of the nodes already
+written:
+
+    nodes, edges = DATASETS["wordnet"]()
+    export("wordnet.graphml", nodes, edges)
+
+Hierarchy edges go from the child to its parent, as in "graduation IS-A
+university event". Supported formats:
+    - graphml: GraphML, with the name, attributes (as JSON) and label as data keys;
+    - jsonld: JSON-LD, one object per node and one per edge in "@graph";
+    - nt, ttl: RDF as N-Triples or Turtle, with the same IRIs;
+    - csv: edge list with source, target and label columns;
+    - nodes.csv: node list with id, name and attributes (as JSON) columns.
+A path ending in .gz is compressed. From the command line:
+
+    python -m kfm.export wordnet wordnet.ttl
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import sys
+from collections import namedtuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape, quoteattr
+
+from kfm.walk import EDGE_STYLES, walk
+
+# A concept or entity: its ID, its name and a dict of attributes
+Node = namedtuple("Node", ["id", "name", "attributes"])
+
+# A relationship from `source` to `target`, by ID
+Edge = namedtuple("Edge", ["source", "target", "label"])
+
+# Base of the IRIs of concepts, relations and attributes in JSON-LD and RDF
+BASE = "http://example.org/kfm/"
+
+RDFS_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+
+
+def hierarchy_nodes(relations):
+    """
+    Yields the concepts of one or more sets of trees, each concept once.
+
+    Args:
+        relations (dict): Relationship -> list of trees, each represented as a list of dictionaries.
+
+    Yields:
+        Node: The concepts, in pre-order.
+    """
+    seen = set()
+    for trees in relations.values():
+        for tree in trees:
+            for step in walk(tree, key=_concept_id):
+                if step.key not in seen:
+                    seen.add(step.key)
+                    yield Node(step.key, step.node["name"], {})
+
+
+def hierarchy_edges(relations):
+    """
+    Yields the child -> parent edges of one or more sets of trees.
+
+    Args:
+        relations (dict): Relationship -> list of trees. With None as relationship,
+            each node's own 'relationship' key is used.
+
+    Yields:
+        Edge: The edges, labelled with the relationship ("ISA" is written "IS-A").
+    """
+    for relationship, trees in relations.items():
+        for tree in trees:
+            for step in walk(tree, relationship=relationship, key=_concept_id):
+                if step.parent is not None:
+                    label = EDGE_STYLES.get(step.relationship, (None, {}))[1]
+                    yield Edge(
+                        step.key, step.parent, label.get("label", step.relationship)
+                    )
+
+
+def entity_nodes(entities):
+    """
+    Yields the entities of an EG or ETG graph.
+
+    Args:
+        entities (list): A list of entity dictionaries.
+
+    Yields:
+        Node: The entities.
+    """
+    for entity in entities:
+        yield Node(entity["id"], entity["name"], entity.get("attributes", {}))
+
+
+def relationship_edges(relationships):
+    """
+    Yields the relationships of an EG or ETG graph.
+
+    Args:
+        relationships (list): A list of relationship dictionaries.
+
+    Yields:
+        Edge: The relationships.
+    """
+    for rel in relationships:
+        yield Edge(rel["source"]["id"], rel["target"]["id"], rel["label"])
+
+
+def _concept_id(node):
+    return node["id"]
+
+
+def _wordnet():
+    from kfm import wordnet
+
+    relations = {"IS-A": wordnet.isa_trees, "PART-OF": wordnet.part_of_trees}
+    return hierarchy_nodes(relations), hierarchy_edges(relations)
+
+
+def _ukc():
+    from kfm import ukc
+
+    relations = {"IS-A": ukc.isa_trees, "PART-OF": ukc.part_of_trees}
+    return hierarchy_nodes(relations), hierarchy_edges(relations)
+
+
+def _eg():
+    from kfm import eg
+
+    return entity_nodes(eg.entities), relationship_edges(eg.relationships)
+
+
+def _etg():
+    from kfm import etg
+
+    return entity_nodes(etg.entities), relationship_edges(etg.relationships)
+
+
+# Dataset name -> function returning its (nodes, edges) streams
+DATASETS = {"wordnet": _wordnet, "ukc": _ukc, "eg": _eg, "etg": _etg}
+
+
+def write_graphml(stream, nodes, edges):
+    """
+    Writes the nodes and edges as a directed GraphML graph.
+
+    Args:
+        stream (io.TextIOBase): The output stream.
+        nodes (iterable): The Node records.
+        edges (iterable): The Edge records.
+    """
+    stream.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        '  <key id="name" for="node" attr.name="name" attr.type="string"/>\n'
+        '  <key id="attributes" for="node" attr.name="attributes" attr.type="string"/>\n'
+        '  <key id="label" for="edge" attr.name="label" attr.type="string"/>\n'
+        '  <graph id="G" edgedefault="directed">\n'
+    )
+    write = stream.write
+    for node in nodes:
+        data = f'<data key="name">{escape(node.name)}</data>'
+        if node.attributes:
+            data += f'<data key="attributes">{escape(_json(node.attributes))}</data>'
+        write(f"    <node id={quoteattr(node.id)}>{data}</node>\n")
+    for edge in edges:
+        write(
+            f"    <edge source={quoteattr(edge.source)} target={quoteattr(edge.target)}>"
+            f'<data key="label">{escape(edge.label)}</data></edge>\n'
+        )
+    stream.write("  </graph>\n</graphml>\n")
+
+
+def write_jsonld(stream, nodes, edges, base=BASE):
+    """
+    Writes the nodes and edges as a JSON-LD document.
+
+    Each node is an object with its name and attributes, and each edge an
+    object with the ID of its source and the relation as property, which
+    JSON-LD processors merge into the source node.
+
+    Args:
+        stream (io.TextIOBase): The output stream.
+        nodes (iterable): The Node records.
+        edges (iterable): The Edge records.
+        base (str, optional): The base of the IRIs. Default is BASE.
+    """
+    context = {
+        "kfm": f"{base}concept/",
+        "rel": f"{base}relation/",
+        "attr": f"{base}attribute/",
+        "name": RDFS_LABEL,
+    }
+    stream.write(f'{{"@context": {_json(context)},\n"@graph": [')
+    write = stream.write
+    separator = "\n"
+    for node in nodes:
+        record = {"@id": f"kfm:{_local(node.id)}", "name": node.name}
+        for key, value in node.attributes.items():
+            record[f"attr:{_local(key)}"] = value
+        write(separator + _json(record))
+        separator = ",\n"
+    for edge in edges:
+        record = {
+            "@id": f"kfm:{_local(edge.source)}",
+            f"rel:{_local(edge.label)}": {"@id": f"kfm:{_local(edge.target)}"},
+        }
+        write(separator + _json(record))
+        separator = ",\n"
+    stream.write("\n]}\n")
+
+
+def write_ntriples(stream, nodes, edges, base=BASE):
+    """
+    Writes the nodes and edges as RDF N-Triples.
+
+    Args:
+        stream (io.TextIOBase): The output stream.
+        nodes (iterable): The Node records.
+        edges (iterable): The Edge records.
+        base (str, optional): The base of the IRIs. Default is BASE.
+    """
+    concept, relation, attribute = (
+        f"<{base}concept/",
+        f"<{base}relation/",
+        f"<{base}attribute/",
+    )
+    _write_triples(
+        stream, nodes, edges, concept, relation, attribute, f"<{RDFS_LABEL}>", ">"
+    )
+
+
+def write_turtle(stream, nodes, edges, base=BASE):
+    """
+    Writes the nodes and edges as RDF Turtle, with prefixed names.
+
+    Args:
+        stream (io.TextIOBase): The output stream.
+        nodes (iterable): The Node records.
+        edges (iterable): The Edge records.
+        base (str, optional): The base of the IRIs. Default is BASE.
+    """
+    stream.write(
+        f"@prefix kfm: <{base}concept/> .\n"
+        f"@prefix rel: <{base}relation/> .\n"
+        f"@prefix attr: <{base}attribute/> .\n"
+        "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n\n"
+    )
+    _write_triples(stream, nodes, edges, "kfm:", "rel:", "attr:", "rdfs:label", "")
+
+
+def _write_triples(stream, nodes, edges, concept, relation, attribute, label, end):
+    write = stream.write
+    for node in nodes:
+        subject = f"{concept}{_local(node.id)}{end}"
+        write(f"{subject} {label} {_literal(node.name)} .\n")
+        for key, value in node.attributes.items():
+            write(f"{subject} {attribute}{_local(key)}{end} {_literal(value)} .\n")
+    for edge in edges:
+        write(
+            f"{concept}{_local(edge.source)}{end} {relation}{_local(edge.label)}{end} "
+            f"{concept}{_local(edge.target)}{end} .\n"
+        )
+
+
+def write_edges_csv(stream, nodes, edges):
+    """
+    Writes the edges as a CSV edge list with source, target and label columns.
+
+    Args:
+        stream (io.TextIOBase): The output stream, opened with newline="".
+        nodes (iterable): Unused; every format takes the same arguments.
+        edges (iterable): The Edge records.
+    """
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(Edge._fields)
+    writer.writerows(edges)
+
+
+def write_nodes_csv(stream, nodes, edges):
+    """
+    Writes the nodes as CSV with id, name and attributes (a JSON object) columns.
+
+    Args:
+        stream (io.TextIOBase): The output stream, opened with newline="".
+        nodes (iterable): The Node records.
+        edges (iterable): Unused; every format takes the same arguments.
+    """
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(Node._fields)
+    writer.writerows((node.id, node.name, _json(node.attributes)) for node in nodes)
+
+
+# Format name -> writer
+FORMATS = {
+    "graphml": write_graphml,
+    "jsonld": write_jsonld,
+    "nt": write_ntriples,
+    "ttl": write_turtle,
+    "csv": write_edges_csv,
+    "nodes.csv": write_nodes_csv,
+}
+
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _local(value):
+    # Percent-encoded, so the same name is valid in an IRI and as a Turtle local name
+    value = quote(value, safe="").replace(".", "%2E").replace("~", "%7E")
+    return "%2D" + value[1:] if value.startswith("-") else value
+
+
+def _literal(value):
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def format_of(path):
+    """
+    Returns the format of an output path from its extension.
+
+    Args:
+        path (str): The output path, optionally ending in .gz.
+
+    Returns:
+        str: A key of FORMATS.
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    for format in sorted(FORMATS, key=len, reverse=True):
+        if name.endswith(f".{format}"):
+            return format
+    if name.endswith(".json"):
+        return "jsonld"
+    raise ValueError(f"Unsupported export format: {path}")
+
+
+def export(path, nodes, edges, format=None):
+    """
+    Writes the nodes and edges to a file, compressed if the path ends in .gz.
+
+    Args:
+        path (str): The output path.
+        nodes (iterable): The Node records.
+        edges (iterable): The Edge records.
+        format (str, optional): A key of FORMATS. Default is the format of the extension.
+    """
+    writer = FORMATS[format or format_of(path)]
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8", newline="") as stream:
+        writer(stream, nodes, edges)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("output", help="output path, or - for standard output")
+    parser.add_argument("--format", choices=sorted(FORMATS), default=None)
+    args = parser.parse_args(argv)
+
+    nodes, edges = DATASETS[args.dataset]()
+    if args.output == "-":
+        if args.format is None:
+            parser.error("--format is required when writing to standard output")
+        FORMATS[args.format](sys.stdout, nodes, edges)
+        return 0
+    try:
+        export(args.output, nodes, edges, args.format)
+    except ValueError as error:
+        parser.error(str(error))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+KFM FIGURES
+Registry of every figure of the repository, keyed by its output file name.
+
+Builders are imported on demand, so importing this module stays cheap and a
+batch job can generate all variants in a single process:
+
+    from kfm.cache import render
+    from kfm.figures import FIGURES, build
+    for name in FIGURES:
+        render(build(name), name, format="pdf")
+"""
+
+import importlib
+
+# Output file name -> (module, builder function)
+FIGURES = {
+    "wordnet_ISA": ("kfm.wordnet", "isa_figure"),
+    "wordnet_PARTOF": ("kfm.wordnet", "part_of_figure"),
+    "wordnet_ISA&PARTOF": ("kfm.wordnet", "isa_part_of_figure"),
+    "wordnet_ISA&PARTOF_EVENT": ("kfm.wordnet", "event_branch_figure"),
+    "wordnet_ISA&PARTOF_LOCATION": ("kfm.wordnet", "location_branch_figure"),
+    "wordnet_ISA&PARTOF_PERSON": ("kfm.wordnet", "person_branch_figure"),
+    "UKC_ISA": ("kfm.ukc", "isa_figure"),
+    "UKC_ISA_REDUCED": ("kfm.ukc", "isa_reduced_figure"),
+    "UKC_PARTOF": ("kfm.ukc", "part_of_figure"),
+    "UKC_ISA_PARTOF": ("kfm.ukc", "isa_part_of_figure"),
+    "UKC_ISA_PARTOF_REDUCED": ("kfm.ukc", "isa_part_of_reduced_figure"),
+    "UKC_ISA_SUMMARY": ("kfm.ukc", "isa_summary_figure"),
+    "UKC_ISA_PARTOF_SUMMARY": ("kfm.ukc", "isa_part_of_summary_figure"),
+    "Language_Teleology": ("kfm.teleology", "language_figure"),
+    "Knowledge_Teleology": ("kfm.teleology", "knowledge_figure"),
+    "ETG": ("kfm.etg", "etg_figure"),
+    "EG": ("kfm.eg", "eg_figure"),
+}
+
+
+def build(name, graph=None):
+    """
+    Builds the Graphviz graph of a figure.
+
+    Args:
+        name (str): The output file name of the figure, as listed in FIGURES.
+        graph (callable, optional): The graph factory passed to the builder, e.g. a
+            streaming writer from kfm.dotwriter. Default is graphviz.Digraph.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    module, function = FIGURES[name]
+    builder = getattr(importlib.import_module(module), function)
+    return builder() if graph is None else builder(graph=graph)
@@ -0,0 +1,347 @@
+"""
+KFM HIERARCHY
+Compact, array-backed store for the IS-A and PART-OF hierarchies.
+
+Concepts get dense integer IDs and their identifiers and names are interned in
+UTF-8 string pools. The trees are stored column-wise: every occurrence of a
+concept in a tree is a slot with parent / first-child / next-sibling links, and
+each relation type keeps its own (child, parent) concept edge arrays. A concept
+such as 'lecture', drawn both under 'university event' and under 'events', is a
+single concept with one slot per occurrence.
+"""
+
+import sys
+from array import array
+from collections import Counter
+from itertools import accumulate, count
+
+from kfm.walk import flatten
+
+# Relation types, stored per slot as their index in this tuple
+RELATIONS = ("IS-A", "PART-OF")
+
+# Marker for "no slot" in the link arrays
+NONE = -1
+
+
+def adjacency(size, keys, values):
+    """
+    Groups values by key into CSR arrays, keeping their order within each key.
+
+    Args:
+        size (int): The number of keys; keys are integers below `size`.
+        keys (sequence): The key of every value.
+        values (sequence): The values, integers.
+
+    Returns:
+        tuple: The offsets (array of size + 1) and the grouped values (array); the
+            values of key k are values[offsets[k]:offsets[k + 1]].
+    """
+    counts = array("q", [0]) * (size + 1)
+    for key, number in Counter(keys).items():
+        counts[key + 1] = number
+    offsets = array("q", accumulate(counts))
+    grouped = array("i", [0]) * len(values)
+    fill = offsets[:-1]
+    for key, value in zip(keys, values):
+        position = fill[key]
+        grouped[position] = value
+        fill[key] = position + 1
+    return offsets, grouped
+
+
+class StringPool:
+    """
+    Interned strings stored as one UTF-8 buffer plus an offsets array.
+
+    Strings are addressed by their position in the pool. The lookup index used
+    to intern and find strings can be dropped with `compact` and is rebuilt on demand.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+        self._index = {}
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        return self.data[self.offsets[position] : self.offsets[position + 1]].decode()
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def intern(self, text):
+        """
+        Adds a string to the pool unless it is already present.
+
+        Args:
+            text (str): The string to intern.
+
+        Returns:
+            int: The position of the string in the pool.
+        """
+        index = self.index
+        position = index.get(text)
+        if position is None:
+            position = index[text] = len(self)
+            self.data += text.encode()
+            self.offsets.append(len(self.data))
+        return position
+
+    def find(self, text):
+        """
+        Returns the position of a string, or None if it is not in the pool.
+
+        Args:
+            text (str): The string to look up.
+        """
+        return self.index.get(text)
+
+    @property
+    def index(self):
+        """dict: The string -> position lookup index, rebuilt if it was dropped."""
+        if self._index is None:
+            self._index = {text: position for position, text in enumerate(self)}
+        return self._index
+
+    def compact(self):
+        """Drops the lookup index, keeping only the buffer and the offsets."""
+        self._index = None
+
+    def nbytes(self):
+        """
+        Returns the memory used by the pool.
+
+        Returns:
+            int: Bytes used by the buffer, the offsets and the lookup index if present.
+        """
+        size = len(self.data) + self.offsets.itemsize * len(self.offsets)
+        if self._index is not None:
+            size += sys.getsizeof(self._index)
+            size += sum(sys.getsizeof(text) for text in self._index)
+        return size
+
+
+class Hierarchy:
+    """
+    Columnar store of IS-A and PART-OF hierarchies.
+
+    Attributes:
+        ids (StringPool): Concept identifiers; a concept's ID is its position here.
+        names (StringPool): Interned concept names.
+        concept_name (array): Name position of every concept.
+        slot_concept (array): Concept of every tree slot.
+        slot_relation (array): Relation of every slot to its parent, as an index into RELATIONS.
+        parent (array): Parent slot of every slot, or NONE for roots.
+        first_child (array): First child slot of every slot, or NONE for leaves.
+        next_sibling (array): Next sibling slot of every slot, or NONE for the last child.
+        roots (array): The root slots, in insertion order.
+        root_tree (array): The tree of every root slot, numbered in insertion order;
+            the roots of a tree with several top-level nodes share one number.
+        edges (dict): Relation -> (child concepts, parent concepts) edge arrays.
+    """
+
+    def __init__(self):
+        self.ids = StringPool()
+        self.names = StringPool()
+        self.concept_name = array("i")
+        self.slot_concept = array("i")
+        self.slot_relation = array("b")
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.roots = array("i")
+        self.root_tree = array("i")
+        self.edges = {relation: (array("i"), array("i")) for relation in RELATIONS}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_trees(
+        cls, isa_trees=(), part_of_trees=(), isa_root=None, part_of_root=None
+    ):
+        """
+        Converts nested-dict trees into a hierarchy store.
+
+        Args:
+            isa_trees (list, optional): A list of IS-A trees, each represented as a list of dictionaries.
+            part_of_trees (list, optional): A list of PART-OF trees, each represented as a list of dictionaries.
+            isa_root (dict, optional): A root node the IS-A trees are attached to. Default is None.
+            part_of_root (dict, optional): A root node the PART-OF trees are attached to. Default is None.
+
+        Returns:
+            Hierarchy: The resulting store.
+        """
+        hierarchy = cls()
+        hierarchy.add_trees(isa_trees, "IS-A", isa_root)
+        hierarchy.add_trees(part_of_trees, "PART-OF", part_of_root)
+        return hierarchy
+
+    def concept(self, concept_id, name=None):
+        """
+        Returns the integer ID of a concept, adding it if needed.
+
+        Args:
+            concept_id (str): The identifier of the concept, e.g. "46884".
+            name (str, optional): The name of the concept, used when it is added.
+
+        Returns:
+            int: The integer ID of the concept.
+        """
+        position = self.ids.intern(concept_id)
+        if position == len(self.concept_name):
+            self.concept_name.append(self.names.intern(name or concept_id))
+        return position
+
+    def find(self, concept_id):
+        """
+        Returns the integer ID of a concept, or None if it is unknown.
+
+        Args:
+            concept_id (str): The identifier of the concept.
+        """
+        return self.ids.find(concept_id)
+
+    def name(self, concept):
+        """
+        Returns the name of a concept.
+
+        Args:
+            concept (int): The integer ID of the concept.
+        """
+        return self.names[self.concept_name[concept]]
+
+    def add_trees(self, trees, relationship="IS-A", root=None):
+        """
+        Appends nested-dict trees to the store in a single iterative pass.
+
+        Args:
+            trees (list): A list of trees, each represented as a list of dictionaries.
+            relationship (str, optional): The relation linking each node to its parent. Default is "IS-A".
+            root (dict, optional): A root node the trees are attached to. Default is None.
+        """
+        nodes = [node for tree in trees for node in tree]
+        if root is not None:
+            nodes = [dict(root, children=nodes)]
+        if not nodes:
+            return
+        # The tree of every root, so that to_trees groups the roots as they came
+        first = self.root_tree[-1] + 1 if self.root_tree else 0
+        if root is not None:
+            tree_of = iter([first])
+        else:
+            tree_of = iter([first + i for i, tree in enumerate(trees) for _ in tree])
+
+        relation = RELATIONS.index(relationship)
+        children, parents = self.edges[relationship]
+        slots = count(len(self.slot_concept))
+        visited, keys, parent_slots, _ = flatten(
+            nodes, NONE, key=lambda node: next(slots)
+        )
+        concept_of = self.concept
+        slot_concept = self.slot_concept
+        first_child, next_sibling = self.first_child, self.next_sibling
+        add_concept, add_parent = slot_concept.append, self.parent.append
+        add_first, add_next = first_child.append, next_sibling.append
+        add_child, add_parent_concept = children.append, parents.append
+        last_child = {}
+        for node, slot, parent_slot in zip(visited, keys, parent_slots):
+            concept = concept_of(node["id"], node["name"])
+            add_concept(concept)
+            add_parent(parent_slot)
+            add_first(NONE)
+            add_next(NONE)
+            if parent_slot == NONE:
+                self.roots.append(slot)
+                self.root_tree.append(next(tree_of))
+                continue
+            add_child(concept)
+            add_parent_concept(slot_concept[parent_slot])
+            previous = last_child.get(parent_slot)
+            if previous is None:
+                first_child[parent_slot] = slot
+            else:
+                next_sibling[previous] = slot
+            last_child[parent_slot] = slot
+        self.slot_relation.extend([relation] * len(visited))
+
+    def children(self, slot):
+        """
+        Iterates over the child slots of a slot.
+
+        Args:
+            slot (int): The parent slot.
+
+        Yields:
+            int: The child slots, in tree order.
+        """
+        child = self.first_child[slot]
+        while child != NONE:
+            yield child
+            child = self.next_sibling[child]
+
+    def to_trees(self, relationship="IS-A"):
+        """
+        Converts the trees of one relation back to the nested-dict format.
+
+        Args:
+            relationship (str, optional): The relation of the trees to convert. Default is "IS-A".
+
+        Returns:
+            list: The trees as they were added, each represented as a list of its root dictionaries.
+        """
+        relation = RELATIONS.index(relationship)
+        trees = []
+        previous = None
+        for root, number in zip(self.roots, self.root_tree):
+            if self.slot_relation[root] != relation:
+                continue
+            tree = self._node(root)
+            stack = [(root, tree)]
+            while stack:
+                slot, node = stack.pop()
+                for child in self.children(slot):
+                    child_node = self._node(child)
+                    node.setdefault("children", []).append(child_node)
+                    stack.append((child, child_node))
+            if number == previous:
+                trees[-1].append(tree)
+            else:
+                trees.append([tree])
+            previous = number
+        return trees
+
+    def _node(self, slot):
+        concept = self.slot_concept[slot]
+        return {"id": self.ids[concept], "name": self.name(concept)}
+
+    def compact(self):
+        """Drops the string lookup indexes, see StringPool.compact."""
+        self.ids.compact()
+        self.names.compact()
+
+    def nbytes(self):
+        """
+        Returns the memory used by the store.
+
+        Returns:
+            int: Bytes used by the arrays and the string pools.
+        """
+        arrays = [
+            self.concept_name,
+            self.slot_concept,
+            self.slot_relation,
+            self.parent,
+            self.first_child,
+            self.next_sibling,
+            self.roots,
+            self.root_tree,
+        ]
+        for children, parents in self.edges.values():
+            arrays += [children, parents]
+        size = sum(column.itemsize * len(column) for column in arrays)
+        return size + self.ids.nbytes() + self.names.nbytes()
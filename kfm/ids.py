@@ -0,0 +1,118 @@
+"""
+KFM IDS
+Deterministic allocator of the numeric identifiers drawn on UKC and Italian nodes.
+
+Each (language, concept ID) pair is hashed to a number of a fixed width, so the
+same concept gets the same identifier on every run and in every figure, and
+rendered output can be cached and diffed. When the number is already taken by
+another pair or reserved, the pair is hashed again with an attempt counter, so
+identifiers are unique across all languages of the allocator:
+
+    ids = IdAllocator(digits=5, reserved=["55649"])
+    ids.allocate("48450", "ukc")  # the same 5-digit string on every run
+
+A pair only depends on the numbers its own hashes hit, not on its neighbours,
+but when two pairs hash to the same number the first one allocated keeps it.
+Allocate the known pairs up front in a fixed order (see `allocate_many` and
+kfm.ukc) so that the figures and branches built before do not matter.
+"""
+
+import hashlib
+
+# Hashes tried for a pair before falling back to the next free number
+REHASHES = 64
+
+
+class IdAllocator:
+    """
+    Allocates unique, stable fixed-width numeric identifiers.
+
+    Attributes:
+        digits (int): The width of the identifiers.
+        seed (str): Salt of the hash; changing it reshuffles every identifier.
+    """
+
+    def __init__(self, digits=5, seed="", reserved=()):
+        """
+        Creates an allocator.
+
+        Args:
+            digits (int, optional): The width of the identifiers. Default is 5.
+            seed (str, optional): Salt of the hash. Default is "".
+            reserved (iterable, optional): Identifiers that must never be allocated.
+        """
+        self.digits = digits
+        self.seed = seed
+        self._space = 10**digits
+        self._used = bytearray(self._space)
+        self._count = 0
+        self._assigned = {}
+        for identifier in reserved:
+            self._take(int(identifier))
+
+    def __len__(self):
+        return len(self._assigned)
+
+    def _take(self, number):
+        if not self._used[number]:
+            self._used[number] = 1
+            self._count += 1
+
+    def _hash(self, concept_id, language, attempt):
+        # The first attempt hashes the bare pair, as identifiers always have
+        key = f"{self.seed}\0{language}\0{concept_id}"
+        if attempt:
+            key += f"\0{attempt}"
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self._space
+
+    def allocate(self, concept_id, language="ukc"):
+        """
+        Returns the identifier of a concept in a language, allocating it on first use.
+
+        Args:
+            concept_id (str): The identifier of the concept, e.g. "48450".
+            language (str, optional): The language or cluster, e.g. "ukc" or "italian". Default is "ukc".
+
+        Returns:
+            str: The zero-padded identifier.
+
+        Raises:
+            ValueError: If every identifier of the width is taken.
+        """
+        key = (language, concept_id)
+        identifier = self._assigned.get(key)
+        if identifier is not None:
+            return identifier
+        if self._count >= self._space:
+            raise ValueError(
+                f"All {self._space} identifiers of {self.digits} digits are taken"
+            )
+
+        used = self._used
+        for attempt in range(REHASHES):
+            number = self._hash(concept_id, language, attempt)
+            if not used[number]:
+                break
+        else:
+            # A nearly full space: the next free number after the last hash
+            number = used.find(0, number)
+            if number < 0:
+                number = used.find(0)
+        self._take(number)
+        identifier = self._assigned[key] = f"{number:0{self.digits}d}"
+        return identifier
+
+    def allocate_many(self, concept_ids, language="ukc"):
+        """
+        Allocates the identifiers of many concepts in one call.
+
+        Args:
+            concept_ids (iterable): The identifiers of the concepts.
+            language (str, optional): The language or cluster. Default is "ukc".
+
+        Returns:
+            list: The identifiers, in the order of `concept_ids`.
+        """
+        allocate = self.allocate
+        return [allocate(concept_id, language) for concept_id in concept_ids]
@@ -0,0 +1,211 @@
+"""
+KFM INCREMENTAL
+Incremental rebuild of figures: unchanged subtrees reuse their DOT statements.
+
+Every subtree gets a fingerprint, a hash of its nodes and of the fingerprints of
+its children, so an edit anywhere in a subtree changes the fingerprint of the
+subtree and of its ancestors only. The DOT statements written for a subtree are
+cached under its fingerprint, the key it is attached to and the builder
+settings; on the next build every subtree whose fingerprint is unchanged is
+copied from the cache, and only the edited subtrees are formatted again:
+
+    incremental = IncrementalBuilder()
+    dot = wordnet.create_tree_visualization(
+        isa_trees, part_of_trees, create_node=incremental.create_node
+    )
+    incremental.commit()
+    ...  # edit tree_location
+    report = diff(old_trees, new_trees)
+    dot = wordnet.create_tree_visualization(
+        isa_trees, part_of_trees, create_node=incremental.create_node
+    )
+
+The output is byte-identical to a full build. Fragments are appended to the
+`body` of a graphviz.Digraph, statement by statement as its own are; other
+graphs (the writers of kfm.dotwriter, kfm.treelayout.TreeGraph) keep no
+statements to append to, so their subtrees are built through their own API by
+the wrapped builder, without the cache.
+"""
+
+import hashlib
+from collections import namedtuple
+from itertools import chain
+
+import graphviz
+
+from kfm import builder
+from kfm.walk import default_key, flatten
+
+# Concept IDs added, removed and changed (renamed or moved) between two versions
+Diff = namedtuple("Diff", ["added", "removed", "changed"])
+
+
+def fingerprints(node):
+    """
+    Computes the fingerprint of a subtree and of every subtree inside it.
+
+    Args:
+        node (dict): The root of the subtree.
+
+    Returns:
+        tuple: Two dicts keyed by id() of every node: fingerprints (bytes) and subtree sizes.
+    """
+    order, stack = [], [node]
+    while stack:
+        current = stack.pop()
+        order.append(current)
+        stack.extend(current.get("children", ()))
+    digests, sizes = {}, {}
+    blake2b = hashlib.blake2b
+    # Every node comes after its parent in `order`, so children are hashed first
+    for current in reversed(order):
+        data = repr([item for item in current.items() if item[0] != "children"])
+        data, size = data.encode(), 1
+        children = current.get("children")
+        if children:
+            data += b"".join([digests[id(child)] for child in children])
+            size += sum([sizes[id(child)] for child in children])
+        digests[id(current)] = blake2b(data, digest_size=16).digest()
+        sizes[id(current)] = size
+    return digests, sizes
+
+
+class IncrementalBuilder:
+    """
+    Drop-in replacement of kfm.builder.create_node that caches the statements of subtrees.
+
+    Attributes:
+        levels (int): Subtrees are cached down to this depth; deeper subtrees are
+            formatted whole with their cached ancestor.
+        generated (int): Nodes formatted since the last commit.
+        reused (int): Nodes copied from the cache since the last commit.
+    """
+
+    def __init__(self, levels=4, create_node=builder.create_node, key=default_key):
+        """
+        Creates an empty cache.
+
+        Args:
+            levels (int, optional): The depth down to which subtrees are cached. Default is 4.
+            create_node (callable, optional): The node builder whose statements are cached.
+                Default is kfm.builder.create_node.
+            key (callable, optional): The graph key of a node used by `create_node`. Default is default_key.
+        """
+        self.levels = levels
+        self._create_node = create_node
+        self._key = key
+        self._fragments = {}
+        self._used = {}
+        # One recorder collects the statements of every formatted fragment
+        self._recorder = graphviz.Digraph()
+        self.generated = 0
+        self.reused = 0
+
+    def create_node(self, graph, node, parent=None, relationship="IS-A", shape="rect"):
+        """
+        Adds a subtree to the graph, with the signature of kfm.builder.create_node.
+
+        Args:
+            graph (graphviz.Digraph): The Graphviz Digraph object; any other graph is
+                built by the wrapped builder, without the cache.
+            node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+            parent (str, optional): The ID of the parent node. Default is None.
+            relationship (str, optional): The relationship type ("IS-A" or "PART-OF"). Default is "IS-A".
+            shape (str, optional): The Graphviz shape of the nodes. Default is "rect".
+        """
+        if not isinstance(graph, graphviz.Digraph):
+            self._create_node(graph, node, parent, relationship, shape)
+            self.generated += len(flatten([node])[0])
+            return
+
+        digests, sizes = fingerprints(node)
+        settings = (relationship, shape)
+        fragments, used = self._fragments, self._used
+        pieces = []
+        # Pre-order over the subtrees; an "exit" entry joins the pieces of a finished subtree
+        stack = [(node, parent, 0, None)]
+        while stack:
+            current, parent_key, depth, exit_key = stack.pop()
+            if exit_key is not None:
+                start = parent_key
+                fragment = tuple(chain.from_iterable(pieces[start:]))
+                del pieces[start:]
+                pieces.append(fragment)
+                used[exit_key] = fragment
+                continue
+
+            cache_key = (digests[id(current)], parent_key, settings)
+            fragment = used.get(cache_key) or fragments.get(cache_key)
+            if fragment is not None:
+                pieces.append(fragment)
+                used[cache_key] = fragment
+                self.reused += sizes[id(current)]
+                continue
+
+            children = current.get("children")
+            if not children or depth >= self.levels:
+                fragment = self._format(current, parent_key, relationship, shape)
+                pieces.append(fragment)
+                used[cache_key] = fragment
+                self.generated += sizes[id(current)]
+                continue
+
+            # Only the node itself is formatted here; its children are separate subtrees
+            leaf = {k: v for k, v in current.items() if k != "children"}
+            start = len(pieces)
+            pieces.append(self._format(leaf, parent_key, relationship, shape))
+            self.generated += 1
+            stack.append((None, start, depth, cache_key))
+            current_key = self._key(current)
+            for child in reversed(children):
+                stack.append((child, current_key, depth + 1, None))
+        # One body entry per statement: a subgraph indents each entry when it is closed
+        graph.body.extend(chain.from_iterable(pieces))
+
+    def _format(self, node, parent, relationship, shape):
+        body = self._recorder.body
+        body.clear()
+        self._create_node(self._recorder, node, parent, relationship, shape)
+        return tuple(body)
+
+    def commit(self):
+        """
+        Ends a build: keeps the fragments used since the last commit and drops stale ones.
+
+        Returns:
+            tuple: The numbers of generated and reused nodes of the build.
+        """
+        self._fragments, self._used = self._used, {}
+        counts = self.generated, self.reused
+        self.generated = self.reused = 0
+        return counts
+
+
+def diff(old_trees, new_trees):
+    """
+    Compares two versions of a set of trees concept by concept.
+
+    Args:
+        old_trees (list): The previous trees, each represented as a list of dictionaries.
+        new_trees (list): The current trees, each represented as a list of dictionaries.
+
+    Returns:
+        Diff: Sorted concept IDs added, removed, and changed (renamed or with different parents).
+    """
+
+    def concepts(trees):
+        nodes, _, parents, _ = flatten(
+            [node for tree in trees for node in tree], key=lambda node: node["id"]
+        )
+        result = {}
+        for node, parent in zip(nodes, parents):
+            name, parent_ids = result.setdefault(node["id"], (node["name"], set()))
+            parent_ids.add(parent)
+        return result
+
+    old, new = concepts(old_trees), concepts(new_trees)
+    return Diff(
+        added=sorted(new.keys() - old.keys()),
+        removed=sorted(old.keys() - new.keys()),
+        changed=sorted(c for c in old.keys() & new.keys() if old[c] != new[c]),
+    )
@@ -0,0 +1,342 @@
+"""
+KFM LEXICON
+Multilingual lexicon: the lexicalization of every concept in every language.
+
+Lexicalizations are keyed by concept ID and language code ("it", "de", ...) and
+can be loaded from:
+    - TSV: a header "id<TAB>it<TAB>de..." and one row per concept, empty cells for gaps;
+    - JSON: {"it": {"48450": "laurea", ...}, "de": {...}};
+    - SQLite: a table lexicalizations(concept_id, language, lemma).
+
+Lemmas are interned in one UTF-8 pool shared by all languages, concept IDs are kept
+sorted in a second pool, indexed by a dict on the first lookup, and each language
+is a single array of lemma positions. A lexicon can be saved in that layout and
+memory-mapped back, so a build with 100k+ entries starts without parsing anything:
+
+    lexicon = load("lexicon.tsv")
+    lexicon.save("lexicon.lex")
+    lexicon = Lexicon.open("lexicon.lex")
+    lexicon.get("48450", "it")  # 'laurea'
+"""
+
+import csv
+import json
+import mmap
+import os
+import sqlite3
+from array import array
+from functools import lru_cache
+
+from kfm.hierarchy import StringPool
+
+# The lexicon shipped with the package, used by the UKC figures
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "lexicon.tsv")
+
+# First bytes of a saved lexicon
+MAGIC = b"KFMLEX1\n"
+
+# Marker for "no lexicalization" in the language columns
+MISSING = -1
+
+
+class _Pool:
+    """Read-only string pool over an offsets array and a UTF-8 buffer, possibly memory-mapped."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        return bytes(self.data[self.offsets[position] : self.offsets[position + 1]])
+
+
+class Lexicon:
+    """
+    Concept ID -> lemma lookup for several languages.
+
+    Attributes:
+        languages (tuple): The language codes of the lexicon.
+    """
+
+    def __init__(self, languages, concepts, lemmas, columns, buffer=None):
+        self.languages = tuple(languages)
+        self._concepts = concepts
+        self._lemmas = lemmas
+        self._columns = columns
+        # The memory map the arrays are views of, kept open as long as the lexicon
+        self._buffer = buffer
+        # Concept ID -> position, decoded from the concept pool on the first lookup
+        self._positions = None
+
+    def __len__(self):
+        return len(self._concepts)
+
+    def __contains__(self, concept_id):
+        return self._position(concept_id) is not None
+
+    def __iter__(self):
+        for position in range(len(self._concepts)):
+            yield self._concepts[position].decode()
+
+    @classmethod
+    def from_dict(cls, lexicalizations):
+        """
+        Builds a lexicon from nested dictionaries.
+
+        Args:
+            lexicalizations (dict): Language code -> {concept ID: lemma}.
+
+        Returns:
+            Lexicon: The lexicon.
+        """
+        languages = list(lexicalizations)
+        concept_ids = sorted(
+            {
+                concept_id
+                for lemmas in lexicalizations.values()
+                for concept_id in lemmas
+            },
+            key=str.encode,
+        )
+        concepts = StringPool()
+        for concept_id in concept_ids:
+            concepts.intern(concept_id)
+        lemmas = StringPool()
+        columns = {}
+        for language in languages:
+            lemma_of = lexicalizations[language]
+            column = array("i", [MISSING]) * len(concept_ids)
+            for position, concept_id in enumerate(concept_ids):
+                lemma = lemma_of.get(concept_id)
+                if lemma:
+                    column[position] = lemmas.intern(lemma)
+            columns[language] = column
+        return cls(
+            languages,
+            _Pool(concepts.offsets, concepts.data),
+            _Pool(lemmas.offsets, lemmas.data),
+            columns,
+        )
+
+    @classmethod
+    def open(cls, path):
+        """
+        Memory-maps a lexicon saved with `save`.
+
+        Args:
+            path (str): The path of the saved lexicon.
+
+        Returns:
+            Lexicon: The lexicon, reading its arrays straight from the file.
+
+        Raises:
+            ValueError: If the file is not a saved lexicon.
+        """
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a saved lexicon")
+        view = memoryview(buffer)
+        position = len(MAGIC) + 8
+        header_size = int.from_bytes(buffer[len(MAGIC) : position], "little")
+        header = json.loads(bytes(view[position : position + header_size]))
+        position = _align(position + header_size)
+
+        def section(size, typecode=None):
+            nonlocal position
+            data = view[position : position + size]
+            position = _align(position + size)
+            return data.cast(typecode) if typecode else data
+
+        concepts, lemmas = header["concepts"], header["lemmas"]
+        concept_offsets = section(8 * (concepts + 1), "q")
+        concept_pool = _Pool(concept_offsets, section(concept_offsets[-1]))
+        lemma_offsets = section(8 * (lemmas + 1), "q")
+        lemma_pool = _Pool(lemma_offsets, section(lemma_offsets[-1]))
+        columns = {
+            language: section(4 * concepts, "i") for language in header["languages"]
+        }
+        return cls(header["languages"], concept_pool, lemma_pool, columns, buffer)
+
+    def save(self, path):
+        """
+        Saves the lexicon in a layout that `open` can memory-map.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        header = json.dumps(
+            {
+                "languages": list(self.languages),
+                "concepts": len(self._concepts),
+                "lemmas": len(self._lemmas),
+            }
+        ).encode()
+        sections = [
+            self._concepts.offsets,
+            self._concepts.data,
+            self._lemmas.offsets,
+            self._lemmas.data,
+        ] + [self._columns[language] for language in self.languages]
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(len(header).to_bytes(8, "little"))
+            file.write(header)
+            for data in sections:
+                file.write(b"\0" * (_align(file.tell()) - file.tell()))
+                file.write(memoryview(data).cast("B"))
+
+    def _position(self, concept_id):
+        positions = self._positions
+        if positions is None:
+            # Bisecting the pool costs a slice and a bytes object per probe; one pass
+            # over the buffer makes every later lookup a dict lookup
+            offsets, data = self._concepts.offsets, bytes(self._concepts.data)
+            positions = self._positions = {
+                data[offsets[position] : offsets[position + 1]].decode(): position
+                for position in range(len(self._concepts))
+            }
+        return positions.get(concept_id)
+
+    def get(self, concept_id, language, default=None):
+        """
+        Returns the lexicalization of a concept in a language.
+
+        Args:
+            concept_id (str): The identifier of the concept, e.g. "48450".
+            language (str): The language code, e.g. "it".
+            default (str, optional): The value returned for missing lexicalizations. Default is None.
+
+        Returns:
+            str: The lemma, or `default`.
+        """
+        column = self._columns.get(language)
+        position = self._position(concept_id)
+        if column is None or position is None or column[position] == MISSING:
+            return default
+        return self._lemmas[column[position]].decode()
+
+    def lexicalizations(self, concept_id):
+        """
+        Returns the lexicalizations of a concept in every language.
+
+        Args:
+            concept_id (str): The identifier of the concept.
+
+        Returns:
+            dict: Language code -> lemma, for the languages that lexicalize the concept.
+        """
+        position = self._position(concept_id)
+        if position is None:
+            return {}
+        return {
+            language: self._lemmas[column[position]].decode()
+            for language, column in self._columns.items()
+            if column[position] != MISSING
+        }
+
+
+def _align(position):
+    return (position + 7) & ~7
+
+
+def load_tsv(path):
+    """
+    Loads a lexicon from a TSV file with an "id" column and one column per language.
+
+    Args:
+        path (str): The path of the TSV file.
+
+    Returns:
+        Lexicon: The lexicon.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = csv.reader(file, delimiter="\t", quoting=csv.QUOTE_NONE)
+        languages = next(rows)[1:]
+        lexicalizations = {language: {} for language in languages}
+        columns = [lexicalizations[language] for language in languages]
+        for row in rows:
+            if not row:
+                # Blank lines
+                continue
+            concept_id, *lemmas = row
+            for lemma_of, lemma in zip(columns, lemmas):
+                if lemma:
+                    lemma_of[concept_id] = lemma
+    return Lexicon.from_dict(lexicalizations)
+
+
+def load_json(path):
+    """
+    Loads a lexicon from a JSON object mapping each language to {concept ID: lemma}.
+
+    Args:
+        path (str): The path of the JSON file.
+
+    Returns:
+        Lexicon: The lexicon.
+    """
+    with open(path, encoding="utf-8") as file:
+        return Lexicon.from_dict(json.load(file))
+
+
+def load_sqlite(path, table="lexicalizations"):
+    """
+    Loads a lexicon from a SQLite table with concept_id, language and lemma columns.
+
+    Args:
+        path (str): The path of the database.
+        table (str, optional): The name of the table. Default is "lexicalizations".
+
+    Returns:
+        Lexicon: The lexicon.
+    """
+    lexicalizations = {}
+    connection = sqlite3.connect(path)
+    try:
+        for concept_id, language, lemma in connection.execute(
+            f'SELECT concept_id, language, lemma FROM "{table}"'
+        ):
+            lexicalizations.setdefault(language, {})[concept_id] = lemma
+    finally:
+        connection.close()
+    return Lexicon.from_dict(lexicalizations)
+
+
+def load(path):
+    """
+    Loads a lexicon, choosing the format from the file extension.
+
+    Args:
+        path (str): A .tsv, .json, .sqlite/.db or saved .lex file.
+
+    Returns:
+        Lexicon: The lexicon.
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".tsv":
+        return load_tsv(path)
+    if extension == ".json":
+        return load_json(path)
+    if extension in (".sqlite", ".db"):
+        return load_sqlite(path)
+    if extension == ".lex":
+        return Lexicon.open(path)
+    raise ValueError(f"Unsupported lexicon format: {path}")
+
+
+@lru_cache(maxsize=None)
+def default_lexicon():
+    """
+    Loads the lexicon named by the KFM_LEXICON environment variable, or the shipped one, once.
+
+    Returns:
+        Lexicon: The lexicon.
+    """
+    return load(os.environ.get("KFM_LEXICON") or DEFAULT_PATH)
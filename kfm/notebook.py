@@ -0,0 +1,260 @@
+"""
+KFM NOTEBOOK
+Keeps Knowledge_Formal_Modelling.ipynb small: external images and figure cells.
+
+The notebook used to embed its diagrams as base64 data URIs in markdown cells
+and to repeat every script of the repository in full in its code cells, so it
+weighed megabytes and each cell rebuilt and re-rendered its figure. `slim`:
+    - writes every embedded image (data URIs in markdown or HTML, and cell
+      attachments) to a file named after the hash of its content, e.g.
+      images/3f2a9c0d5e1b7a64.png, and points the cell at that file;
+    - replaces every code cell reproducing a script of the repository, matched
+      by the title of its docstring, with a call to `show` for the figures the
+      script renders;
+    - clears the outputs and execution counts of the code cells, so runs do not
+      show up in diffs.
+
+`show` builds a figure from the kfm.figures registry and displays its rendering
+from the render cache (see kfm.cache), so unchanged figures never run Graphviz:
+
+    python -m kfm.notebook Knowledge_Formal_Modelling.ipynb
+"""
+
+import argparse
+import ast
+import base64
+import binascii
+import glob
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+
+# Directory of the extracted images, relative to the notebook
+IMAGE_DIR = "images"
+
+# An embedded image: data:image/png;base64,...
+DATA_URI = re.compile(r"data:(image/[\w.+-]+);base64,([A-Za-z0-9+/=\s]+)")
+
+# A reference to a cell attachment in markdown or HTML
+ATTACHMENT = re.compile(r"attachment:([^\s)\"']+)")
+
+# Extensions of the image types mimetypes does not know on every platform
+EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/svg+xml": ".svg"}
+
+
+def show(*names, format="svg"):
+    """
+    Displays figures of the kfm.figures registry in a notebook, from the render cache.
+
+    Args:
+        *names (str): The output file names of the figures, as listed in FIGURES.
+        format (str, optional): The output format, "svg" or "png". Default is "svg".
+    """
+    from IPython.display import SVG, Image, display
+
+    from kfm.cache import render
+    from kfm.figures import build
+
+    for name in names:
+        path = render(build(name), name, format=format)
+        display(SVG(filename=path) if format == "svg" else Image(filename=path))
+
+
+def _source(cell):
+    source = cell.get("source", "")
+    return source if isinstance(source, str) else "".join(source)
+
+
+def _lines(text):
+    # Cell sources are stored as lists of lines, each but the last ending in \n
+    return text.splitlines(keepends=True)
+
+
+def save_image(data, mime, directory):
+    """
+    Writes an image to a file named after the hash of its content, once.
+
+    Args:
+        data (bytes): The image.
+        mime (str): The MIME type of the image, e.g. "image/png".
+        directory (str): The image directory.
+
+    Returns:
+        str: The file name of the image in the directory.
+    """
+    extension = EXTENSIONS.get(mime) or mimetypes.guess_extension(mime) or ".bin"
+    name = hashlib.sha256(data).hexdigest()[:16] + extension
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as stream:
+            stream.write(data)
+    return name
+
+
+def extract_images(cell, directory, prefix=IMAGE_DIR):
+    """
+    Moves the images embedded in a markdown cell to content-hashed files.
+
+    Args:
+        cell (dict): The notebook cell, changed in place.
+        directory (str): The image directory.
+        prefix (str, optional): The path of the image directory as seen from the
+            notebook. Default is IMAGE_DIR.
+
+    Returns:
+        int: The number of images moved out of the cell.
+    """
+    moved = 0
+
+    def replace(match):
+        nonlocal moved
+        try:
+            data = base64.b64decode(re.sub(r"\s", "", match.group(2)), validate=True)
+        except binascii.Error:
+            return match.group(0)
+        moved += 1
+        return f"{prefix}/{save_image(data, match.group(1), directory)}"
+
+    source = DATA_URI.sub(replace, _source(cell))
+
+    attachments = cell.get("attachments", {})
+    files = {}
+    for name, bundle in attachments.items():
+        for mime, data in bundle.items():
+            if mime.startswith("image/"):
+                files[name] = save_image(base64.b64decode(data), mime, directory)
+                break
+    if files:
+        source = ATTACHMENT.sub(
+            lambda match: (
+                f"{prefix}/{files[match.group(1)]}"
+                if match.group(1) in files
+                else match.group(0)
+            ),
+            source,
+        )
+        for name in files:
+            del attachments[name]
+        if not attachments:
+            del cell["attachments"]
+        moved += len(files)
+    if moved:
+        cell["source"] = _lines(source)
+    return moved
+
+
+def scripts(directory):
+    """
+    Reads the title, docstring and rendered figures of the scripts of the repository.
+
+    Args:
+        directory (str): The directory of the scripts.
+
+    Returns:
+        dict: Docstring title -> (docstring, names of the figures the script renders).
+    """
+    found = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.py"))):
+        with open(path, encoding="utf-8") as stream:
+            tree = ast.parse(stream.read())
+        docstring = ast.get_docstring(tree, clean=False)
+        if not docstring:
+            continue
+        names = [
+            node.args[1].value
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Call)
+            and getattr(node.func, "id", None) == "render"
+            and len(node.args) > 1
+            and isinstance(node.args[1], ast.Constant)
+        ]
+        if names:
+            found[docstring.strip().splitlines()[0]] = (docstring, names)
+    return found
+
+
+def figure_cell(cell, known):
+    """
+    Replaces a code cell reproducing a script by a call to `show`.
+
+    Args:
+        cell (dict): The code cell, changed in place.
+        known (dict): The scripts, as returned by `scripts`.
+
+    Returns:
+        bool: True if the cell reproduced a script and was replaced.
+    """
+    try:
+        docstring = ast.get_docstring(ast.parse(_source(cell)), clean=False)
+    except SyntaxError:
+        # IPython magics such as %pip are not Python
+        return False
+    if not docstring or docstring.strip().splitlines()[0] not in known:
+        return False
+    docstring, names = known[docstring.strip().splitlines()[0]]
+    arguments = ", ".join(json.dumps(name) for name in names)
+    cell["source"] = _lines(
+        f'"""{docstring}"""\n\nfrom kfm.notebook import show\n\nshow({arguments})'
+    )
+    return True
+
+
+def slim(notebook, directory, script_dir=None, clear_outputs=True):
+    """
+    Moves the embedded images of a notebook to files and its figure cells to `show` calls.
+
+    Args:
+        notebook (dict): The notebook, in the nbformat 4 JSON structure; changed in place.
+        directory (str): The directory of the notebook; images go to its IMAGE_DIR.
+        script_dir (str, optional): The directory of the scripts. Default is `directory`.
+        clear_outputs (bool, optional): Whether to clear the outputs and execution
+            counts of the code cells. Default is True.
+
+    Returns:
+        tuple: The number of images extracted and of code cells replaced.
+    """
+    known = scripts(directory if script_dir is None else script_dir)
+    image_dir = os.path.join(directory, IMAGE_DIR)
+    images = cells = 0
+    for cell in notebook["cells"]:
+        if cell["cell_type"] == "code":
+            cells += figure_cell(cell, known)
+            if clear_outputs:
+                cell["outputs"] = []
+                cell["execution_count"] = None
+        else:
+            images += extract_images(cell, image_dir)
+    return images, cells
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("notebook", help="the .ipynb file, rewritten in place")
+    parser.add_argument("--keep-outputs", action="store_true")
+    args = parser.parse_args(argv)
+
+    with open(args.notebook, encoding="utf-8") as stream:
+        notebook = json.load(stream)
+    before = os.path.getsize(args.notebook)
+    images, cells = slim(
+        notebook,
+        os.path.dirname(os.path.abspath(args.notebook)),
+        clear_outputs=not args.keep_outputs,
+    )
+    # The layout of the Jupyter and Colab files, so only the changed cells show in diffs
+    with open(args.notebook, "w", encoding="utf-8") as stream:
+        json.dump(notebook, stream, indent=2, ensure_ascii=False)
+    after = os.path.getsize(args.notebook)
+    print(
+        f"{images} images extracted, {cells} cells replaced: "
+        f"{before / 1024:.0f} KB -> {after / 1024:.0f} KB"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+"""
+KFM PARTITION
+Partitioned layout of hierarchies too large for a single Graphviz run.
+
+`dot` layout time grows super-linearly with the number of nodes, so a large
+hierarchy is split into parts, one per top-level tree and, with a node budget,
+further into subtrees of at most `max_nodes` nodes. Every part is drawn by the
+usual figure builder and laid out by its own Graphviz process, in parallel; the
+laid-out parts are then cut into tiles, one per cluster, the tiles of each
+cluster are packed side by side in rows (the meta-layout), and all is stitched
+into one graph with fixed positions, which `neato -n2` renders without computing
+any layout:
+
+    graph = tiled_layout(ukc.isa_trees, ukc.create_isa_tree_visualization, max_nodes=500)
+    render(graph, "UKC_ISA_TILED", format="pdf")
+
+A detached subtree is drawn with the chain of its ancestors, so each part is a
+valid figure; nodes drawn in several parts (the ancestors, and the roots every
+builder adds) are merged into their first occurrence, as `dot` merges nodes of
+the same name, each cluster (e.g. the English, UKC and Italian trees of kfm.ukc)
+is drawn once around its tiles, and the edges that cross tiles are routed as
+straight lines.
+"""
+
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import graphviz
+
+from kfm import cache
+from kfm.walk import flatten
+
+# Space left between the packed parts, in points
+GAP = 36
+
+# Cache key of the renderings with fixed positions, see kfm.cache
+NO_OP_ENGINE = "neato -n2"
+
+
+def _concept(node):
+    return node["id"]
+
+
+def _copy(node, detached=frozenset()):
+    # Copies a subtree iteratively, leaving out the detached subtrees
+    root = {key: value for key, value in node.items() if key != "children"}
+    stack = [(node, root)]
+    while stack:
+        original, copy = stack.pop()
+        children = [
+            child
+            for child in original.get("children", ())
+            if child["id"] not in detached
+        ]
+        if children:
+            copy["children"] = []
+            for child in children:
+                child_copy = {
+                    key: value for key, value in child.items() if key != "children"
+                }
+                copy["children"].append(child_copy)
+                stack.append((child, child_copy))
+    return root
+
+
+def partition(trees, max_nodes=None):
+    """
+    Splits trees into parts: one per tree, and subtrees of at most `max_nodes` nodes.
+
+    Subtrees are detached bottom-up, largest first, until the rest of their parent's
+    subtree fits in the budget; a concept whose children are all leaves is never split.
+    Concepts are told apart by ID, so a subtree drawn below several parents (as in
+    the WNDB trees, see kfm.wndb) is detached once, below its first parent.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        max_nodes (int, optional): The node budget of a part. Default is None, one part per tree.
+
+    Returns:
+        list: The parts, each a list of trees in the input format; a detached subtree
+            hangs below copies of its ancestors. Parts come in pre-order, each after
+            the part holding the parent of its root.
+    """
+    parts = []
+    for tree in trees:
+        nodes, keys, parents, _ = flatten(tree, key=_concept)
+        detached = set()
+        if max_nodes is not None:
+            residual = {}
+            # Children come after their parent in pre-order, so they are sized first
+            for node, key in zip(reversed(nodes), reversed(keys)):
+                if key in residual:
+                    continue
+                children = node.get("children", ())
+                sizes = sorted(
+                    (
+                        (residual[child["id"]], i)
+                        for i, child in enumerate(children)
+                        if child["id"] not in detached
+                    ),
+                    reverse=True,
+                )
+                total = 1 + sum(size for size, _ in sizes)
+                for size, i in sizes:
+                    if total <= max_nodes or size <= 1:
+                        break
+                    detached.add(children[i]["id"])
+                    total -= size
+                residual[key] = total
+
+        # The first occurrence of every concept, in pre-order
+        node_of, parent_of = {}, {}
+        for node, key, parent in zip(nodes, keys, parents):
+            if key not in node_of:
+                node_of[key], parent_of[key] = node, parent
+        parts.append([[_copy(node, detached) for node in tree]])
+        for key, node in node_of.items():
+            if key not in detached:
+                continue
+            # The ancestors of the subtree, as stubs without their other children
+            part_root = _copy(node, detached)
+            ancestor = parent_of[key]
+            while ancestor is not None:
+                stub = {
+                    key: value
+                    for key, value in node_of[ancestor].items()
+                    if key != "children"
+                }
+                stub["children"] = [part_root]
+                part_root = stub
+                ancestor = parent_of[ancestor]
+            parts.append([[part_root]])
+    return parts
+
+
+def layout_source(source, engine="dot", timeout=None):
+    """
+    Lays out a DOT source with Graphviz and returns the positions.
+
+    Args:
+        source (str): The DOT source of the graph.
+        engine (str, optional): The Graphviz layout engine. Default is "dot".
+        timeout (float, optional): Seconds after which the process is killed. Default is None.
+
+    Returns:
+        dict: The laid-out graph in the Graphviz JSON format (-Tjson0).
+
+    Raises:
+        subprocess.TimeoutExpired: If the layout takes longer than `timeout`.
+        subprocess.CalledProcessError: If Graphviz fails.
+    """
+    completed = subprocess.run(
+        [engine, "-Tjson0"],
+        input=source.encode(),
+        capture_output=True,
+        timeout=timeout,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def _shift(value, dx, dy):
+    # Moves a point list ("x,y", or a spline "e,x,y s,x,y x,y ...") by (dx, dy)
+    points = []
+    for token in value.split():
+        prefix = token[:2] if token[:2] in ("e,", "s,") else ""
+        x, y = token[len(prefix) :].split(",")[:2]
+        points.append(f"{prefix}{float(x) + dx:.2f},{float(y) + dy:.2f}")
+    return " ".join(points)
+
+
+def pack(sizes, gap=GAP):
+    """
+    Places boxes left to right in rows of about the same width, the meta-layout of the parts.
+
+    Args:
+        sizes (list): The (width, height) of every box, in points.
+        gap (float, optional): The space between boxes. Default is GAP.
+
+    Returns:
+        list: The (x, y) offset of the lower-left corner of every box; the first row is on top.
+    """
+    area = sum((width + gap) * (height + gap) for width, height in sizes)
+    row_width = max([area**0.5] + [width for width, _ in sizes])
+    rows = [[]]
+    used = 0
+    for i, (width, _) in enumerate(sizes):
+        if rows[-1] and used + width > row_width:
+            rows.append([])
+            used = 0
+        rows[-1].append(i)
+        used += width + gap
+    heights = [max(sizes[i][1] for i in row) for row in rows]
+    offsets = [None] * len(sizes)
+    top = sum(heights) + gap * (len(rows) - 1)
+    for row, height in zip(rows, heights):
+        top -= height
+        x = 0
+        for i in row:
+            offsets[i] = (x, top)
+            x += sizes[i][0] + gap
+        top -= gap
+    return offsets
+
+
+def _box(values):
+    return [float(v) for v in values.split(",")]
+
+
+def _tiles(layout):
+    # Splits a laid-out part into its top-level clusters and the nodes outside them,
+    # as (cluster object or None, member gvids, box) in drawing order
+    objects = layout.get("objects", [])
+    nested = {gvid for obj in objects for gvid in obj.get("subgraphs", ())}
+    clusters = [
+        obj
+        for obj in objects
+        if "pos" not in obj
+        and obj["name"].startswith("cluster")
+        and obj["_gvid"] not in nested
+    ]
+    tiles = []
+    clustered = set()
+    for obj in clusters:
+        members = [gvid for gvid in obj.get("nodes", ()) if gvid not in clustered]
+        clustered.update(members)
+        tiles.append((obj, members, _box(obj["bb"])))
+    free = [
+        obj["_gvid"]
+        for obj in objects
+        if "pos" in obj and obj["_gvid"] not in clustered
+    ]
+    if free and not clusters:
+        tiles.append((None, free, _box(layout["bb"])))
+    elif free:
+        # The box of the nodes around the clusters, from their size in inches
+        corners = []
+        for gvid in free:
+            obj = objects[gvid]
+            x, y = _box(obj["pos"])[:2]
+            half_width = float(obj.get("width", 0)) * 36
+            half_height = float(obj.get("height", 0)) * 36
+            corners.append(
+                (x - half_width, y - half_height, x + half_width, y + half_height)
+            )
+        tiles.append(
+            (
+                None,
+                free,
+                [f(side) for f, side in zip((min, min, max, max), zip(*corners))],
+            )
+        )
+    return tiles
+
+
+def _place(boxes, gap):
+    # Packs boxes and returns the shift of every box and the size of the whole
+    offsets = pack(
+        [(right - left, top - bottom) for left, bottom, right, top in boxes], gap
+    )
+    shifts = [(x - box[0], y - box[1]) for box, (x, y) in zip(boxes, offsets)]
+    width = max(box[2] + dx for box, (dx, _) in zip(boxes, shifts))
+    height = max(box[3] + dy for box, (_, dy) in zip(boxes, shifts))
+    return shifts, (width, height)
+
+
+def stitch(layouts, gap=GAP):
+    """
+    Packs laid-out parts side by side and merges them into one graph with fixed positions.
+
+    Every part is cut into tiles, one per top-level cluster and one for the nodes
+    outside the clusters; the tiles of the same cluster in all parts are packed
+    together, so the stitched graph draws each cluster once, around all of them.
+
+    Args:
+        layouts (list): The parts in the Graphviz JSON format, see `layout_source`.
+        gap (float, optional): The space between tiles, in points. Default is GAP.
+
+    Returns:
+        graphviz.Digraph: The stitched graph, to render with `render` (neato -n2).
+    """
+    # The tiles of every cluster, grouped by name in the order they are first met
+    groups = {}
+    for part, layout in enumerate(layouts):
+        for cluster, members, box in _tiles(layout):
+            name = None if cluster is None else cluster["name"]
+            groups.setdefault(name, []).append((part, cluster, members, box))
+
+    # The meta-layout: the tiles within each group, then the groups
+    placed = [_place([tile[3] for tile in tiles], gap) for tiles in groups.values()]
+    shifts, (width, height) = _place([[0, 0, *size] for _, size in placed], gap)
+
+    dot = graphviz.Digraph(comment="Partitioned layout", engine="neato")
+    drawn_nodes = set()
+    # The shift of the tile owning each node, by part and name
+    owner = [{} for _ in layouts]
+    for (name, tiles), (tile_shifts, size), (x, y) in zip(
+        groups.items(), placed, shifts
+    ):
+        members = []
+        for (part, _, gvids, _), (dx, dy) in zip(tiles, tile_shifts):
+            objects = layouts[part]["objects"]
+            for gvid in gvids:
+                obj = objects[gvid]
+                node = obj["name"]
+                if node in drawn_nodes:
+                    # Drawn by an earlier tile: the first occurrence is kept
+                    continue
+                drawn_nodes.add(node)
+                owner[part][node] = (dx + x, dy + y)
+                members.append(node)
+                attributes = {
+                    key: str(value)
+                    for key, value in obj.items()
+                    if not key.startswith("_") and key not in ("name", "pos")
+                }
+                dot.node(node, pos=_shift(obj["pos"], dx + x, dy + y), **attributes)
+        if name is None:
+            continue
+        # The cluster is drawn around all its tiles, its label on top
+        attributes = {
+            key: str(value)
+            for key, value in tiles[0][1].items()
+            if not key.startswith("_")
+            and key not in ("name", "nodes", "edges", "subgraphs", "bb", "lp")
+        }
+        attributes["bb"] = f"{x:.2f},{y:.2f},{x + size[0]:.2f},{y + size[1]:.2f}"
+        if "lp" in tiles[0][1]:
+            label_y = y + size[1] - (tiles[0][3][3] - _box(tiles[0][1]["lp"])[1])
+            attributes["lp"] = f"{x + size[0] / 2:.2f},{label_y:.2f}"
+        with dot.subgraph(name=name) as cluster:
+            cluster.attr(**attributes)
+            for member in members:
+                cluster.node(member)
+
+    drawn_edges = set()
+    for part, layout in enumerate(layouts):
+        names = {
+            obj["_gvid"]: obj["name"]
+            for obj in layout.get("objects", [])
+            if "pos" in obj
+        }
+        for obj in layout.get("edges", []):
+            tail, head = names[obj["tail"]], names[obj["head"]]
+            key = (tail, head, obj.get("label"))
+            if key in drawn_edges:
+                continue
+            drawn_edges.add(key)
+            attributes = {
+                k: str(v)
+                for k, v in obj.items()
+                if not k.startswith("_") and k not in ("tail", "head")
+            }
+            shift = owner[part].get(tail)
+            if shift is not None and shift == owner[part].get(head):
+                for k in ("pos", "lp", "head_lp", "tail_lp", "xlp"):
+                    if k in attributes:
+                        attributes[k] = _shift(attributes[k], *shift)
+            else:
+                # The edge crosses tiles: its spline is dropped and neato draws a line
+                for k in ("pos", "lp", "head_lp", "tail_lp", "xlp"):
+                    attributes.pop(k, None)
+            dot.edge(tail, head, **attributes)
+    dot.attr(bb=f"0,0,{width:.2f},{height:.2f}", splines="line")
+    return dot
+
+
+def tiled_layout(trees, build, max_nodes=None, jobs=None, timeout=None, progress=None):
+    """
+    Lays out a large hierarchy part by part, in parallel, and stitches the parts.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        build (callable): The figure builder, called with the trees of one part and
+            returning a graphviz.Digraph, e.g. ukc.create_isa_tree_visualization.
+        max_nodes (int, optional): The node budget of a part. Default is None, one part per tree.
+        jobs (int, optional): The number of concurrent Graphviz processes.
+            Default is the number of cores.
+        timeout (float, optional): Seconds after which the layout of a part is abandoned.
+            Default is None.
+        progress (callable, optional): Called with (done, total) as each part is laid out.
+
+    Returns:
+        graphviz.Digraph: The stitched graph, see `stitch`.
+    """
+    graphs = [build(part) for part in partition(trees, max_nodes)]
+
+    def lay_out(graph):
+        return layout_source(graph.source, graph.engine, timeout)
+
+    # Each worker only waits on its Graphviz subprocess, so threads are enough
+    layouts = []
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        for layout in pool.map(lay_out, graphs):
+            layouts.append(layout)
+            if progress is not None:
+                progress(len(layouts), len(graphs))
+    return stitch(layouts)
+
+
+def render(graph, filename, format="pdf", directory=None):
+    """
+    Renders a stitched graph with its fixed positions, reusing the render cache.
+
+    Args:
+        graph (graphviz.Digraph): The graph returned by `stitch` or `tiled_layout`.
+        filename (str): The output file name, without the extension.
+        format (str, optional): The output format. Default is "pdf".
+        directory (str, optional): The cache directory. Default is cache.cache_dir().
+
+    Returns:
+        str: The path of the rendered file.
+    """
+    directory = directory or cache.cache_dir()
+    output = f"{filename}.{format}"
+    if directory is not None and cache.fetch(
+        graph.source, output, format, NO_OP_ENGINE, directory
+    ):
+        return output
+    output = graph.render(filename, format=format, cleanup=True, neato_no_op=2)
+    if directory is not None:
+        cache.store(graph.source, output, format, NO_OP_ENGINE, directory)
+    return output
@@ -0,0 +1,227 @@
+"""
+KFM SCHEMA
+Schema registry of the entity types drawn as record nodes, with precompiled labels.
+
+Every entity type lists its attributes (name -> type) and relations (label ->
+target type), in the order they are drawn. Its record labels are compiled once,
+so labelling a node is one dict lookup and one string concatenation or format call:
+
+    schema = bundled("university")
+    schema.type_label({"id": "25323", "name": "professor"})
+    # '{ professor | 25323 | name : string | age : int }'
+    schema.instance_label(eg.entities[0])
+    # '{ professor | 25323 | name : Fausto | age : 50 }'
+
+Schemas are JSON objects keyed by entity type, and a type may give its own
+`label` format string, with {name} and {id} fields:
+
+    {"professor": {"attributes": {"name": "string", "age": "int"},
+                   "relations": {"holds": "lecture"}},
+     "entity": {"label": "{{ {name} | 01740 }}"}}
+
+The schemas of the figures are shipped in kfm/data as <name>.schema.json.
+Nodes of types missing from a schema are labelled "{ name | id }".
+"""
+
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+# The directory of the bundled schemas
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# An entity type: its name, its (attribute, type) and (relation, target) pairs,
+# and an optional label format string replacing the generated one
+EntityType = namedtuple(
+    "EntityType", ["name", "attributes", "relations", "label"], defaults=((), (), None)
+)
+
+# The label of types missing from the schema
+DEFAULT_LABEL = "{{ {name} | {id} }}"
+
+
+def _escape(text):
+    return str(text).replace("{", "{{").replace("}", "}}")
+
+
+class Schema:
+    """
+    Registry of entity types and their compiled record labels.
+
+    Attributes:
+        types (dict): Entity type name -> EntityType, in insertion order.
+    """
+
+    def __init__(self, types=()):
+        """
+        Creates a schema.
+
+        Args:
+            types (iterable, optional): The EntityType of every entity type.
+        """
+        self.types = {}
+        self._type_labels = {}
+        self._instance_labels = {}
+        for entity_type in types:
+            self.add(entity_type)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __contains__(self, name):
+        return name in self.types
+
+    def __getitem__(self, name):
+        return self.types[name]
+
+    def add(self, entity_type):
+        """
+        Adds or replaces an entity type and compiles its labels.
+
+        Args:
+            entity_type (EntityType): The entity type.
+        """
+        name = entity_type.name
+        self.types[name] = entity_type
+        if entity_type.label is not None:
+            # Custom labels are format strings; None marks them in the compiled pairs
+            self._type_labels[name] = (entity_type.label, None)
+            self._instance_labels[name] = (entity_type.label, ())
+            return
+        # Type labels only vary by ID: a prefix and a suffix around it
+        prefix = f"{{ {name} | "
+        fields = [
+            f" | {attribute} : {kind}" for attribute, kind in entity_type.attributes
+        ]
+        fields += [
+            f" | {relation} : {target}" for relation, target in entity_type.relations
+        ]
+        self._type_labels[name] = (prefix, "".join(fields) + " }")
+        # Instance labels show attribute values, filled in positionally
+        values = [
+            f" | {_escape(attribute)} : {{{position}}}"
+            for position, (attribute, _) in enumerate(entity_type.attributes)
+        ]
+        self._instance_labels[name] = (
+            f"{{{{ {_escape(name)} | {{id}}" + "".join(values) + " }}",
+            tuple(attribute for attribute, _ in entity_type.attributes),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a schema from its JSON form.
+
+        Args:
+            data (dict): Entity type name -> {"attributes": {...}, "relations": {...}, "label": ...}.
+
+        Returns:
+            Schema: The schema.
+        """
+        return cls(
+            EntityType(
+                name,
+                tuple(spec.get("attributes", {}).items()),
+                tuple(spec.get("relations", {}).items()),
+                spec.get("label"),
+            )
+            for name, spec in data.items()
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a schema from a JSON file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            Schema: The schema.
+        """
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+    def to_dict(self):
+        """
+        Returns the JSON form of the schema, as read by `from_dict`.
+
+        Returns:
+            dict: Entity type name -> specification.
+        """
+        data = {}
+        for name, entity_type in self.types.items():
+            spec = {}
+            if entity_type.attributes:
+                spec["attributes"] = dict(entity_type.attributes)
+            if entity_type.relations:
+                spec["relations"] = dict(entity_type.relations)
+            if entity_type.label is not None:
+                spec["label"] = entity_type.label
+            data[name] = spec
+        return data
+
+    def save(self, path):
+        """
+        Saves the schema as a JSON file.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+            file.write("\n")
+
+    def type_label(self, node):
+        """
+        Returns the record label of an entity type: its attribute types and relations.
+
+        Args:
+            node (dict): The node represented as a dictionary with 'name' and 'id' keys.
+
+        Returns:
+            str: The record label of the node.
+        """
+        name = node["name"]
+        compiled = self._type_labels.get(name)
+        if compiled is None:
+            return f"{{ {name} | {node['id']} }}"
+        prefix, suffix = compiled
+        if suffix is None:
+            return prefix.format(name=name, id=node["id"])
+        return f"{prefix}{node['id']}{suffix}"
+
+    def instance_label(self, node):
+        """
+        Returns the record label of an entity: the values of its attributes.
+
+        Args:
+            node (dict): The node represented as a dictionary with 'name', 'id' and
+                'attributes' keys; missing attributes are left empty.
+
+        Returns:
+            str: The record label of the node.
+        """
+        name = node["name"]
+        template, attributes = self._instance_labels.get(name, (DEFAULT_LABEL, ()))
+        values = node.get("attributes", {})
+        return template.format(
+            *[values.get(attribute, "") for attribute in attributes],
+            name=name,
+            id=node["id"],
+        )
+
+
+@lru_cache(maxsize=None)
+def bundled(name):
+    """
+    Loads a schema shipped in kfm/data, once.
+
+    Args:
+        name (str): The name of the schema: "university", "teleology" or "language".
+
+    Returns:
+        Schema: The schema.
+    """
+    return Schema.load(os.path.join(DATA_DIR, f"{name}.schema.json"))
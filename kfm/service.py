@@ -0,0 +1,460 @@
+"""
+KFM SERVICE
+Asynchronous render service: a job queue in front of Graphviz, with a local HTTP API.
+
+A job asks for one figure of kfm.figures in one format, optionally cut down to
+the IS-A branches below some concepts. Jobs wait in a queue served by a fixed
+number of workers, each running one Graphviz subprocess at a time; a job
+identical to one queued or running waits for its result instead of being
+rendered again, and figures whose DOT source is unchanged are copied from the
+render cache (see kfm.cache) without running Graphviz:
+
+    service = RenderService("renders", jobs=4)
+    path = await service.render(Job("UKC_ISA_PARTOF", format="svg"))
+
+Run from the repository root, then ask for figures over HTTP:
+    python -m kfm.service --port 8080 --jobs 4
+    curl -o ukc.pdf "http://127.0.0.1:8080/render?figure=UKC_ISA_PARTOF&format=pdf"
+    curl -o event.svg "http://127.0.0.1:8080/render?figure=UKC_ISA_PARTOF&branch=46884&format=svg"
+    curl "http://127.0.0.1:8080/metrics"
+
+Endpoints:
+    - GET /render?figure=NAME[&format=pdf][&branch=ID,ID...]: the rendered file;
+    - GET /figures: the figure names and the ones accepting a branch, as JSON;
+    - GET /metrics: queue depth, job counts and latency percentiles, as JSON.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque, namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+from kfm import cache
+from kfm.figures import FIGURES, build
+
+# A render request: a figure of FIGURES, the root concepts of the branches to keep
+# (a tuple, empty for the whole figure) and the output format
+Job = namedtuple("Job", ["figure", "branch", "format"], defaults=((), "pdf"))
+
+# Output format -> content type of the HTTP responses
+FORMATS = {
+    "pdf": "application/pdf",
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "gv": "text/vnd.graphviz",
+    "json": "application/json",
+}
+
+# Figures that accept a branch -> (module, builder of the IS-A and PART-OF trees);
+# the module's branches() indexes the trees the figure draws
+BRANCH_FIGURES = {
+    "wordnet_ISA&PARTOF": ("kfm.wordnet", "create_tree_visualization"),
+    "UKC_ISA_PARTOF": ("kfm.ukc", "create_tree_visualization"),
+}
+
+# Number of latencies kept for the percentiles of the metrics
+LATENCY_WINDOW = 1000
+
+
+class RenderError(Exception):
+    """Raised when Graphviz fails, cannot be run or times out on a job."""
+
+
+def check_job(job):
+    """
+    Checks that a job can be rendered.
+
+    Args:
+        job (Job): The job.
+
+    Raises:
+        ValueError: If the figure or format is unknown, or the figure accepts no branch.
+    """
+    if job.figure not in FIGURES:
+        raise ValueError(f"Unknown figure: {job.figure}")
+    if job.format not in FORMATS:
+        raise ValueError(f"Unsupported format: {job.format}")
+    if job.branch and job.figure not in BRANCH_FIGURES:
+        raise ValueError(f"Figure {job.figure} does not accept a branch")
+
+
+def build_job(job):
+    """
+    Builds the Graphviz graph of a job.
+
+    Args:
+        job (Job): The job.
+
+    Returns:
+        graphviz.Digraph: The graph.
+
+    Raises:
+        KeyError: If a root concept of the branch is unknown.
+    """
+    if not job.branch:
+        return build(job.figure)
+    module, function = BRANCH_FIGURES[job.figure]
+    module = importlib.import_module(module)
+    branch = module.branches().extract(list(job.branch))
+    return getattr(module, function)(branch.trees, branch.attached)
+
+
+def output_name(job):
+    """
+    Returns the file name of the rendering of a job.
+
+    Args:
+        job (Job): The job.
+
+    Returns:
+        str: The file name, unique per job.
+    """
+    name = job.figure + "".join(f"_{root}" for root in job.branch)
+    return re.sub(r"[^\w&.+-]", "_", name) + f".{job.format}"
+
+
+class RenderService:
+    """
+    Queue of render jobs served by a bounded number of Graphviz subprocesses.
+
+    Attributes:
+        output_dir (str): The directory of the rendered files.
+        jobs (int): The number of concurrent Graphviz processes.
+        timeout (float): Seconds after which a Graphviz process is killed, or None.
+        cache_dir (str): The render cache directory, or None to disable the cache.
+        counts (Counter): Number of jobs per outcome: "rendered", "cached", "failed",
+            "timeout", "invalid" for unknown figures, formats or concepts, and
+            "deduplicated" for requests joining a job in flight.
+    """
+
+    def __init__(
+        self,
+        output_dir,
+        jobs=None,
+        timeout=None,
+        cache_dir=None,
+    ):
+        """
+        Creates a service; workers start with the first job.
+
+        Args:
+            output_dir (str): The directory of the rendered files.
+            jobs (int, optional): The number of concurrent Graphviz processes.
+                Default is the number of cores.
+            timeout (float, optional): Seconds after which a Graphviz process is killed.
+                Default is None.
+            cache_dir (str, optional): The render cache directory, e.g. cache.cache_dir().
+                Default is None, which disables the cache.
+        """
+        self.output_dir = output_dir
+        self.jobs = jobs or os.cpu_count()
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.counts = Counter()
+        self._queue = None
+        self._workers = []
+        self._in_flight = {}
+        self._running = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def _start(self):
+        if self._queue is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._queue = asyncio.Queue()
+            self._workers = [
+                asyncio.create_task(self._work()) for _ in range(self.jobs)
+            ]
+
+    async def render(self, job):
+        """
+        Renders a job, or waits for the identical job in flight.
+
+        Args:
+            job (Job): The job.
+
+        Returns:
+            str: The path of the rendered file.
+
+        Raises:
+            ValueError: If the job is invalid, see `check_job`.
+            KeyError: If a root concept of the branch is unknown.
+            RenderError: If Graphviz fails or times out.
+        """
+        try:
+            check_job(job)
+        except ValueError:
+            self.counts["invalid"] += 1
+            raise
+        job = job._replace(branch=tuple(job.branch))
+        self._start()
+        future = self._in_flight.get(job)
+        if future is not None:
+            self.counts["deduplicated"] += 1
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[job] = future
+        await self._queue.put((job, future, time.perf_counter()))
+        # Shielded, so a client hanging up does not cancel the job of the others
+        return await asyncio.shield(future)
+
+    async def _work(self):
+        while True:
+            job, future, queued = await self._queue.get()
+            self._running += 1
+            try:
+                future.set_result(await self._render(job))
+            except Exception as exception:
+                future.set_exception(exception)
+                # Marks the exception as retrieved when no request awaits it any more
+                future.exception()
+            finally:
+                self._running -= 1
+                del self._in_flight[job]
+                self._latencies.append(time.perf_counter() - queued)
+                self._queue.task_done()
+
+    async def _render(self, job):
+        # Builders share module state (identifier allocators, caches), so graphs are
+        # built on the event loop thread, one at a time; building takes milliseconds
+        try:
+            graph = build_job(job)
+        except KeyError:
+            self.counts["invalid"] += 1
+            raise
+        source, engine = graph.source, graph.engine
+        output = os.path.join(self.output_dir, output_name(job))
+        if self.cache_dir is not None and cache.fetch(
+            source, output, job.format, engine, self.cache_dir
+        ):
+            self.counts["cached"] += 1
+            return output
+
+        # Rendered aside and moved into place, so a request still reading the previous
+        # rendering of the job never sees the file truncated
+        with cache.replacing(output) as temporary:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    engine,
+                    f"-T{job.format}",
+                    "-o",
+                    temporary,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except OSError as error:
+                # Graphviz missing from the PATH, or the process could not be started
+                self.counts["failed"] += 1
+                raise RenderError(
+                    f"{job.figure}: cannot run {engine}: {error}"
+                ) from error
+            try:
+                _, stderr = await asyncio.wait_for(
+                    process.communicate(source.encode()), self.timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                self.counts["timeout"] += 1
+                raise RenderError(f"{job.figure} timed out after {self.timeout}s")
+            except asyncio.CancelledError:
+                # The service is closing: no Graphviz process outlives its worker
+                process.kill()
+                await process.wait()
+                raise
+            if process.returncode != 0:
+                self.counts["failed"] += 1
+                message = stderr.decode(errors="replace").strip()
+                raise RenderError(f"{job.figure}: {message or process.returncode}")
+        if self.cache_dir is not None:
+            cache.store(source, output, job.format, engine, self.cache_dir)
+        self.counts["rendered"] += 1
+        return output
+
+    def metrics(self):
+        """
+        Returns the state of the queue and the latency of the last jobs.
+
+        Returns:
+            dict: Queue depth, running jobs, job counts and latency percentiles in seconds,
+                from queueing to completion, over the last LATENCY_WINDOW jobs.
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(share):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(share * len(latencies)))]
+
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "in_flight": len(self._in_flight),
+            "jobs": self.jobs,
+            "counts": dict(self.counts),
+            "latency": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": latencies[-1] if latencies else None,
+            },
+        }
+
+    async def close(self):
+        """
+        Stops the workers; jobs still queued or running fail with a RenderError.
+
+        The service can be used again after closing: the next job starts new workers.
+        """
+        # Running jobs leave _in_flight as their worker is cancelled
+        pending = list(self._in_flight.values())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for future in pending:
+            if not future.done():
+                future.set_exception(RenderError("The render service was closed"))
+                # Marks the exception as retrieved when no request awaits it
+                future.exception()
+        self._in_flight.clear()
+        self._workers = []
+        self._queue = None
+
+
+def parse_job(query):
+    """
+    Reads a job from the query string of a /render request.
+
+    Args:
+        query (str): The query string, e.g. "figure=UKC_ISA&format=svg&branch=46884".
+
+    Returns:
+        Job: The job.
+
+    Raises:
+        ValueError: If the figure is missing.
+    """
+    parameters = parse_qs(query)
+    if "figure" not in parameters:
+        raise ValueError("Missing figure")
+    branch = ",".join(parameters.get("branch", []))
+    return Job(
+        parameters["figure"][0],
+        tuple(root for root in branch.split(",") if root),
+        parameters.get("format", ["pdf"])[0],
+    )
+
+
+async def _respond(writer, status, reason, body, content_type="application/json"):
+    if isinstance(body, str):
+        body = body.encode()
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+
+async def handle(service, reader, writer):
+    """
+    Answers one HTTP request, see the endpoints in the module docstring.
+
+    Args:
+        service (RenderService): The render service.
+        reader (asyncio.StreamReader): The request stream.
+        writer (asyncio.StreamWriter): The response stream.
+    """
+    try:
+        request = await reader.readline()
+        # Headers are read and ignored
+        while (await reader.readline()).strip():
+            pass
+        parts = request.decode("latin-1").split()
+        if len(parts) != 3 or parts[0] != "GET":
+            await _respond(writer, 405, "Method Not Allowed", '{"error": "GET only"}')
+            return
+        url = urlsplit(parts[1])
+        if url.path == "/figures":
+            body = {"figures": list(FIGURES), "branches": list(BRANCH_FIGURES)}
+            await _respond(writer, 200, "OK", json.dumps(body))
+        elif url.path == "/metrics":
+            await _respond(writer, 200, "OK", json.dumps(service.metrics()))
+        elif url.path == "/render":
+            try:
+                job = parse_job(url.query)
+                path = await service.render(job)
+            except (ValueError, KeyError) as error:
+                message = error.args[0] if error.args else str(error)
+                await _respond(
+                    writer, 400, "Bad Request", json.dumps({"error": message})
+                )
+                return
+            except RenderError as error:
+                await _respond(
+                    writer, 502, "Bad Gateway", json.dumps({"error": str(error)})
+                )
+                return
+            with open(path, "rb") as file:
+                body = file.read()
+            await _respond(writer, 200, "OK", body, FORMATS[job.format])
+        else:
+            await _respond(writer, 404, "Not Found", '{"error": "unknown path"}')
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=8080):
+    """
+    Serves the HTTP API until cancelled.
+
+    Args:
+        service (RenderService): The render service.
+        host (str, optional): The address to listen on. Default is "127.0.0.1".
+        port (int, optional): The port to listen on. Default is 8080.
+    """
+    server = await asyncio.start_server(
+        lambda reader, writer: handle(service, reader, writer), host, port
+    )
+    print(f"Serving figures on http://{host}:{port}/", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--output-dir", default="renders")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    service = RenderService(
+        args.output_dir,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        cache_dir=None if args.no_cache else cache.cache_dir(),
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+"""
+KFM STORE
+Indexed in-memory store of the entities and relationships of the EG knowledge graph.
+
+Entities get dense integer handles, and their attributes are kept column-wise,
+one column per attribute of each entity type. Relationships are stored per
+label as (source, target) handle arrays, from which outgoing and incoming
+adjacency lists are built on first use, so queries are index joins instead of
+scans of the relationship list:
+
+    store = EntityStore.from_lists(eg.entities, eg.relationships)
+    # All students attending lectures held in classroom A202
+    students = store.traverse(store.find("classroom", number="A202"), ["^held in", "^attends"])
+    [store.entity(handle)["attributes"]["name"] for handle in students]
+    # ['Luca']
+
+A path step is a relationship label, followed from source to target, or the
+label prefixed with "^", followed from target to source.
+"""
+
+from array import array
+
+from kfm.hierarchy import adjacency
+
+# Prefix of the path steps followed from target to source
+INVERSE = "^"
+
+
+class EntityStore:
+    """
+    Entities with integer handles, attribute columns and per-label adjacency lists.
+
+    Attributes:
+        types (list): The names of the entity types, by type number.
+        entity_types (array): The type number of every entity, by handle.
+        ids (list): The identifier of every entity, by handle.
+    """
+
+    def __init__(self):
+        self.types = []
+        self.entity_types = array("i")
+        self.ids = []
+        # Row of every entity in the table of its type
+        self._rows = array("i")
+        self._handles = {}
+        self._type_numbers = {}
+        # Per type: the handle of every row, and attribute -> column of values
+        self._tables = []
+        self._columns = []
+        # Per label: (sources, targets), and the (offsets, handles) built from them
+        self._edges = {}
+        self._out = {}
+        self._in = {}
+        # (type number, attribute) -> value -> handles
+        self._indexes = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def labels(self):
+        """list: The relationship labels, in insertion order."""
+        return list(self._edges)
+
+    def count(self, label=None):
+        """
+        Counts the relationships.
+
+        Args:
+            label (str, optional): Only count the relationships with this label. Default is None.
+
+        Returns:
+            int: The number of relationships.
+        """
+        if label is not None:
+            return len(self._edges[label][0]) if label in self._edges else 0
+        return sum(len(sources) for sources, _ in self._edges.values())
+
+    def edges(self, label):
+        """
+        Returns the relationships with a label, in insertion order.
+
+        Args:
+            label (str): The label of the relationships.
+
+        Returns:
+            tuple: The source and target handles (arrays).
+        """
+        return self._edges.get(label, (array("i"), array("i")))
+
+    def _type_number(self, name):
+        number = self._type_numbers.get(name)
+        if number is None:
+            number = self._type_numbers[name] = len(self.types)
+            self.types.append(name)
+            self._tables.append(array("i"))
+            self._columns.append({})
+        return number
+
+    def add_entity(self, name, id, attributes=None):
+        """
+        Adds an entity, unless an entity of the same type and identifier exists.
+
+        Args:
+            name (str): The entity type, e.g. 'student'.
+            id (str): The identifier of the entity.
+            attributes (dict, optional): Attribute name -> value. Default is None.
+
+        Returns:
+            int: The handle of the entity.
+        """
+        handle = self._handles.get((name, id))
+        if handle is not None:
+            return handle
+        return self.add_entities(
+            name,
+            [id],
+            {attribute: [value] for attribute, value in (attributes or {}).items()},
+        )[0]
+
+    def add_entities(self, name, ids, attributes=None):
+        """
+        Adds entities of one type in bulk, with their attributes given as columns.
+
+        Args:
+            name (str): The entity type.
+            ids (list): The identifiers of the new entities; none may exist yet.
+            attributes (dict, optional): Attribute name -> list of values, one per entity.
+                Default is None.
+
+        Returns:
+            range: The handles of the entities, in the order of `ids`.
+
+        Raises:
+            ValueError: If an entity exists already or a column has the wrong length.
+        """
+        number = self._type_number(name)
+        table = self._tables[number]
+        columns = self._columns[number]
+        attributes = attributes or {}
+        for attribute, values in attributes.items():
+            if len(values) != len(ids):
+                raise ValueError(
+                    f"{len(values)} values of '{attribute}' for {len(ids)} entities"
+                )
+        first = len(self.ids)
+        handles = range(first, first + len(ids))
+        new = {(name, id): handle for handle, id in zip(handles, ids)}
+        if len(new) != len(ids) or not new.keys().isdisjoint(self._handles):
+            raise ValueError(f"Duplicate {name} entities")
+        self._handles.update(new)
+        self.ids.extend(ids)
+        self.entity_types.extend(array("i", [number]) * len(ids))
+        self._rows.extend(range(len(table), len(table) + len(ids)))
+        rows = len(table)
+        table.extend(handles)
+        # Every column keeps one value per row, None where an entity lacks the attribute
+        for attribute, values in attributes.items():
+            columns.setdefault(attribute, [None] * rows).extend(values)
+        for attribute, column in columns.items():
+            if attribute not in attributes:
+                column.extend([None] * len(ids))
+        for attribute in columns:
+            self._indexes.pop((number, attribute), None)
+        return handles
+
+    def add_relationship(self, source, target, label):
+        """
+        Adds a relationship between two entities.
+
+        Args:
+            source (int): The handle of the source entity.
+            target (int): The handle of the target entity.
+            label (str): The label of the relationship, e.g. 'attends'.
+        """
+        self.add_relationships(label, [source], [target])
+
+    def add_relationships(self, label, sources, targets):
+        """
+        Adds relationships with one label in bulk.
+
+        Args:
+            label (str): The label of the relationships.
+            sources (sequence): The handles of the source entities.
+            targets (sequence): The handles of the target entities, in the same order.
+
+        Raises:
+            ValueError: If there are not as many targets as sources.
+        """
+        if len(sources) != len(targets):
+            raise ValueError(f"Sources and targets of '{label}' differ in number")
+        edges = self._edges.setdefault(label, (array("i"), array("i")))
+        edges[0].extend(sources)
+        edges[1].extend(targets)
+        # The adjacency lists of the label are rebuilt on next use
+        self._out.pop(label, None)
+        self._in.pop(label, None)
+
+    @classmethod
+    def from_lists(cls, entities, relationships):
+        """
+        Builds a store from the entity and relationship lists of the EG figure.
+
+        Args:
+            entities (list): Dictionaries with 'id', 'name' and optional 'attributes' keys.
+            relationships (list): Dictionaries with 'source', 'target' ({'name', 'id'})
+                and 'label' keys.
+
+        Returns:
+            EntityStore: The store.
+
+        Raises:
+            KeyError: If a relationship refers to an entity missing from `entities`.
+        """
+        store = cls()
+        for entity in entities:
+            store.add_entity(entity["name"], entity["id"], entity.get("attributes"))
+        for rel in relationships:
+            source, target = rel["source"], rel["target"]
+            store.add_relationship(
+                store.handle(source["name"], source["id"]),
+                store.handle(target["name"], target["id"]),
+                rel["label"],
+            )
+        return store
+
+    def handle(self, name, id):
+        """
+        Returns the handle of an entity.
+
+        Args:
+            name (str): The entity type.
+            id (str): The identifier of the entity.
+
+        Returns:
+            int: The handle.
+
+        Raises:
+            KeyError: If there is no such entity.
+        """
+        return self._handles[(name, id)]
+
+    def type(self, handle):
+        """
+        Returns the type of an entity.
+
+        Args:
+            handle (int): The handle of the entity.
+
+        Returns:
+            str: The entity type.
+        """
+        return self.types[self.entity_types[handle]]
+
+    def attribute(self, handle, attribute):
+        """
+        Returns an attribute value of an entity.
+
+        Args:
+            handle (int): The handle of the entity.
+            attribute (str): The attribute name.
+
+        Returns:
+            object: The value, or None if the entity has no such attribute.
+        """
+        column = self._columns[self.entity_types[handle]].get(attribute)
+        return None if column is None else column[self._rows[handle]]
+
+    def entity(self, handle):
+        """
+        Returns an entity in the dictionary format of the EG figure.
+
+        Args:
+            handle (int): The handle of the entity.
+
+        Returns:
+            dict: The entity, with 'id', 'name' and 'attributes' keys.
+        """
+        number = self.entity_types[handle]
+        row = self._rows[handle]
+        return {
+            "id": self.ids[handle],
+            "name": self.types[number],
+            "attributes": {
+                attribute: column[row]
+                for attribute, column in self._columns[number].items()
+                if column[row] is not None
+            },
+        }
+
+    def _index(self, number, attribute):
+        key = (number, attribute)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = {}
+            column = self._columns[number].get(attribute, ())
+            for handle, value in zip(self._tables[number], column):
+                index.setdefault(value, []).append(handle)
+        return index
+
+    def find(self, type_name, /, **attributes):
+        """
+        Returns the entities of a type with the given attribute values.
+
+        Every attribute queried gets a hash index, built on first use. The type is
+        positional-only, so entities can be queried by their own "name" attribute.
+
+        Args:
+            type_name (str): The entity type.
+            **attributes: Attribute name -> value the entities must have.
+
+        Returns:
+            list: The handles of the matching entities, in insertion order.
+        """
+        number = self._type_numbers.get(type_name)
+        if number is None:
+            return []
+        if not attributes:
+            return list(self._tables[number])
+        columns = self._columns[number]
+        # Start from the most selective attribute and filter by the others
+        candidates = sorted(
+            (
+                (self._index(number, attribute).get(value, []), attribute, value)
+                for attribute, value in attributes.items()
+            ),
+            key=lambda candidate: len(candidate[0]),
+        )
+        handles = candidates[0][0]
+        return [
+            handle
+            for handle in handles
+            if all(
+                columns[attribute][self._rows[handle]] == value
+                for _, attribute, value in candidates[1:]
+            )
+        ]
+
+    def _adjacency(self, step):
+        inverse = step.startswith(INVERSE)
+        label = step[len(INVERSE) :] if inverse else step
+        lists = self._in if inverse else self._out
+        built = lists.get(label)
+        if built is None:
+            sources, targets = self._edges.get(label, ((), ()))
+            keys, values = (targets, sources) if inverse else (sources, targets)
+            built = lists[label] = adjacency(len(self), keys, values)
+        return built
+
+    def neighbours(self, handles, step):
+        """
+        Follows one relationship label from a set of entities.
+
+        Args:
+            handles (iterable): The handles of the entities.
+            step (str): The relationship label, prefixed with "^" to follow it from target
+                to source.
+
+        Returns:
+            list: The handles reached, without duplicates, in order of discovery.
+        """
+        offsets, neighbours = self._adjacency(step)
+        size = len(offsets) - 1
+        reached = {}
+        for handle in handles:
+            # Entities added after the lists were built have no relationships in them
+            if handle < size:
+                reached.update(
+                    dict.fromkeys(neighbours[offsets[handle] : offsets[handle + 1]])
+                )
+        return list(reached)
+
+    def traverse(self, handles, path):
+        """
+        Follows a path of relationship labels from a set of entities.
+
+        Args:
+            handles (iterable): The handles of the starting entities.
+            path (list): The steps, see `neighbours`.
+
+        Returns:
+            list: The handles reached at the end of the path, without duplicates.
+        """
+        for step in path:
+            handles = self.neighbours(handles, step)
+        return list(handles)
@@ -0,0 +1,173 @@
+"""
+KFM SUMMARIZE
+Automatic reduced views: trees cut down to a node budget, with aggregate nodes.
+
+Graphviz layout time grows quickly with the number of nodes, so a hierarchy of
+any size is reduced to at most `max_nodes` nodes before it is drawn. Concepts
+are expanded from the roots, most important first (by default the ones with the
+largest subtrees), and whatever does not fit, lies deeper than `max_depth` or
+falls outside the `top_k` children of a concept is collapsed into one aggregate
+node per concept, holding the number of concepts it hides:
+
+    reduced = summarize(ukc.isa_trees, max_nodes=16, top_k=3)
+    dot = ukc.create_isa_tree_visualization(reduced)
+
+The result uses the nested-dict format of the input, so every builder accepts it.
+An aggregate node is {"id": "<parent id>+", "name": "<n> more", "count": n}; it
+stands for no concept, see `is_aggregate`.
+"""
+
+import heapq
+from itertools import count
+
+
+def subtree_sizes(trees):
+    """
+    Counts the concepts of every subtree.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+
+    Returns:
+        dict: id() of every node -> number of nodes in its subtree, itself included.
+    """
+    order = []
+    stack = [node for tree in trees for node in tree]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node.get("children", ()))
+    sizes = {}
+    # Every node comes after its parent in `order`, so children are counted first
+    for node in reversed(order):
+        sizes[id(node)] = 1 + sum(
+            [sizes[id(child)] for child in node.get("children", ())]
+        )
+    return sizes
+
+
+def aggregate(parent, hidden):
+    """
+    Creates the aggregate node standing for concepts collapsed below a parent.
+
+    Args:
+        parent (dict): The node the collapsed concepts hang from.
+        hidden (int): The number of collapsed concepts.
+
+    Returns:
+        dict: The aggregate node.
+    """
+    return {"id": f"{parent['id']}+", "name": f"{hidden} more", "count": hidden}
+
+
+def is_aggregate(node):
+    """
+    Tells whether a node is an aggregate created by `summarize`.
+
+    Args:
+        node (dict): The node.
+
+    Returns:
+        bool: True if the node stands for collapsed concepts instead of a concept.
+    """
+    return "count" in node
+
+
+def summarize(trees, max_nodes=50, max_depth=None, top_k=None, weight=None):
+    """
+    Reduces trees to a bounded number of nodes.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        max_nodes (int, optional): The largest number of nodes of the result, aggregates
+            included; roots are always kept, so it is at least one node per root plus
+            one per root with children, for their aggregates. Default is 50.
+        max_depth (int, optional): The deepest level kept, roots being level 0. Default is None.
+        top_k (int, optional): The most children kept per concept. Default is None.
+        weight (callable, optional): The importance of a node, given the node and the size of
+            its subtree. Default is the size of the subtree.
+
+    Returns:
+        list: The reduced trees, with the children of every concept in their original order.
+
+    Raises:
+        ValueError: If `max_nodes` cannot hold the roots and their aggregates.
+    """
+    roots = [node for tree in trees for node in tree]
+    minimum = sum(2 if node.get("children") else 1 for node in roots)
+    if max_nodes < minimum:
+        raise ValueError(
+            f"max_nodes is {max_nodes}, the roots and their aggregates need {minimum}"
+        )
+    sizes = subtree_sizes(trees)
+    if weight is None:
+        weight = lambda node, size: size
+
+    def copy(node):
+        return {key: value for key, value in node.items() if key != "children"}
+
+    # Concepts waiting to be expanded, most important first
+    heap = []
+    ties = count()
+    used = 0
+    reduced = []
+    for tree in trees:
+        reduced.append([])
+        for node in tree:
+            summary = copy(node)
+            reduced[-1].append(summary)
+            used += 1
+            if node.get("children"):
+                # One node of the budget is kept for the aggregate of every open concept
+                used += 1
+                heapq.heappush(
+                    heap, (-weight(node, sizes[id(node)]), next(ties), node, summary, 0)
+                )
+
+    while heap:
+        _, _, node, summary, depth = heapq.heappop(heap)
+        used -= 1
+        children = node["children"]
+        kept = []
+        if max_depth is None or depth < max_depth:
+            # The most important children, within top_k and the remaining budget
+            ranked = sorted(
+                range(len(children)),
+                key=lambda i: -weight(children[i], sizes[id(children[i])]),
+            )
+            if top_k is not None:
+                ranked = ranked[:top_k]
+            for i in ranked:
+                cost = 2 if children[i].get("children") else 1
+                # A concept with hidden children also needs its own aggregate node
+                reserve = 1 if len(kept) + 1 < len(children) else 0
+                if used + cost + reserve > max_nodes:
+                    break
+                kept.append(i)
+                used += cost
+            kept.sort()
+
+        summary_children = []
+        for i in kept:
+            child = children[i]
+            child_summary = copy(child)
+            summary_children.append(child_summary)
+            if child.get("children"):
+                heapq.heappush(
+                    heap,
+                    (
+                        -weight(child, sizes[id(child)]),
+                        next(ties),
+                        child,
+                        child_summary,
+                        depth + 1,
+                    ),
+                )
+        hidden = sum(sizes[id(children[i])] for i in range(len(children))) - sum(
+            sizes[id(children[i])] for i in kept
+        )
+        if hidden:
+            summary_children.append(aggregate(node, hidden))
+            used += 1
+        summary["children"] = summary_children
+    return reduced
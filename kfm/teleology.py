@@ -0,0 +1,248 @@
+"""
+KFM TELEOLOGY
+Builders and data of the Knowledge Teleology and Language Teleology figures.
+"""
+
+import graphviz
+
+from kfm.schema import bundled
+from kfm.walk import walk
+
+
+def create_knowledge_label(node):
+    """
+    Creates the record label of a node of the Knowledge Teleology.
+
+    Args:
+        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+
+    Returns:
+        str: The record label of the node.
+    """
+    # Attribute types and relations of each entity type, see kfm/data/teleology.schema.json
+    return bundled("teleology").type_label(node)
+
+
+def create_knowledge_node(graph, node, parent=None):
+    """
+    Creates a node in the graph and links it to the parent node if specified.
+
+    Args:
+        graph (graphviz.Digraph): The Graphviz Digraph object.
+        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+        parent (str, optional): The ID of the parent node. Default is None.
+    """
+    # Walking the subtree iteratively, so deep hierarchies do not hit the recursion limit
+    for step in walk([node], parent, "IS-A"):
+        # Adding the node to the graph with the specified label
+        graph.node(
+            step.key, create_knowledge_label(step.node), shape="record", style="rounded"
+        )
+        if step.parent:
+            # Creating an edge between the current node and the parent node
+            graph.edge(step.key, step.parent, label="IS-A")
+
+
+def create_knowledge_visualization(trees, graph=graphviz.Digraph):
+    """
+    Creates a tree visualization from the given trees and relationships.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="Teleontology Tree")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    # Creating the root node "entity"
+    root_id = "entity_01740"
+    label = f"{{ object | 01740 }}"
+    dot.node(root_id, label, shape="record", style="rounded")
+
+    with dot.subgraph(name="cluster_university") as c:
+        c.attr(color="gray", label="University", penwidth="5")
+
+        # Creating nodes for each tree and linking to the root
+        for tree in trees:
+            create_knowledge_node(c, tree[0], root_id)
+
+    return dot
+
+
+def create_language_label(node):
+    """
+    Creates the record label of a node of the Language Teleology.
+
+    Args:
+        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+
+    Returns:
+        str: The record label of the node.
+    """
+    # Attribute types and relations of each entity type, see kfm/data/language.schema.json
+    return bundled("language").type_label(node)
+
+
+def create_language_node(graph, node, parent=None):
+    """
+    Creates a node in the graph and links it to the parent node if specified.
+
+    Args:
+        graph (graphviz.Digraph): The Graphviz Digraph object.
+        node (dict): The current node represented as a dictionary with 'name', 'id' and 'relationship' keys.
+        parent (str, optional): The ID of the parent node. Default is None.
+    """
+    # Walking the subtree iteratively, each node carrying its own relationship
+    for step in walk([node], parent, relationship=None):
+        # Adding the node to the graph with the specified label
+        graph.node(
+            step.key, create_language_label(step.node), shape="record", style="rounded"
+        )
+        if step.parent:
+            # Creating an edge between the current node and the parent node
+            if step.relationship == "IS-A":
+                graph.edge(step.key, step.parent, label=step.relationship, dir="back")
+            else:
+                graph.edge(step.key, step.parent, label=step.relationship)
+
+
+def create_language_visualization(trees, graph=graphviz.Digraph):
+    """
+    Creates a tree visualization from the given trees and relationships.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="Teleontology Tree")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    # Creating the root node "entity"
+    root_id = "entity_01740"
+    label = f"{{ university | 01740 | name : string | head : professor | part of : university }}"
+    dot.node(root_id, label, shape="record", style="rounded")
+    label = f"{{ entity | 01740 }}"
+    dot.node("spacentity_01740", label, shape="record", style="rounded")
+    dot.edge("entity_01740", "spacentity_01740", "PART-OF")
+
+    # Creating nodes for each tree and linking to the root
+    for tree in trees:
+        create_language_node(dot, tree, root_id)
+
+    return dot
+
+
+# Definition of IS-A trees
+tree_person = [
+    {
+        "id": "10502",
+        "name": "person",
+        "children": [
+            {"id": "25323", "name": "professor"},
+            {"id": "45356", "name": "student"},
+            {"id": "65890", "name": "administrative staff"},
+        ],
+    }
+]
+
+tree_education_event = [
+    {
+        "id": "20111",
+        "name": "education event",
+        "children": [
+            {"id": "30111", "name": "research project"},
+            {"id": "30112", "name": "course"},
+            {"id": "30113", "name": "lecture"},
+        ],
+    }
+]
+
+tree_location = [
+    {
+        "id": "40111",
+        "name": "location",
+        "children": [
+            {"id": "50111", "name": "classroom"},
+            {"id": "50112", "name": "department"},
+            {"id": "50113", "name": "university"},
+        ],
+    }
+]
+
+# Combine all trees
+knowledge_trees = [tree_person, tree_education_event, tree_location]
+
+# Definition of the Language Teleology trees
+tree_teleology = [
+    {
+        "id": "10502",
+        "name": "professor",
+        "relationship": "PART-OF",
+        "children": [
+            {
+                "id": "25323",
+                "name": "person",
+                "relationship": "IS-A",
+                "children": [
+                    {"id": "01741", "name": "entity", "relationship": "IS-A"},
+                ],
+            },
+        ],
+    },
+    {
+        "id": "20111",
+        "name": "lecture",
+        "relationship": "PART-OF",
+        "children": [
+            {
+                "id": "30113",
+                "name": "education event",
+                "relationship": "IS-A",
+                "children": [
+                    {"id": "01741", "name": "entity", "relationship": "IS-A"},
+                ],
+            },
+        ],
+    },
+    {
+        "id": "40111",
+        "name": "department",
+        "relationship": "PART-OF",
+        "children": [
+            {
+                "id": "50111",
+                "name": "classroom",
+                "relationship": "PART-OF",
+                "children": [
+                    {"id": "50112", "name": "location", "relationship": "IS-A"},
+                ],
+            },
+            {
+                "id": "50112",
+                "name": "location",
+                "relationship": "IS-A",
+                "children": [
+                    {"id": "01741", "name": "entity", "relationship": "IS-A"},
+                ],
+            },
+        ],
+    },
+]
+
+
+def knowledge_figure(graph=graphviz.Digraph):
+    """Builds the 'Knowledge_Teleology' figure."""
+    return create_knowledge_visualization(knowledge_trees, graph=graph)
+
+
+def language_figure(graph=graphviz.Digraph):
+    """Builds the 'Language_Teleology' figure."""
+    return create_language_visualization(tree_teleology, graph=graph)
@@ -0,0 +1,920 @@
+"""
+KFM TREELAYOUT
+Native tree layout of the IS-A and PART-OF figures, written straight to SVG.
+
+The WordNet and UKC figures are trees, so they do not need the general layered
+layout of `dot`. TreeGraph records a figure through the Digraph API every
+builder takes as its `graph` factory, `layout` places it with the linear-time
+algorithm of Buchheim, Jünger and Leipert (Walker's algorithm, improved), and
+`render` writes the SVG without spawning Graphviz:
+
+    graph = wordnet.part_of_figure(graph=TreeGraph)
+    render(graph, "wordnet_PARTOF")
+
+The tree is read from the edges with the conventions of kfm.walk: an edge drawn
+with dir="back" (PART-OF) goes from the parent to the child, any other edge
+(IS-A) from the child to the parent. Every node keeps the first parent found in
+statement order, from an edge within its cluster; the remaining edges, such as
+the UKC alignment edges, are drawn but do not constrain the layout. Ranks follow the edges as in `dot`, the tail
+one rank below the head, and `rankdir` maps them on the page. Clusters are drawn
+as boxes around their nodes, with each tree placed in the cluster of its root.
+"""
+
+import argparse
+import contextlib
+import html
+import os
+import sys
+import time
+from collections import namedtuple
+from math import hypot
+
+from kfm.hierarchy import adjacency
+
+# Graphviz defaults, in points (72 per inch)
+NODESEP = 18
+RANKSEP = 36
+MIN_WIDTH = 54
+MIN_HEIGHT = 36
+MARGIN = (7.92, 3.96)
+FONTSIZE = 14
+CLUSTER_MARGIN = 8
+ARROW_LENGTH = 10
+ARROW_WIDTH = 3.5
+PAD = 4
+
+# Dash patterns of the edge and node styles, as in the SVG output of Graphviz
+DASHES = {"dashed": "5,2", "dotted": "1,5"}
+
+# Shapes drawn as rectangles and without an outline; any other shape is an ellipse
+BOXES = frozenset(("box", "rect", "rectangle", "square", "record", "Mrecord"))
+PLAIN = frozenset(("plaintext", "plain", "none"))
+
+# Characters much narrower or wider than the average of a proportional font
+NARROW = frozenset("iljtfrI.,;:'!|()[] ")
+WIDE = frozenset("mwMW@%")
+
+
+# Geometry of a layout: node centres and sizes are lists indexed by node, on the
+# page (y grows downwards), with the tree edge of every node (-1 for roots);
+# clusters are (left, top, right, bottom, label x, label top) or None if empty
+Layout = namedtuple("Layout", ["x", "y", "width", "height", "via", "clusters", "bbox"])
+
+# SVG attributes of a style: stroke, style names, shape, fill, colour and font
+Paint = namedtuple(
+    "Paint", ["stroke", "styles", "shape", "fill", "color", "font", "fontsize"]
+)
+
+
+def text_width(text, fontsize=FONTSIZE):
+    """
+    Estimates the width of a line of text in a proportional font such as Times.
+
+    Args:
+        text (str): The line of text.
+        fontsize (float, optional): The font size, in points. Default is FONTSIZE.
+
+    Returns:
+        float: The estimated width, in points.
+    """
+    return sum(map(_CHAR_WIDTHS.__getitem__, text)) * fontsize
+
+
+class _CharWidths(dict):
+    # Width of every character seen so far, in ems
+    def __missing__(self, char):
+        if char in NARROW:
+            width = 0.3
+        elif char in WIDE:
+            width = 0.85
+        elif char.isupper():
+            width = 0.68
+        else:
+            width = 0.5
+        self[char] = width
+        return width
+
+
+_CHAR_WIDTHS = _CharWidths()
+
+
+def _escape(text):
+    # Most names and labels need no escaping, so the common case is a few scans
+    if "&" in text or "<" in text or ">" in text or '"' in text:
+        return html.escape(text)
+    return text
+
+
+def label_lines(label):
+    """
+    Splits a Graphviz label into its lines.
+
+    Args:
+        label (str): The label, with newlines or the \\n, \\l and \\r escapes.
+
+    Returns:
+        list: The lines of the label.
+    """
+    if "\\" in label:
+        for escape in ("\\n", "\\l", "\\r"):
+            label = label.replace(escape, "\n")
+    return label.rstrip("\n").split("\n")
+
+
+class _Scope:
+    # The Digraph API, shared by the graph and its subgraphs
+
+    def node(self, name, label=None, _attributes=None, **attrs):
+        """
+        Adds a node or updates its attributes, see graphviz.Digraph.node.
+
+        Args:
+            name (str): The unique identifier of the node.
+            label (str, optional): The caption of the node. Default is None, the name.
+            **attrs: Any other node attribute.
+        """
+        graph = self._graph
+        if _attributes:
+            attrs = {**_attributes, **attrs}
+        node = graph._index.get(name)
+        if node is None:
+            node = graph._add_node(name, self)
+        if label is not None:
+            graph.labels[node] = label
+        if attrs:
+            style = graph._styles[graph.node_styles[node]]
+            graph.node_styles[node] = graph._style({**style, **attrs})
+
+    def edge(self, tail_name, head_name, label=None, _attributes=None, **attrs):
+        """
+        Adds an edge, see graphviz.Digraph.edge.
+
+        Args:
+            tail_name (str): The start node identifier.
+            head_name (str): The end node identifier.
+            label (str, optional): The caption of the edge. Default is None.
+            **attrs: Any other edge attribute.
+        """
+        graph = self._graph
+        index = graph._index
+        tail = index.get(tail_name)
+        if tail is None:
+            tail = graph._add_node(tail_name, self)
+        head = index.get(head_name)
+        if head is None:
+            head = graph._add_node(head_name, self)
+        if label is not None:
+            attrs["label"] = label
+        if _attributes:
+            attrs = {**_attributes, **attrs}
+        graph.tails.append(tail)
+        graph.heads.append(head)
+        graph.edge_styles.append(
+            graph._style({**self._edge_attr, **attrs} if attrs else self._edge_attr)
+        )
+
+    def edges(self, tail_head_iter):
+        """
+        Adds edges without attributes, see graphviz.Digraph.edges.
+
+        Args:
+            tail_head_iter (iterable): The (tail, head) pairs.
+        """
+        for tail_name, head_name in tail_head_iter:
+            self.edge(tail_name, head_name)
+
+    def attr(self, kw=None, _attributes=None, **attrs):
+        """
+        Sets graph attributes or node and edge defaults, see graphviz.Digraph.attr.
+
+        Args:
+            kw (str, optional): The target: None for the graph itself, "graph", "node" or "edge".
+            **attrs: The attributes to set.
+
+        Raises:
+            ValueError: If `kw` is not a valid target.
+        """
+        if kw is not None and kw.lower() not in ("graph", "node", "edge"):
+            raise ValueError(f"attr statement must target graph, node, or edge: {kw!r}")
+        if _attributes:
+            attrs = {**_attributes, **attrs}
+        if kw is None or kw.lower() == "graph":
+            self._graph_attr.update(attrs)
+        elif kw.lower() == "node":
+            self._node_attr = {**self._node_attr, **attrs}
+            self._node_style = self._graph._style(self._node_attr)
+        else:
+            self._edge_attr = {**self._edge_attr, **attrs}
+
+    @contextlib.contextmanager
+    def subgraph(
+        self, name=None, comment=None, graph_attr=None, node_attr=None, edge_attr=None
+    ):
+        """
+        Opens a subgraph, see graphviz.Digraph.subgraph; "cluster" names are drawn as boxes.
+
+        Args:
+            name (str, optional): The name of the subgraph. Default is None.
+            comment (str, optional): Ignored, for API compatibility. Default is None.
+            graph_attr (dict, optional): Graph-level attributes. Default is None.
+            node_attr (dict, optional): Default node attributes. Default is None.
+            edge_attr (dict, optional): Default edge attributes. Default is None.
+
+        Yields:
+            _Scope: The subgraph, adding its nodes and edges to this graph.
+        """
+        graph = self._graph
+        subgraph = _Scope()
+        subgraph._graph = graph
+        subgraph._cluster = self._cluster
+        subgraph._graph_attr = {}
+        if name is not None and name.startswith("cluster"):
+            subgraph._cluster = len(graph.clusters)
+            graph.clusters.append(name)
+            graph.cluster_attrs.append(subgraph._graph_attr)
+        subgraph._graph_attr.update(graph_attr or {})
+        subgraph._node_attr = {**self._node_attr, **(node_attr or {})}
+        subgraph._node_style = graph._style(subgraph._node_attr)
+        subgraph._edge_attr = {**self._edge_attr, **(edge_attr or {})}
+        yield subgraph
+
+
+class TreeGraph(_Scope):
+    """
+    Records a graph built through the Digraph API, for `layout` and `render`.
+
+    Attribute dictionaries are interned, so the nodes of a figure, which share a
+    handful of styles, take a few list slots each.
+
+    Attributes:
+        comment (str): The comment of the graph.
+        engine (str): The Graphviz layout engine, for API compatibility with Digraph.
+        graph_attr (dict): The graph attributes, such as rankdir.
+        names (list): The name of every node, indexed by node.
+        labels (list): The label of every node, or None for its name.
+        node_styles (list): The style of every node, an index into `styles`.
+        node_clusters (list): The cluster of every node, an index into `clusters`, or -1.
+        tails (list): The tail node of every edge.
+        heads (list): The head node of every edge.
+        edge_styles (list): The style of every edge, an index into `styles`.
+        clusters (list): The names of the clusters.
+        cluster_attrs (list): The attributes of every cluster.
+    """
+
+    def __init__(
+        self,
+        name=None,
+        comment=None,
+        graph_attr=None,
+        node_attr=None,
+        edge_attr=None,
+        strict=False,
+        engine="dot",
+    ):
+        """
+        Creates an empty graph, with the arguments of graphviz.Digraph.
+
+        Args:
+            name (str, optional): The name of the graph. Default is None.
+            comment (str, optional): The comment of the graph. Default is None.
+            graph_attr (dict, optional): Graph-level attributes. Default is None.
+            node_attr (dict, optional): Default node attributes. Default is None.
+            edge_attr (dict, optional): Default edge attributes. Default is None.
+            strict (bool, optional): Ignored, for API compatibility. Default is False.
+            engine (str, optional): The Graphviz layout engine. Default is "dot".
+        """
+        self.name = name
+        self.comment = comment
+        self.engine = engine
+        self.names, self.labels, self.node_styles, self.node_clusters = [], [], [], []
+        self.tails, self.heads, self.edge_styles = [], [], []
+        self.clusters, self.cluster_attrs = [], []
+        self._index = {}
+        self._styles = []
+        self._style_index = {}
+        self._graph = self
+        self._cluster = -1
+        self._graph_attr = self.graph_attr = dict(graph_attr or {})
+        self._node_attr = dict(node_attr or {})
+        self._node_style = self._style(self._node_attr)
+        self._edge_attr = dict(edge_attr or {})
+
+    def __len__(self):
+        """Returns the number of nodes."""
+        return len(self.names)
+
+    @property
+    def styles(self):
+        """list: The distinct attribute dictionaries of the nodes and edges."""
+        return self._styles
+
+    def _style(self, attrs):
+        key = tuple(sorted(attrs.items()))
+        style = self._style_index.get(key)
+        if style is None:
+            style = self._style_index[key] = len(self._styles)
+            self._styles.append(dict(attrs))
+        return style
+
+    def _add_node(self, name, scope):
+        node = self._index[name] = len(self.names)
+        self.names.append(name)
+        self.labels.append(None)
+        self.node_styles.append(scope._node_style)
+        self.node_clusters.append(scope._cluster)
+        return node
+
+    def forest(self):
+        """
+        Reads the trees of the graph from its edges.
+
+        Returns:
+            tuple: The parent of every node (-1 for roots), the edge linking every
+                node to its parent (-1 for roots), the rank offset of every node from
+                its parent (+1 or -1) and the nodes in pre-order, tree after tree.
+        """
+        size = len(self.names)
+        parents = [-1] * size
+        via = [-1] * size
+        steps = [0] * size
+        styles = self._styles
+        clusters = self.node_clusters
+        for edge, (tail, head, style) in enumerate(
+            zip(self.tails, self.heads, self.edge_styles)
+        ):
+            if styles[style].get("dir") == "back":
+                parent, child, step = tail, head, 1
+            else:
+                parent, child, step = head, tail, -1
+            # An edge between clusters, such as a UKC alignment edge, is never a tree edge
+            if (
+                via[child] < 0
+                and child != parent
+                and clusters[child] == clusters[parent]
+            ):
+                parents[child], via[child], steps[child] = parent, edge, step
+
+        linked = [node for node in range(size) if parents[node] >= 0]
+        offsets, grouped = adjacency(size, [parents[node] for node in linked], linked)
+        order = []
+        visited = bytearray(size)
+        # Roots first, in statement order; nodes left over lie on a cycle, which is
+        # broken at its first node
+        starts = [node for node in range(size) if parents[node] < 0]
+        starts += range(size)
+        for start in starts:
+            if visited[start]:
+                continue
+            # The old parent still lists `start` in `grouped`; the parents check
+            # below skips it, and layout() rebuilds the children from `parents`
+            parents[start] = via[start] = -1
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                visited[node] = 1
+                order.append(node)
+                stack.extend(
+                    child
+                    for child in reversed(grouped[offsets[node] : offsets[node + 1]])
+                    if parents[child] == node
+                )
+        return parents, via, steps, order
+
+    def sizes(self):
+        """
+        Returns the size of every node box, from its label and attributes.
+
+        Returns:
+            tuple: The widths and the heights of the nodes, in points.
+        """
+        metrics = []
+        for style in self._styles:
+            fontsize = float(style.get("fontsize", FONTSIZE))
+            # Ellipses are scaled to hold the label box
+            scale = 1 if style.get("shape", "ellipse") in BOXES | PLAIN else 2**0.5
+            metrics.append(
+                (
+                    fontsize,
+                    scale,
+                    float(style.get("width", 0)) * 72 or MIN_WIDTH,
+                    float(style.get("height", 0)) * 72 or MIN_HEIGHT,
+                )
+            )
+        widths, heights = [], []
+        for name, label, style in zip(self.names, self.labels, self.node_styles):
+            fontsize, scale, min_width, min_height = metrics[style]
+            lines = label_lines(name if label is None else str(label))
+            width = max(map(text_width, lines)) * fontsize / FONTSIZE + 2 * MARGIN[0]
+            height = len(lines) * fontsize * 1.2 + 2 * MARGIN[1]
+            widths.append(max(width * scale, min_width))
+            heights.append(max(height * scale, min_height))
+        return widths, heights
+
+
+def _first_walk(children, order, breadth, nodesep):
+    # Buchheim et al., "Improving Walker's Algorithm to Run in Linear Time", with
+    # the recursion turned into one bottom-up pass: a node places its children once
+    # their subtrees are laid out, so the prelim of every child is computed by its
+    # parent, right before the child's subtree is apportioned
+    size = len(breadth)
+    prelim = [0.0] * size
+    mod = [0.0] * size
+    shift = [0.0] * size
+    change = [0.0] * size
+    middle = [0.0] * size
+    thread = [-1] * size
+    ancestor = list(range(size))
+    number = [0] * size
+    parent_of = [-1] * size
+
+    def left(node):
+        kids = children(node)
+        return kids[0] if kids else thread[node]
+
+    def right(node):
+        kids = children(node)
+        return kids[-1] if kids else thread[node]
+
+    for node in reversed(order):
+        kids = children(node)
+        if not kids:
+            continue
+        for i, child in enumerate(kids):
+            number[child] = i + 1
+            parent_of[child] = node
+        first = default = kids[0]
+        prelim[first] = middle[first]
+        previous = first
+        for child in kids[1:]:
+            prelim[child] = (
+                prelim[previous] + (breadth[previous] + breadth[child]) / 2 + nodesep
+            )
+            if children(child):
+                mod[child] = prelim[child] - middle[child]
+
+            # Apportion: push the subtree of the child right of its left siblings
+            inner_left, inner_right = previous, child
+            outer_left, outer_right = first, child
+            sum_inner_left, sum_inner_right = mod[inner_left], mod[inner_right]
+            sum_outer_left, sum_outer_right = mod[outer_left], mod[outer_right]
+            next_left, next_right = right(inner_left), left(inner_right)
+            while next_left >= 0 and next_right >= 0:
+                inner_left, inner_right = next_left, next_right
+                outer_left, outer_right = left(outer_left), right(outer_right)
+                ancestor[outer_right] = child
+                gap = (
+                    prelim[inner_left]
+                    + sum_inner_left
+                    - prelim[inner_right]
+                    - sum_inner_right
+                    + (breadth[inner_left] + breadth[inner_right]) / 2
+                    + nodesep
+                )
+                if gap > 0:
+                    moved = ancestor[inner_left]
+                    if parent_of[moved] != node:
+                        moved = default
+                    subtrees = number[child] - number[moved]
+                    change[child] -= gap / subtrees
+                    shift[child] += gap
+                    change[moved] += gap / subtrees
+                    prelim[child] += gap
+                    mod[child] += gap
+                    sum_inner_right += gap
+                    sum_outer_right += gap
+                sum_inner_left += mod[inner_left]
+                sum_inner_right += mod[inner_right]
+                sum_outer_left += mod[outer_left]
+                sum_outer_right += mod[outer_right]
+                next_left, next_right = right(inner_left), left(inner_right)
+            if next_left >= 0 and right(outer_right) < 0:
+                thread[outer_right] = next_left
+                mod[outer_right] += sum_inner_left - sum_outer_right
+            if next_right >= 0 and left(outer_left) < 0:
+                thread[outer_left] = next_right
+                mod[outer_left] += sum_inner_right - sum_outer_left
+                default = child
+            previous = child
+
+        # Execute the shifts spread over the children by the apportion steps
+        total_shift = total_change = 0.0
+        for child in reversed(kids):
+            prelim[child] += total_shift
+            mod[child] += total_shift
+            total_change += change[child]
+            total_shift += shift[child] + total_change
+        middle[node] = (prelim[kids[0]] + prelim[kids[-1]]) / 2
+
+    for node in order:
+        if parent_of[node] < 0:
+            prelim[node] = middle[node]
+    return prelim, mod
+
+
+def layout(graph, nodesep=None, ranksep=None):
+    """
+    Places the nodes of a tree-shaped graph, in time linear in its size.
+
+    Trees are laid out independently and placed side by side, grouped by the
+    cluster of their root.
+
+    Args:
+        graph (TreeGraph): The graph.
+        nodesep (float, optional): The space between adjacent nodes, in points.
+            Default is the graph's nodesep attribute (inches), or NODESEP.
+        ranksep (float, optional): The space between ranks, in points.
+            Default is the graph's ranksep attribute (inches), or RANKSEP.
+
+    Returns:
+        Layout: The positions and sizes of the nodes and the cluster boxes.
+    """
+    attrs = graph.graph_attr
+    if nodesep is None:
+        nodesep = float(attrs.get("nodesep", NODESEP / 72)) * 72
+    if ranksep is None:
+        ranksep = float(str(attrs.get("ranksep", RANKSEP / 72)).split()[0]) * 72
+    rankdir = str(attrs.get("rankdir", "TB")).upper()
+    flipped = rankdir in ("LR", "RL")
+
+    size = len(graph)
+    widths, heights = graph.sizes()
+    breadth, depth = (heights, widths) if flipped else (widths, heights)
+    parents, via, steps, order = graph.forest()
+    # Children are read from the parents forest() returns, after it broke the cycles
+    # (a node a cycle was broken at is a root there, and no one's child here), in the
+    # order forest() visited them
+    linked = [node for node in order if parents[node] >= 0]
+    offsets, grouped = adjacency(size, [parents[node] for node in linked], linked)
+
+    def children(node):
+        return grouped[offsets[node] : offsets[node + 1]]
+
+    prelim, mod = _first_walk(children, order, breadth, nodesep)
+
+    # Second walk: absolute positions and ranks, tree by tree
+    u = [0.0] * size
+    ranks = [0] * size
+    offset = [0.0] * size
+    trees = []
+    for node in order:
+        parent = parents[node]
+        if parent < 0:
+            trees.append([])
+        else:
+            offset[node] = offset[parent] + mod[parent]
+            ranks[node] = ranks[parent] + steps[node]
+        u[node] = prelim[node] + offset[node]
+        trees[-1].append(node)
+
+    # Trees side by side, those of one cluster together, in order of appearance
+    blocks = {}
+    for tree in trees:
+        cluster = graph.node_clusters[tree[0]]
+        blocks.setdefault(cluster if cluster >= 0 else ("tree", tree[0]), []).append(
+            tree
+        )
+    position = 0.0
+    for key, block in blocks.items():
+        if not isinstance(key, tuple):
+            position += CLUSTER_MARGIN
+        for tree in block:
+            low = min(u[node] - breadth[node] / 2 for node in tree)
+            high = max(u[node] + breadth[node] / 2 for node in tree)
+            lowest = min(ranks[node] for node in tree)
+            for node in tree:
+                u[node] += position - low
+                ranks[node] -= lowest
+            position += high - low + nodesep
+        if not isinstance(key, tuple):
+            position += 2 * CLUSTER_MARGIN
+
+    # Ranks as rows as thick as their largest node
+    thickness = [0.0] * (max(ranks, default=0) + 1)
+    for node in range(size):
+        thickness[ranks[node]] = max(thickness[ranks[node]], depth[node])
+    centres = []
+    top = 0.0
+    for rank_thickness in thickness:
+        centres.append(top + rank_thickness / 2)
+        top += rank_thickness + ranksep
+    sign = -1 if rankdir in ("BT", "RL") else 1
+    v = [sign * centres[rank] for rank in ranks]
+    xs, ys = (v, u) if flipped else (u, v)
+
+    # Cluster boxes around their nodes, with room for the label on top
+    boxes = [[None, None, None, None] for _ in graph.clusters]
+    for node, cluster in enumerate(graph.node_clusters):
+        if cluster < 0:
+            continue
+        box = boxes[cluster]
+        half_width, half_height = widths[node] / 2, heights[node] / 2
+        box[0] = min(xs[node] - half_width, box[0] if box[0] is not None else 1e300)
+        box[1] = min(ys[node] - half_height, box[1] if box[1] is not None else 1e300)
+        box[2] = max(xs[node] + half_width, box[2] if box[2] is not None else -1e300)
+        box[3] = max(ys[node] + half_height, box[3] if box[3] is not None else -1e300)
+    clusters = []
+    for box, cluster_attrs in zip(boxes, graph.cluster_attrs):
+        if box[0] is None:
+            clusters.append(None)
+            continue
+        label = cluster_attrs.get("label")
+        fontsize = float(cluster_attrs.get("fontsize", FONTSIZE))
+        label_height = len(label_lines(str(label))) * fontsize * 1.2 if label else 0
+        left, top = box[0] - CLUSTER_MARGIN, box[1] - CLUSTER_MARGIN - label_height
+        right, bottom = box[2] + CLUSTER_MARGIN, box[3] + CLUSTER_MARGIN
+        if label:
+            right = max(right, left + text_width(str(label), fontsize) + 16)
+        clusters.append((left, top, right, bottom, (left + right) / 2, top))
+
+    # Everything moved to the positive quadrant
+    drawn = [box for box in clusters if box is not None]
+    left = min(
+        [xs[node] - widths[node] / 2 for node in range(size)] + [b[0] for b in drawn],
+        default=0,
+    )
+    top = min(
+        [ys[node] - heights[node] / 2 for node in range(size)] + [b[1] for b in drawn],
+        default=0,
+    )
+    right = max(
+        [xs[node] + widths[node] / 2 for node in range(size)] + [b[2] for b in drawn],
+        default=0,
+    )
+    bottom = max(
+        [ys[node] + heights[node] / 2 for node in range(size)] + [b[3] for b in drawn],
+        default=0,
+    )
+    xs = [x - left for x in xs]
+    ys = [y - top for y in ys]
+    clusters = [
+        (
+            None
+            if box is None
+            else (
+                box[0] - left,
+                box[1] - top,
+                box[2] - left,
+                box[3] - top,
+                box[4] - left,
+                box[5] - top,
+            )
+        )
+        for box in clusters
+    ]
+    return Layout(xs, ys, widths, heights, via, clusters, (right - left, bottom - top))
+
+
+def _clip(x, y, width, height, dx, dy, shape):
+    # The point where the ray from the centre of a node along (dx, dy) leaves it
+    if not dx and not dy:
+        return x, y
+    if shape in BOXES or shape in PLAIN:
+        scale = min(
+            width / 2 / abs(dx) if dx else float("inf"),
+            height / 2 / abs(dy) if dy else float("inf"),
+        )
+    else:
+        scale = 1 / hypot(dx / (width / 2), dy / (height / 2))
+    return x + dx * scale, y + dy * scale
+
+
+def _paint(style):
+    # The SVG attributes of a node, edge or cluster style, prepared once per style
+    color = _escape(str(style.get("color", "black")))
+    styles = frozenset(str(style.get("style", "")).replace(" ", "").split(","))
+    stroke = f'stroke="{color}"'
+    for name in styles & DASHES.keys():
+        stroke += f' stroke-dasharray="{DASHES[name]}"'
+    penwidth = float(style.get("penwidth", 2 if "bold" in styles else 1))
+    if penwidth != 1:
+        stroke += f' stroke-width="{penwidth:g}"'
+    fill = "none"
+    if "filled" in styles:
+        fill = str(style.get("fillcolor", style.get("color", "lightgrey")))
+    fontsize = float(style.get("fontsize", FONTSIZE))
+    fontcolor = _escape(str(style.get("fontcolor", "black")))
+    font = (
+        f'font-family="{_escape(str(style.get("fontname", "Times,serif")))}" '
+        f'font-size="{fontsize:.2f}"'
+    )
+    if fontcolor != "black":
+        font += f' fill="{fontcolor}"'
+    return Paint(
+        stroke,
+        styles,
+        style.get("shape", "ellipse"),
+        _escape(fill),
+        color,
+        font,
+        fontsize,
+    )
+
+
+def _text(lines, x, y, paint, anchor="middle"):
+    # The SVG text elements of a label, its lines centred vertically on (x, y)
+    line_height = paint.fontsize * 1.2
+    baseline = y - (len(lines) - 1) * line_height / 2 + paint.fontsize * 0.3
+    return "".join(
+        f'<text text-anchor="{anchor}" x="{x:.2f}" y="{baseline + i * line_height:.2f}" '
+        f"{paint.font}>{_escape(line)}</text>\n"
+        for i, line in enumerate(lines)
+        if line
+    )
+
+
+def write_svg(graph, stream, positions=None):
+    """
+    Writes a laid-out graph as SVG, element by element.
+
+    Args:
+        graph (TreeGraph): The graph.
+        stream (io.TextIOBase): The stream the SVG document is written to.
+        positions (Layout, optional): The layout of the graph. Default is `layout(graph)`.
+    """
+    positions = positions or layout(graph)
+    xs, ys, widths, heights = (
+        positions.x,
+        positions.y,
+        positions.width,
+        positions.height,
+    )
+    paints = [_paint(style) for style in graph.styles]
+    names = graph.names
+    node_styles = graph.node_styles
+    width, height = positions.bbox[0] + 2 * PAD, positions.bbox[1] + 2 * PAD
+    title = _escape(graph.name or graph.comment or "%3")
+    write = stream.write
+    write(
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+        f'<svg width="{width:.0f}pt" height="{height:.0f}pt" '
+        f'viewBox="0.00 0.00 {width:.2f} {height:.2f}" '
+        'xmlns="http://www.w3.org/2000/svg">\n'
+        f'<g id="graph0" class="graph" transform="translate({PAD} {PAD})">\n'
+        f"<title>{title}</title>\n"
+    )
+
+    for i, (name, box) in enumerate(zip(graph.clusters, positions.clusters)):
+        if box is None:
+            continue
+        left, top, right, bottom, label_x, label_y = box
+        cluster_attrs = graph.cluster_attrs[i]
+        paint = _paint(cluster_attrs)
+        write(
+            f'<g id="clust{i + 1}" class="cluster">\n<title>{_escape(name)}</title>\n'
+            f'<polygon fill="{paint.fill}" {paint.stroke} points="{left:.2f},{top:.2f} '
+            f"{right:.2f},{top:.2f} {right:.2f},{bottom:.2f} {left:.2f},{bottom:.2f} "
+            f'{left:.2f},{top:.2f}"/>\n'
+        )
+        label = cluster_attrs.get("label")
+        if label:
+            lines = label_lines(str(label))
+            centre = label_y + CLUSTER_MARGIN / 2 + len(lines) * paint.fontsize * 0.6
+            write(_text(lines, label_x, centre, paint))
+        write("</g>\n")
+
+    # Edges before nodes, so the nodes cover the line ends
+    via = positions.via
+    chunk = []
+    for edge, (tail, head, style_index) in enumerate(
+        zip(graph.tails, graph.heads, graph.edge_styles)
+    ):
+        paint = paints[style_index]
+        if "invis" in paint.styles:
+            continue
+        style = graph.styles[style_index]
+        dx, dy = xs[head] - xs[tail], ys[head] - ys[tail]
+        x1, y1 = _clip(
+            xs[tail],
+            ys[tail],
+            widths[tail],
+            heights[tail],
+            dx,
+            dy,
+            paints[node_styles[tail]].shape,
+        )
+        x2, y2 = _clip(
+            xs[head],
+            ys[head],
+            widths[head],
+            heights[head],
+            -dx,
+            -dy,
+            paints[node_styles[head]].shape,
+        )
+        length = hypot(x2 - x1, y2 - y1) or 1
+        ux, uy = (x2 - x1) / length, (y2 - y1) / length
+        direction = style.get("dir", "forward")
+        arrows = []
+        if direction in ("forward", "both") and style.get("arrowhead") != "none":
+            arrows.append((x2, y2, ux, uy))
+            x2, y2 = x2 - ux * ARROW_LENGTH, y2 - uy * ARROW_LENGTH
+        if direction in ("back", "both") and style.get("arrowtail") != "none":
+            arrows.append((x1, y1, -ux, -uy))
+            x1, y1 = x1 + ux * ARROW_LENGTH, y1 + uy * ARROW_LENGTH
+        chunk.append(
+            f'<g id="edge{edge + 1}" class="edge">\n<title>{_escape(names[tail])}'
+            f"&#45;&gt;{_escape(names[head])}</title>\n"
+            f'<path fill="none" {paint.stroke} d="M{x1:.2f},{y1:.2f}L{x2:.2f},{y2:.2f}"/>\n'
+        )
+        for x, y, px, py in arrows:
+            base_x, base_y = x - px * ARROW_LENGTH, y - py * ARROW_LENGTH
+            chunk.append(
+                f'<polygon fill="{paint.color}" stroke="{paint.color}" points="{x:.2f},{y:.2f} '
+                f"{base_x - py * ARROW_WIDTH:.2f},{base_y + px * ARROW_WIDTH:.2f} "
+                f'{base_x + py * ARROW_WIDTH:.2f},{base_y - px * ARROW_WIDTH:.2f}"/>\n'
+            )
+        label = style.get("label")
+        if label:
+            # Tree edge labels sit near the child, where the edges are spread apart
+            if via[tail] == edge:
+                t = 0.3
+            elif via[head] == edge:
+                t = 0.7
+            else:
+                t = 0.5
+            chunk.append(
+                _text(
+                    label_lines(str(label)),
+                    x1 + (x2 - x1) * t + 3,
+                    y1 + (y2 - y1) * t,
+                    paint,
+                    anchor="start",
+                )
+            )
+        chunk.append("</g>\n")
+        if len(chunk) > 4096:
+            write("".join(chunk))
+            chunk.clear()
+    write("".join(chunk))
+    chunk.clear()
+
+    for node, (name, label, style_index) in enumerate(
+        zip(names, graph.labels, node_styles)
+    ):
+        paint = paints[style_index]
+        if "invis" in paint.styles:
+            continue
+        x, y, w, h = xs[node], ys[node], widths[node], heights[node]
+        chunk.append(
+            f'<g id="node{node + 1}" class="node">\n<title>{_escape(name)}</title>\n'
+        )
+        if paint.shape in BOXES:
+            radius = ' rx="8" ry="8"' if "rounded" in paint.styles else ""
+            chunk.append(
+                f'<rect fill="{paint.fill}" {paint.stroke} x="{x - w / 2:.2f}" '
+                f'y="{y - h / 2:.2f}" width="{w:.2f}" height="{h:.2f}"{radius}/>\n'
+            )
+        elif paint.shape not in PLAIN:
+            chunk.append(
+                f'<ellipse fill="{paint.fill}" {paint.stroke} cx="{x:.2f}" cy="{y:.2f}" '
+                f'rx="{w / 2:.2f}" ry="{h / 2:.2f}"/>\n'
+            )
+        chunk.append(
+            _text(label_lines(name if label is None else str(label)), x, y, paint)
+        )
+        chunk.append("</g>\n")
+        if len(chunk) > 4096:
+            write("".join(chunk))
+            chunk.clear()
+    write("".join(chunk))
+    write("</g>\n</svg>\n")
+
+
+def render(graph, filename, directory=None):
+    """
+    Lays out a graph and writes it to an SVG file, without running Graphviz.
+
+    Args:
+        graph (TreeGraph): The graph.
+        filename (str): The output file name, without the extension.
+        directory (str, optional): The output directory. Default is None, the current one.
+
+    Returns:
+        str: The path of the SVG file.
+    """
+    path = os.path.join(directory or "", f"{filename}.svg")
+    with open(path, "w", encoding="utf-8") as stream:
+        write_svg(graph, stream)
+    return path
+
+
+def main(argv=None):
+    from kfm.figures import FIGURES, build
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("names", nargs="+", help="tree figures to render")
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in FIGURES]
+    if unknown:
+        parser.error(f"unknown figures: {', '.join(unknown)}")
+    for name in args.names:
+        start = time.perf_counter()
+        path = render(build(name, graph=TreeGraph), name, args.output_dir)
+        print(f"{path} written in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,555 @@
+"""
+KFM UKC
+UKC builders: English, UKC and Italian clusters linked by dotted alignment edges.
+"""
+
+from functools import lru_cache
+
+# Importing the Graphviz library
+import graphviz
+
+from kfm.branch import BranchIndex
+from kfm.builder import roots_only
+from kfm.hierarchy import Hierarchy
+from kfm.ids import IdAllocator
+from kfm.lexicon import default_lexicon
+from kfm.summarize import is_aggregate, summarize
+from kfm.walk import add_edge, flatten, walk
+from kfm.wordnet import (
+    part_of_tree_events,
+    part_of_tree_location,
+    part_of_tree_people,
+    part_of_tree_urban,
+    tree_event,
+    tree_location,
+    tree_person,
+)
+
+# Identifiers of the UKC and Italian nodes, shared by every figure so that a concept
+# keeps its identifier across figures and runs. The hand-drawn root identifiers are reserved.
+IDS = IdAllocator(digits=5, reserved=["47321", "70650", "55649", "19268"])
+
+# Node ID prefix of every cluster. Each lexicalization cluster is aligned with the UKC one,
+# and its prefix is also its language code in the lexicon (see kfm.lexicon).
+PREFIXES = {"english": "", "italian": "it", "ukc": "ukc_"}
+LEXICALIZATIONS = ("english", "italian")
+
+# Node budget of each tree set in the summary figures, see kfm.summarize
+SUMMARY_NODES = 16
+
+# Label of the aggregate nodes of kfm.summarize in the lexicalization clusters, by
+# language code; other clusters show "+<n>"
+MORE_LABELS = {"it": "altri {}"}
+
+
+def create_label(node, is_translated=False, language=None):
+    """
+    Creates the label of a node for the given cluster language.
+
+    Args:
+        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+        is_translated (bool, optional): Whether the node name is translated. Default is False.
+        language (str, optional): The cluster: "ukc", "italian" or a lexicon language code.
+            Default is None.
+
+    Returns:
+        str: The label of the node.
+    """
+    if is_aggregate(node):
+        # Aggregates stand for no concept: no lemma and no identifier
+        if not is_translated:
+            return node["name"]
+        code = PREFIXES.get(language, language)
+        return MORE_LABELS.get(code, "+{}").format(node["count"])
+    if is_translated and language == "ukc":
+        return IDS.allocate(node["id"], language)
+    if is_translated:
+        # Any other cluster is a lexicalization; unknown languages are lexicon codes
+        code = PREFIXES.get(language, language)
+        lemma = default_lexicon().get(node["id"], code, node["name"])
+        return f"{lemma}\n{code}{IDS.allocate(node['id'], language)}"
+    return f"{node['name']}\nen{node['id']}"
+
+
+def create_node(
+    graph, node, parent=None, relationship="IS-A", is_translated=False, language=None
+):
+    """
+    Creates a node in the graph and links it to the parent node if specified.
+
+    Args:
+        graph (graphviz.Digraph): The Graphviz Digraph object.
+        node (dict): The current node represented as a dictionary with 'name' and 'id' keys.
+        parent (str, optional): The ID of the parent node. Default is None.
+        relationship (str, optional): The relationship type ("IS-A" or "PART-OF"). Default is "IS-A".
+        is_translated (bool, optional): Whether the node name is translated. Default is False.
+        language (str, optional): The language for translation. Default is None.
+    """
+    # Node IDs are prefixed with the cluster language to keep clusters apart
+    prefix = PREFIXES.get(language, "") if is_translated else ""
+
+    # Walking the subtree iteratively, so deep hierarchies do not hit the recursion limit
+    for step in walk([node], parent, relationship, key=lambda n: f"{prefix}{n['id']}"):
+        label = create_label(step.node, is_translated, language)
+        graph.node(step.key, label, shape="box", style="rounded")
+        add_edge(graph, step)
+
+
+def create_alignment_edge(dot, source, target):
+    """
+    Creates a dotted edge aligning a lexicalization with its UKC concept.
+
+    Args:
+        dot (graphviz.Digraph): The Graphviz Digraph object.
+        source (str): The ID of the English or Italian node.
+        target (str): The ID of the UKC node.
+    """
+    dot.edge(source, target, label="", style="dotted", color="#70727B", dir="back")
+
+
+def create_alignment_edges(dot, concept_ids, languages=LEXICALIZATIONS):
+    """
+    Aligns the lexicalization nodes of each concept with its UKC node.
+
+    Args:
+        dot (graphviz.Digraph): The Graphviz Digraph object.
+        concept_ids (iterable): The IDs of the concepts to align.
+        languages (tuple, optional): The lexicalization clusters. Default is LEXICALIZATIONS.
+    """
+    prefixes = [PREFIXES[language] for language in languages]
+    ukc = PREFIXES["ukc"]
+    for concept_id in concept_ids:
+        for prefix in prefixes:
+            create_alignment_edge(dot, f"{prefix}{concept_id}", f"{ukc}{concept_id}")
+
+
+def aligned_concepts(trees, root_id=None, exclude=()):
+    """
+    Collects the concepts to align from the trees in a single pass.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        root_id (str, optional): The ID of the root the trees are attached to. Default is None.
+        exclude (collection, optional): IDs of concepts that are already aligned.
+
+    Returns:
+        list: The IDs of the concepts, each once, in pre-order.
+    """
+    nodes = [node for tree in trees for node in tree]
+    nodes = flatten(nodes, key=lambda node: node["id"])[0]
+    # Aggregate nodes of kfm.summarize stand for no concept, so are not aligned
+    concept_ids = [node["id"] for node in nodes if not is_aggregate(node)]
+    if root_id is not None:
+        concept_ids.insert(0, root_id)
+    return [c for c in dict.fromkeys(concept_ids) if c not in exclude]
+
+
+def create_isa_tree_visualization(trees, graph=graphviz.Digraph):
+    """
+    Creates an IS-A tree visualization from the given trees.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="UKC Tree")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    with dot.subgraph(name="cluster_0") as c:
+        c.attr(label="English")
+        root_id = "01740"
+        c.node(root_id, "entity\nen47321", shape="box", style="rounded")
+
+        for tree in trees:
+            create_node(c, tree[0], root_id)
+
+    with dot.subgraph(name="cluster_1") as c:
+        c.attr(label="UKC")
+        root_id = "ukc_01740"
+        c.node(root_id, IDS.allocate("01740", "ukc"), shape="box", style="rounded")
+
+        for tree in trees:
+            create_node(c, tree[0], root_id, is_translated=True, language="ukc")
+
+    with dot.subgraph(name="cluster_2") as c:
+        c.attr(label="Italiano")
+        root_id = "it01740"
+        c.node(root_id, "entità\nit70650", shape="box", style="rounded")
+
+        for tree in trees:
+            create_node(c, tree[0], root_id, is_translated=True, language="italian")
+
+    create_alignment_edges(dot, aligned_concepts(trees, "01740"))
+
+    return dot
+
+
+def create_part_of_tree_visualization(trees, graph=graphviz.Digraph):
+    """
+    Creates a PART-OF tree visualization from the given trees.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="UKC Tree PART-OF")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    with dot.subgraph(name="cluster_0") as c:
+        c.attr(label="English")
+        root_id = "01740"
+        c.node(root_id, "entity\nen47321", shape="box", style="rounded")
+
+        for tree in trees:
+            create_node(c, tree[0], root_id, relationship="PART-OF")
+
+    with dot.subgraph(name="cluster_1") as c:
+        c.attr(label="UKC")
+        root_id = "ukc_01740"
+        c.node(root_id, IDS.allocate("01740", "ukc"), shape="box", style="rounded")
+
+        for tree in trees:
+            create_node(
+                c,
+                tree[0],
+                root_id,
+                relationship="PART-OF",
+                is_translated=True,
+                language="ukc",
+            )
+
+    with dot.subgraph(name="cluster_2") as c:
+        c.attr(label="Italiano")
+        root_id = "it01740"
+        c.node(root_id, "entità\nit70650", shape="box", style="rounded")
+
+        for tree in trees:
+            create_node(
+                c,
+                tree[0],
+                root_id,
+                relationship="PART-OF",
+                is_translated=True,
+                language="italian",
+            )
+
+    create_alignment_edges(dot, aligned_concepts(trees, "01740"))
+
+    return dot
+
+
+def create_tree_visualization(isa_trees, part_of_trees, graph=graphviz.Digraph):
+    """
+    Creates a combined ISA and PART-OF tree visualization from the given trees.
+
+    Args:
+        isa_trees (list): A list of ISA trees, each represented as a list of dictionaries.
+        part_of_trees (list): A list of PART-OF trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="UKC Tree ISA and PART-OF")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    # English Cluster
+    with dot.subgraph(name="cluster_0") as c:
+        c.attr(label="English")
+        root_id = "01740"
+        c.node(root_id, "entity\nen47321", shape="box", style="rounded")
+
+        for tree in isa_trees:
+            create_node(c, tree[0], root_id, relationship="IS-A")
+
+        rootpartof_id = "45679"
+        c.node(rootpartof_id, "entity\nen47321", shape="box", style="rounded")
+
+        for tree in part_of_trees:
+            create_node(c, tree[0], rootpartof_id, relationship="PART-OF")
+
+    # UKC Cluster
+    with dot.subgraph(name="cluster_1") as c:
+        c.attr(label="UKC")
+        root_id = "ukc_01740"
+        c.node(root_id, IDS.allocate("01740", "ukc"), shape="box", style="rounded")
+
+        for tree in isa_trees:
+            create_node(
+                c,
+                tree[0],
+                root_id,
+                relationship="IS-A",
+                is_translated=True,
+                language="ukc",
+            )
+
+        rootpartof_id = "55649"
+        c.node(rootpartof_id, "55649", shape="box", style="rounded")
+
+        for tree in part_of_trees:
+            create_node(
+                c,
+                tree[0],
+                rootpartof_id,
+                relationship="PART-OF",
+                is_translated=True,
+                language="ukc",
+            )
+
+    # Italian Cluster
+    with dot.subgraph(name="cluster_2") as c:
+        c.attr(label="Italiano")
+        root_id = "it01740"
+        c.node(root_id, "contestuale\nit70650", shape="box", style="rounded")
+
+        for tree in isa_trees:
+            create_node(
+                c,
+                tree[0],
+                root_id,
+                relationship="IS-A",
+                is_translated=True,
+                language="italian",
+            )
+
+        rootpartof_id = "19268"
+        c.node(rootpartof_id, "entità\nen19268", shape="box", style="rounded")
+
+        for tree in part_of_trees:
+            create_node(
+                c,
+                tree[0],
+                rootpartof_id,
+                relationship="PART-OF",
+                is_translated=True,
+                language="italian",
+            )
+
+    # Edges between clusters
+    aligned_isa = aligned_concepts(isa_trees, "01740")
+    create_alignment_edges(dot, aligned_isa)
+    create_alignment_edge(dot, "45679", "55649")
+    create_alignment_edge(dot, "19268", "55649")
+    # PART-OF concepts drawn in the IS-A trees share their nodes and are aligned already
+    create_alignment_edges(
+        dot, aligned_concepts(part_of_trees, exclude=set(aligned_isa))
+    )
+
+    return dot
+
+
+# Definition of the PART-OF trees
+part_of_tree_education = [
+    {
+        "id": "00100",
+        "name": "education",
+        "children": [
+            {"id": "48472", "name": "lecture"},
+            {"id": "61098", "name": "classroom"},
+            {"id": "28560", "name": "academic"},
+            {"id": "08660", "name": "Ph.D."},
+        ],
+    }
+]
+
+# Definition of the reduced PART-OF trees
+reduced_part_of_tree_education = [
+    {
+        "id": "00100",
+        "name": "education",
+        "children": [
+            {"id": "48472", "name": "lecture"},
+            {"id": "25323", "name": "professor"},
+            {"id": "45356", "name": "student"},
+        ],
+    }
+]
+
+reduced_part_of_tree_events = [
+    {
+        "id": "00500",
+        "name": "events",
+        "children": [
+            {"id": "48450", "name": "graduation"},
+        ],
+    }
+]
+
+reduced_part_of_tree_location = [
+    {
+        "id": "20001",
+        "name": "locations",
+        "children": [
+            {"id": "30127", "name": "university"},
+        ],
+    }
+]
+
+# Definition of the reduced IS-A trees
+reduced_tree_event = [
+    {
+        "id": "46884",
+        "name": "event",
+        "children": [
+            {
+                "id": "48370",
+                "name": "university event",
+                "children": [
+                    {"id": "48450", "name": "graduation"},
+                    {"id": "48472", "name": "lecture"},
+                ],
+            },
+        ],
+    }
+]
+
+reduced_tree_location = [
+    {
+        "id": "08094",
+        "name": "location",
+        "children": [
+            {
+                "id": "09526",
+                "name": "urban area",
+                "children": [
+                    {"id": "30127", "name": "university"},
+                ],
+            },
+        ],
+    }
+]
+
+reduced_tree_person = [
+    {
+        "id": "10502",
+        "name": "person",
+        "children": [
+            {
+                "id": "07846",
+                "name": "adult",
+                "children": [
+                    {
+                        "id": "25323",
+                        "name": "professor",
+                    },
+                    {
+                        "id": "45356",
+                        "name": "student",
+                    },
+                ],
+            },
+        ],
+    }
+]
+
+# Combine all ISA and PART-OF trees
+isa_trees = [tree_event, tree_location, tree_person]
+part_of_trees = [
+    part_of_tree_education,
+    part_of_tree_people,
+    part_of_tree_events,
+    part_of_tree_location,
+    part_of_tree_urban,
+]
+
+
+def allocate_identifiers(trees, languages=("ukc", "italian")):
+    """
+    Allocates the identifiers of every concept of the trees, in a fixed order.
+
+    When two concepts hash to the same number the first one allocated keeps it, so
+    allocating the known concepts up front, sorted, makes their identifiers the same
+    whatever figures or branches the process builds first.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        languages (tuple, optional): The clusters of the identifiers. Default is ("ukc", "italian").
+    """
+    concept_ids = sorted(set(aligned_concepts(trees)))
+    for language in languages:
+        IDS.allocate_many(concept_ids, language)
+
+
+allocate_identifiers(
+    [[{"id": "01740", "name": "entity"}]]
+    + isa_trees
+    + part_of_trees
+    + [reduced_tree_event, reduced_tree_location, reduced_tree_person]
+    + [
+        reduced_part_of_tree_education,
+        reduced_part_of_tree_events,
+        reduced_part_of_tree_location,
+    ]
+)
+
+
+@lru_cache(maxsize=None)
+def branches():
+    """
+    Indexes the branches of the UKC IS-A and PART-OF trees, once.
+
+    Returns:
+        BranchIndex: The branch index.
+    """
+    return BranchIndex(Hierarchy.from_trees(isa_trees, part_of_trees))
+
+
+def isa_figure(graph=graphviz.Digraph):
+    """Builds the 'UKC_ISA' figure."""
+    return create_isa_tree_visualization(isa_trees, graph=graph)
+
+
+def isa_reduced_figure(graph=graphviz.Digraph):
+    """Builds the 'UKC_ISA_REDUCED' figure."""
+    return create_isa_tree_visualization(
+        [reduced_tree_event, reduced_tree_location, reduced_tree_person], graph=graph
+    )
+
+
+def part_of_figure(graph=graphviz.Digraph):
+    """Builds the 'UKC_PARTOF' figure, showing only the PART-OF roots."""
+    return create_part_of_tree_visualization(roots_only(part_of_trees), graph=graph)
+
+
+def isa_part_of_figure(graph=graphviz.Digraph):
+    """Builds the 'UKC_ISA_PARTOF' figure."""
+    return create_tree_visualization(isa_trees, part_of_trees, graph=graph)
+
+
+def isa_part_of_reduced_figure(graph=graphviz.Digraph):
+    """Builds the 'UKC_ISA_PARTOF_REDUCED' figure."""
+    return create_tree_visualization(
+        [reduced_tree_location, reduced_tree_event, reduced_tree_person],
+        [
+            reduced_part_of_tree_education,
+            reduced_part_of_tree_events,
+            reduced_part_of_tree_location,
+        ],
+        graph=graph,
+    )
+
+
+def isa_summary_figure(graph=graphviz.Digraph, max_nodes=SUMMARY_NODES):
+    """Builds the 'UKC_ISA_SUMMARY' figure, the IS-A trees summarized to `max_nodes` nodes."""
+    return create_isa_tree_visualization(
+        summarize(isa_trees, max_nodes=max_nodes), graph=graph
+    )
+
+
+def isa_part_of_summary_figure(graph=graphviz.Digraph, max_nodes=SUMMARY_NODES):
+    """Builds the 'UKC_ISA_PARTOF_SUMMARY' figure, each tree set summarized to `max_nodes` nodes."""
+    return create_tree_visualization(
+        summarize(isa_trees, max_nodes=max_nodes),
+        summarize(part_of_trees, max_nodes=max_nodes),
+        graph=graph,
+    )
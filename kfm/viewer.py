@@ -0,0 +1,227 @@
+"""
+KFM VIEWER
+Lazy HTML viewer of the IS-A and PART-OF hierarchies, served from a static directory.
+
+A PDF of a large hierarchy has to be parsed whole before anything is shown. The
+viewer export writes the same trees as `create_tree_visualization` into a
+directory the browser reads piece by piece:
+    - index.json: the roots of every hierarchy and their first `levels` levels;
+    - shards/*.json: one file per deeper subtree, holding its next `levels`
+      levels, fetched when the subtree is expanded;
+    - index.html: the viewer, with collapsible, zoomable trees.
+Subtrees of at most `inline` concepts are kept inside their parent's file
+instead of getting a shard, and a concept drawn below several parents (as in
+the WNDB trees, see kfm.wndb) is written to a single shard:
+
+    export("viewer", wordnet.isa_trees, wordnet.part_of_trees)
+
+The directory is static; browsers do not fetch files over file://, so serve it:
+
+    python -m kfm.viewer wordnet viewer
+    python -m http.server --directory viewer 8000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from collections import deque
+
+# The viewer page, copied as index.html
+VIEWER_HTML = os.path.join(os.path.dirname(__file__), "data", "viewer.html")
+
+# Levels of the hierarchy held by index.json and by every shard
+LEVELS = 3
+
+# Subtrees of at most this many concepts are not split off into a shard
+INLINE = 64
+
+# The roots the WordNet figures attach the trees to, see wordnet.create_tree_visualization
+WORDNET_ROOTS = {
+    "IS-A": {"id": "47321", "name": "entity"},
+    "PART-OF": {"id": "01740", "name": "entity"},
+}
+
+
+def subtree_sizes(roots):
+    """
+    Counts the concepts below every node, iteratively.
+
+    A dictionary shared by several parents is counted once per parent, as it is drawn.
+
+    Args:
+        roots (list): The root nodes, each represented as a dictionary.
+
+    Returns:
+        dict: id() of every node -> the number of nodes in its subtree, itself included.
+    """
+    sizes = {}
+    stack = [(node, False) for node in roots]
+    while stack:
+        node, expanded = stack.pop()
+        key = id(node)
+        if key in sizes:
+            continue
+        children = node.get("children", ())
+        if expanded or not children:
+            sizes[key] = 1 + sum(sizes[id(child)] for child in children)
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children if id(child) not in sizes)
+    return sizes
+
+
+def shard(roots, prefix, levels=LEVELS, inline=INLINE):
+    """
+    Cuts a hierarchy into its top levels and shards of the deeper subtrees.
+
+    Args:
+        roots (list): The root nodes, each represented as a dictionary.
+        prefix (str): The prefix of the shard file names.
+        levels (int, optional): The levels of every piece. Default is LEVELS.
+        inline (int, optional): The size of the subtrees never split off. Default is INLINE.
+
+    Yields:
+        tuple: (file name, nodes), breadth-first; the first piece, named None, holds
+            the roots. Every node has 'id' and 'name' keys; a node with children also
+            has 'size', the number of concepts below it, and either 'children' or
+            'shard', the file holding its children.
+    """
+    sizes = subtree_sizes(roots)
+    files = {}
+    queue = deque([(None, roots)])
+    while queue:
+        file, nodes = queue.popleft()
+        piece = []
+        stack = [(nodes, piece, 0)]
+        while stack:
+            children, records, depth = stack.pop()
+            for node in children:
+                record = {"id": node["id"], "name": node["name"]}
+                records.append(record)
+                grandchildren = node.get("children")
+                if not grandchildren:
+                    continue
+                size = record["size"] = sizes[id(node)] - 1
+                if depth + 1 < levels or size <= inline:
+                    record["children"] = []
+                    stack.append((grandchildren, record["children"], depth + 1))
+                    continue
+                # A node shared by several parents is split off once
+                record["shard"] = files.get(id(node))
+                if record["shard"] is None:
+                    record["shard"] = files[id(node)] = (
+                        f"{prefix}-{len(files) + 1}.json"
+                    )
+                    queue.append((record["shard"], grandchildren))
+        yield file, piece
+
+
+def _write_json(path, value):
+    with open(path, "w", encoding="utf-8") as stream:
+        json.dump(value, stream, ensure_ascii=False, separators=(",", ":"))
+
+
+def export(
+    directory,
+    isa_trees,
+    part_of_trees,
+    title="WordNet",
+    roots=WORDNET_ROOTS,
+    levels=LEVELS,
+    inline=INLINE,
+):
+    """
+    Writes the lazy HTML viewer of an IS-A and a PART-OF hierarchy to a directory.
+
+    Shards left by a previous export to the same directory are removed.
+
+    Args:
+        directory (str): The output directory, created if needed.
+        isa_trees (list): A list of ISA trees, each represented as a list of dictionaries.
+        part_of_trees (list): A list of PART-OF trees, each represented as a list of dictionaries.
+        title (str, optional): The title of the page. Default is "WordNet".
+        roots (dict, optional): Relationship -> the root node the trees are attached to,
+            or None to show the roots of the trees. Default is WORDNET_ROOTS.
+        levels (int, optional): The levels of index.json and of every shard. Default is LEVELS.
+        inline (int, optional): The size of the subtrees never split off. Default is INLINE.
+
+    Returns:
+        int: The number of shard files written.
+    """
+    shard_dir = os.path.join(directory, "shards")
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    os.makedirs(shard_dir)
+    hierarchies = []
+    written = 0
+    for relationship, trees in (("IS-A", isa_trees), ("PART-OF", part_of_trees)):
+        nodes = [node for tree in trees for node in tree]
+        root = (roots or {}).get(relationship)
+        if root is not None:
+            nodes = [{**root, "children": nodes}]
+        for file, piece in shard(nodes, relationship.lower(), levels, inline):
+            if file is None:
+                hierarchies.append({"relation": relationship, "roots": piece})
+            else:
+                _write_json(os.path.join(shard_dir, file), piece)
+                written += 1
+    _write_json(
+        os.path.join(directory, "index.json"),
+        {"title": title, "hierarchies": hierarchies},
+    )
+    shutil.copyfile(VIEWER_HTML, os.path.join(directory, "index.html"))
+    return written
+
+
+def _wordnet():
+    from kfm import wordnet
+
+    return wordnet.isa_trees, wordnet.part_of_trees, "WordNet", WORDNET_ROOTS
+
+
+def _ukc():
+    from kfm import ukc
+
+    roots = {
+        "IS-A": {"id": "01740", "name": "entity"},
+        "PART-OF": {"id": "45679", "name": "entity"},
+    }
+    return ukc.isa_trees, ukc.part_of_trees, "UKC", roots
+
+
+def _wndb():
+    from kfm.wndb import WordNet
+
+    wordnet = WordNet.load(pos=("n",))
+    return wordnet.trees("IS-A"), wordnet.trees("PART-OF"), "WordNet nouns", None
+
+
+# Dataset name -> function returning its (IS-A trees, PART-OF trees, title, roots)
+DATASETS = {"wordnet": _wordnet, "ukc": _ukc, "wndb": _wndb}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--levels", type=int, default=LEVELS)
+    parser.add_argument("--inline", type=int, default=INLINE)
+    args = parser.parse_args(argv)
+
+    isa_trees, part_of_trees, title, roots = DATASETS[args.dataset]()
+    written = export(
+        args.directory,
+        isa_trees,
+        part_of_trees,
+        title,
+        roots,
+        levels=args.levels,
+        inline=args.inline,
+    )
+    print(f"{os.path.join(args.directory, 'index.html')} written with {written} shards")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+KFM WALK
+Iterative, stack-based traversal of the nested-dict hierarchies used by the scripts.
+
+The trees are lists of dictionaries with 'id', 'name' and optional 'children' keys.
+`walk` visits them in the same pre-order as the recursive `create_node` functions,
+but keeps an explicit stack, so hierarchies of any depth can be processed without
+hitting the interpreter recursion limit.
+"""
+
+from collections import namedtuple
+
+# A single visit: the node dictionary, its graph key, the key of its parent
+# (None for roots), the relationship linking it to the parent and its depth.
+Step = namedtuple("Step", ["node", "key", "parent", "relationship", "depth"])
+
+# Edge semantics per relationship: whether the edge is drawn from the parent to
+# the child (instead of child to parent) and the Graphviz attributes to use.
+EDGE_STYLES = {
+    "IS-A": (False, {"label": "IS-A"}),
+    "ISA": (False, {"label": "IS-A"}),
+    "PART-OF": (True, {"label": "PART-OF", "style": "dashed", "dir": "back"}),
+}
+
+
+def default_key(node):
+    """
+    Returns the key used for a node by the WordNet and teleology scripts.
+
+    Args:
+        node (dict): The node represented as a dictionary with 'name' and 'id' keys.
+
+    Returns:
+        str: The "name_id" key of the node.
+    """
+    return f"{node['name']}_{node['id']}"
+
+
+def walk(nodes, parent=None, relationship="IS-A", key=default_key):
+    """
+    Walks one or more trees depth-first, yielding one step per node.
+
+    Args:
+        nodes (list): The root nodes to walk, each represented as a dictionary.
+        parent (str, optional): The key the roots are attached to. Default is None.
+        relationship (str, optional): The relationship linking every node to its parent.
+            If None, each node's own 'relationship' key is used. Default is "IS-A".
+        key (callable, optional): Function mapping a node to its graph key.
+
+    Yields:
+        Step: The visited node, in the same order as a recursive pre-order traversal.
+    """
+    # Steps are built with tuple.__new__, skipping the keyword handling of Step()
+    new = tuple.__new__
+    # The stack holds one iterator per open level instead of one entry per node
+    stack = [(iter(nodes), parent, 0)]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        children, parent_key, depth = stack[-1]
+        for node in children:
+            node_key = key(node)
+            yield new(
+                Step,
+                (
+                    node,
+                    node_key,
+                    parent_key,
+                    node["relationship"] if relationship is None else relationship,
+                    depth,
+                ),
+            )
+            grandchildren = node.get("children")
+            if grandchildren:
+                push((iter(grandchildren), node_key, depth + 1))
+                break
+        else:
+            pop()
+
+
+def flatten(nodes, parent=None, key=default_key):
+    """
+    Flattens one or more trees into parallel columns in a single pass.
+
+    This is the bulk counterpart of `walk`: no per-node objects are created,
+    which makes it the fastest way to turn a large hierarchy into node and edge records.
+
+    Args:
+        nodes (list): The root nodes to walk, each represented as a dictionary.
+        parent (str, optional): The key the roots are attached to. Default is None.
+        key (callable, optional): Function mapping a node to its graph key.
+
+    Returns:
+        tuple: Four lists (nodes, keys, parent keys, depths) in pre-order.
+    """
+    visited, keys, parents, depths = [], [], [], []
+    add_node, add_key = visited.append, keys.append
+    add_parent, add_depth = parents.append, depths.append
+    stack = [(iter(nodes), parent, 0)]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        children, parent_key, depth = stack[-1]
+        for node in children:
+            node_key = key(node)
+            add_node(node)
+            add_key(node_key)
+            add_parent(parent_key)
+            add_depth(depth)
+            grandchildren = node.get("children")
+            if grandchildren:
+                push((iter(grandchildren), node_key, depth + 1))
+                break
+        else:
+            pop()
+    return visited, keys, parents, depths
+
+
+def edge(step):
+    """
+    Returns the edge linking a step to its parent, following the IS-A / PART-OF conventions.
+
+    IS-A edges go from the child to the parent, PART-OF edges go from the parent
+    to the child and are drawn dashed with the arrow reversed.
+
+    Args:
+        step (Step): A step produced by `walk`.
+
+    Returns:
+        tuple: (tail, head, attributes), or None if the step has no parent.
+    """
+    if not step.parent:
+        return None
+    reverse, attributes = EDGE_STYLES[step.relationship]
+    if reverse:
+        return step.parent, step.key, attributes
+    return step.key, step.parent, attributes
+
+
+def add_edge(graph, step):
+    """
+    Adds the edge linking a step to its parent, if it has one.
+
+    Args:
+        graph (graphviz.Digraph): The Graphviz Digraph object.
+        step (Step): A step produced by `walk`.
+    """
+    linked = edge(step)
+    if linked:
+        graph.edge(linked[0], linked[1], **linked[2])
@@ -0,0 +1,254 @@
+"""
+KFM WNDB
+Bulk loader of the WordNet database files (data.noun, index.noun, ...) into the tree model.
+
+The WNDB data files hold one synset per line: its offset, lexicographer file,
+type, words and pointers, then the gloss. The files are memory-mapped and
+parsed line by line, keeping only the names of the synsets and the pointers of
+the relations used by the figures:
+    - IS-A: hypernyms and instance hypernyms (@, @i) of a synset;
+    - PART-OF: part, member and substance holonyms (#p, #m, #s) of a synset.
+Each synset is identified by its offset and part of speech, e.g. "02084071-n",
+and named after its first word:
+
+    wn = WordNet.load("/usr/share/wordnet")
+    event = wn.synsets("event")[0]
+    trees = wn.trees("IS-A", roots=[event])
+    dot = wordnet.create_isa_tree_visualization(trees)
+
+The trees are nested dictionaries, as consumed by kfm.builder.create_node and
+Hierarchy.from_trees. A synset with several parents is a single dictionary
+shared by all of them.
+"""
+
+import mmap
+import os
+from collections import deque
+
+# Part of speech letter -> suffix of the WNDB file names
+POS_FILES = {"n": "noun", "v": "verb", "a": "adj", "r": "adv"}
+
+# Relationship -> pointer symbols linking a synset to its parents
+RELATION_POINTERS = {
+    "IS-A": (b"@", b"@i"),
+    "PART-OF": (b"#p", b"#m", b"#s"),
+}
+
+
+def default_directory():
+    """
+    Returns the WordNet "dict" directory named by the environment, as the WordNet tools do.
+
+    Returns:
+        str: $WNSEARCHDIR, else $WNHOME/dict, else "/usr/share/wordnet".
+    """
+    if os.environ.get("WNSEARCHDIR"):
+        return os.environ["WNSEARCHDIR"]
+    if os.environ.get("WNHOME"):
+        return os.path.join(os.environ["WNHOME"], "dict")
+    return "/usr/share/wordnet"
+
+
+def _lines(path):
+    """Yields the lines of a file through a read-only memory map."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from iter(buffer.readline, b"")
+
+
+def read_data(path):
+    """
+    Parses a WNDB data file.
+
+    Args:
+        path (str): The path of a data file, e.g. "dict/data.noun".
+
+    Yields:
+        tuple: (offset, words, pointers) of every synset, as bytes: the 8-digit
+            offset, the list of words and the flat list of pointer fields
+            (symbol, offset, part of speech, source/target) of the synset.
+    """
+    for line in _lines(path):
+        # The license header lines start with two spaces
+        if line[:1] == b" ":
+            continue
+        gloss = line.find(b" | ")
+        fields = (line[:gloss] if gloss >= 0 else line).split()
+        words_end = 4 + 2 * int(fields[3], 16)
+        pointers_end = words_end + 1 + 4 * int(fields[words_end])
+        yield fields[0], fields[4:words_end:2], fields[words_end + 1 : pointers_end]
+
+
+def read_index(path):
+    """
+    Parses a WNDB index file.
+
+    Args:
+        path (str): The path of an index file, e.g. "dict/index.noun".
+
+    Yields:
+        tuple: (lemma, offsets) of every lemma, as bytes, the offsets in sense order.
+    """
+    for line in _lines(path):
+        if line[:1] == b" ":
+            continue
+        fields = line.split()
+        synsets = int(fields[2])
+        yield fields[0], fields[len(fields) - synsets :]
+
+
+class WordNet:
+    """
+    Synset names and IS-A/PART-OF parents loaded from the WNDB files.
+
+    Attributes:
+        directory (str): The WordNet "dict" directory.
+        names (dict): Synset ID -> name.
+        children (dict): Relationship -> {synset ID: child synset IDs, in file order}.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.names = {}
+        self.children = {relationship: {} for relationship in RELATION_POINTERS}
+        self._parents = {relationship: set() for relationship in RELATION_POINTERS}
+        self._index = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def load(cls, directory=None, pos=("n", "v")):
+        """
+        Loads the synsets of one or more parts of speech.
+
+        Args:
+            directory (str, optional): The WordNet "dict" directory. Default is default_directory().
+            pos (tuple, optional): The parts of speech to load, as keys of POS_FILES. Default is ("n", "v").
+
+        Returns:
+            WordNet: The loaded synsets.
+        """
+        wordnet = cls(directory or default_directory())
+        for letter in pos:
+            wordnet.add_data(
+                os.path.join(wordnet.directory, f"data.{POS_FILES[letter]}"), letter
+            )
+        return wordnet
+
+    def add_data(self, path, pos):
+        """
+        Adds the synsets of a data file.
+
+        Args:
+            path (str): The path of the data file.
+            pos (str): Its part of speech, a key of POS_FILES.
+        """
+        names = self.names
+        relations = [
+            (set(symbols), self.children[relationship], self._parents[relationship])
+            for relationship, symbols in RELATION_POINTERS.items()
+        ]
+        suffix = f"-{pos}"
+        for offset, words, pointers in read_data(path):
+            synset = offset.decode() + suffix
+            names[synset] = words[0].decode().replace("_", " ")
+            for position in range(0, len(pointers), 4):
+                symbol = pointers[position]
+                for symbols, children, has_parents in relations:
+                    if symbol in symbols:
+                        # Adjective satellites ("s") are stored in data.adj
+                        target_pos = pointers[position + 2].replace(b"s", b"a")
+                        parent = (
+                            f"{pointers[position + 1].decode()}-{target_pos.decode()}"
+                        )
+                        children.setdefault(parent, []).append(synset)
+                        has_parents.add(synset)
+
+    def synsets(self, lemma, pos="n"):
+        """
+        Returns the synsets of a lemma, loading index.<pos> on first use.
+
+        Args:
+            lemma (str): The lemma, e.g. "university event" or "university_event".
+            pos (str, optional): The part of speech. Default is "n".
+
+        Returns:
+            list: The synset IDs, most frequent sense first; empty for unknown lemmas.
+        """
+        index = self._index.get(pos)
+        if index is None:
+            path = os.path.join(self.directory, f"index.{POS_FILES[pos]}")
+            index = self._index[pos] = dict(read_index(path))
+        offsets = index.get(lemma.lower().replace(" ", "_").encode(), ())
+        return [f"{offset.decode()}-{pos}" for offset in offsets]
+
+    def roots(self, relationship="IS-A"):
+        """
+        Returns the synsets with children but no parent in a relation.
+
+        Args:
+            relationship (str, optional): The relation, a key of RELATION_POINTERS. Default is "IS-A".
+
+        Returns:
+            list: The root synset IDs.
+        """
+        has_parents = self._parents[relationship]
+        return [
+            synset
+            for synset in self.children[relationship]
+            if synset not in has_parents
+        ]
+
+    def trees(self, relationship="IS-A", roots=None):
+        """
+        Converts a relation into nested-dict trees.
+
+        Args:
+            relationship (str, optional): The relation, a key of RELATION_POINTERS. Default is "IS-A".
+            roots (list, optional): The synset IDs of the roots. Default is every root of the relation.
+
+        Returns:
+            list: The trees, each represented as a list holding its root dictionary.
+
+        Raises:
+            ValueError: If the relation has a cycle below the roots.
+        """
+        children = self.children[relationship]
+        roots = self.roots(relationship) if roots is None else list(roots)
+
+        # Synsets below the roots and how many parents each has among them
+        parents = dict.fromkeys(roots, 0)
+        stack = list(roots)
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in parents:
+                    parents[child] = 0
+                    stack.append(child)
+                parents[child] += 1
+
+        # Kahn's algorithm: every synset must be reached once all its parents are
+        queue = deque(synset for synset in roots if not parents[synset])
+        ordered = 0
+        while queue:
+            ordered += 1
+            for child in children.get(queue.popleft(), ()):
+                parents[child] -= 1
+                if not parents[child]:
+                    queue.append(child)
+        if ordered < len(parents):
+            cyclic = next(synset for synset, count in parents.items() if count)
+            raise ValueError(f"{relationship} has a cycle through {cyclic}")
+
+        names = self.names
+        nodes = {
+            synset: {"id": synset, "name": names.get(synset, synset)}
+            for synset in parents
+        }
+        for synset, node in nodes.items():
+            synset_children = children.get(synset)
+            if synset_children:
+                node["children"] = [nodes[child] for child in synset_children]
+        return [[nodes[root]] for root in roots]
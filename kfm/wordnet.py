@@ -0,0 +1,356 @@
+"""
+KFM WORDNET
+WordNet IS-A and PART-OF trees and the builders of the WordNet figures.
+"""
+
+from functools import lru_cache
+
+import graphviz
+
+from kfm.branch import BranchIndex
+from kfm.builder import create_node, roots_only
+from kfm.hierarchy import Hierarchy
+
+
+def create_isa_tree_visualization(
+    trees, graph=graphviz.Digraph, create_node=create_node
+):
+    """
+    Creates an IS-A tree visualization from the given trees.
+
+    Args:
+        trees (list): A list of trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+        create_node (callable, optional): The builder of each subtree. Default is kfm.builder.create_node;
+            see kfm.incremental for a builder reusing unchanged subtrees.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="WordNet Tree")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    # Creating the root node "entity"
+    root_id = "entity_01740"
+    dot.node(root_id, "entity\n47321", shape="box", style="rounded")
+
+    # Creating nodes for each tree and linking to the root
+    for tree in trees:
+        create_node(dot, tree[0], root_id, "IS-A", shape="box")
+
+    return dot
+
+
+def create_part_of_tree_visualization(
+    part_of_trees, graph=graphviz.Digraph, create_node=create_node
+):
+    """
+    Creates a PART-OF tree visualization from the given trees.
+
+    Args:
+        part_of_trees (list): A list of PART-OF trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+        create_node (callable, optional): The builder of each subtree. Default is kfm.builder.create_node;
+            see kfm.incremental for a builder reusing unchanged subtrees.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="WordNet PART-OF Hierarchical Tree")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    # Creating the root node for PART-OF trees
+    part_of_root_id = "entitypartof_01740"
+    dot.node(part_of_root_id, "entity\n01740", shape="rect", style="rounded")
+
+    # Creating nodes for each tree and linking to the root
+    for tree in part_of_trees:
+        for subtree in tree:
+            create_node(dot, subtree, part_of_root_id, "PART-OF")
+
+    return dot
+
+
+def create_tree_visualization(
+    isa_trees, part_of_trees, graph=graphviz.Digraph, create_node=create_node
+):
+    """
+    Creates a combined ISA and PART-OF tree visualization from the given trees.
+
+    Args:
+        isa_trees (list): A list of ISA trees, each represented as a list of dictionaries.
+        part_of_trees (list): A list of PART-OF trees, each represented as a list of dictionaries.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+        create_node (callable, optional): The builder of each subtree. Default is kfm.builder.create_node;
+            see kfm.incremental for a builder reusing unchanged subtrees.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    dot = graph(comment="WordNet Hierarchical Trees")
+    dot.attr(rankdir="BT")  # Bottom to Top direction
+
+    # Create nodes for ISA trees
+    root_id = "entityisa_01740"
+    dot.node(root_id, "entity\n47321", shape="rect", style="rounded")
+    for tree in isa_trees:
+        for subtree in tree:
+            create_node(dot, subtree, root_id, "ISA")
+
+    # Create nodes for PART-OF tree
+    part_of_root_id = "entitypartof_01740"
+    dot.node(part_of_root_id, "entity\n01740", shape="rect", style="rounded")
+    for tree in part_of_trees:
+        for subtree in tree:
+            create_node(dot, subtree, part_of_root_id, "PART-OF")
+
+    return dot
+
+
+# Definition of PART-OF trees
+part_of_tree_education = [
+    {
+        "id": "00100",
+        "name": "education",
+        "children": [
+            {"id": "28560", "name": "academic"},
+            {"id": "08660", "name": "Ph.D."},
+        ],
+    }
+]
+
+part_of_tree_events = [
+    {
+        "id": "00500",
+        "name": "events",
+        "children": [
+            {"id": "48450", "name": "graduation"},
+            {"id": "48472", "name": "lecture"},
+            {"id": "47358", "name": "conference"},
+            {"id": "47375", "name": "seminar"},
+        ],
+    }
+]
+
+part_of_tree_urban = [
+    {
+        "id": "00200",
+        "name": "urban",
+        "children": [
+            {"id": "30582", "name": "downtown"},
+        ],
+    }
+]
+
+part_of_tree_location = [
+    {
+        "id": "20001",
+        "name": "locations",
+        "children": [
+            {"id": "12912", "name": "facility"},
+            {"id": "30145", "name": "business district"},
+            {"id": "61098", "name": "classroom"},
+            {"id": "24960", "name": "dormitory"},
+            {"id": "58821", "name": "library"},
+        ],
+    }
+]
+
+part_of_tree_people = [
+    {
+        "id": "00600",
+        "name": "people",
+        "children": [
+            {"id": "07698", "name": "child"},
+            {"id": "56237", "name": "undergraduate"},
+            {"id": "65489", "name": "graduate"},
+        ],
+    },
+]
+
+# Definition of IS-A trees
+tree_event = [
+    {
+        "id": "46884",
+        "name": "event",
+        "children": [
+            {
+                "id": "46988",
+                "name": "social event",
+                "children": [
+                    {
+                        "id": "48370",
+                        "name": "university event",
+                        "children": [
+                            {"id": "48450", "name": "graduation"},
+                            {"id": "48472", "name": "lecture"},
+                        ],
+                    },
+                ],
+            },
+            {
+                "id": "47309",
+                "name": "professional event",
+                "children": [
+                    {"id": "47358", "name": "conference"},
+                    {"id": "47375", "name": "seminar"},
+                ],
+            },
+        ],
+    }
+]
+
+tree_location = [
+    {
+        "id": "08094",
+        "name": "location",
+        "children": [
+            {
+                "id": "09265",
+                "name": "geographic area",
+                "children": [
+                    {
+                        "id": "09526",
+                        "name": "urban area",
+                        "children": [
+                            {
+                                "id": "30127",
+                                "name": "university",
+                                "children": [
+                                    {"id": "61098", "name": "classroom"},
+                                    {"id": "24960", "name": "dormitory"},
+                                    {"id": "58821", "name": "library"},
+                                ],
+                            },
+                            {"id": "30582", "name": "downtown"},
+                            {"id": "30145", "name": "business district"},
+                        ],
+                    },
+                    {"id": "12912", "name": "facility"},
+                ],
+            },
+        ],
+    }
+]
+
+tree_person = [
+    {
+        "id": "10502",
+        "name": "person",
+        "children": [
+            {
+                "id": "07846",
+                "name": "adult",
+                "children": [
+                    {
+                        "id": "08659",
+                        "name": "professional",
+                        "children": [
+                            {
+                                "id": "25323",
+                                "name": "professor",
+                                "children": [
+                                    {"id": "28560", "name": "academic"},
+                                    {"id": "08660", "name": "Ph.D."},
+                                ],
+                            },
+                        ],
+                    },
+                    {
+                        "id": "45356",
+                        "name": "student",
+                        "children": [
+                            {"id": "56237", "name": "undergraduate"},
+                            {"id": "65489", "name": "graduate"},
+                        ],
+                    },
+                ],
+            },
+            {
+                "id": "07698",
+                "name": "child",
+            },
+        ],
+    }
+]
+
+# Combine all trees
+isa_trees = [tree_event, tree_location, tree_person]
+part_of_trees = [
+    part_of_tree_events,
+    part_of_tree_location,
+    part_of_tree_urban,
+    part_of_tree_education,
+    part_of_tree_people,
+]
+
+
+def isa_figure(graph=graphviz.Digraph):
+    """Builds the 'wordnet_ISA' figure."""
+    return create_isa_tree_visualization(isa_trees, graph=graph)
+
+
+def part_of_figure(graph=graphviz.Digraph):
+    """Builds the 'wordnet_PARTOF' figure, showing only the PART-OF roots."""
+    return create_part_of_tree_visualization(
+        roots_only(
+            [
+                part_of_tree_education,
+                part_of_tree_people,
+                part_of_tree_events,
+                part_of_tree_location,
+                part_of_tree_urban,
+            ]
+        ),
+        graph=graph,
+    )
+
+
+def isa_part_of_figure(graph=graphviz.Digraph):
+    """Builds the 'wordnet_ISA&PARTOF' figure with all three branches."""
+    return create_tree_visualization(isa_trees, part_of_trees, graph=graph)
+
+
+@lru_cache(maxsize=None)
+def branches():
+    """
+    Indexes the branches of the master IS-A and PART-OF trees, once.
+
+    Returns:
+        BranchIndex: The branch index.
+    """
+    return BranchIndex(Hierarchy.from_trees(isa_trees, part_of_trees))
+
+
+def branch_figure(root_ids, graph=graphviz.Digraph):
+    """
+    Builds the figure of the IS-A branches below some concepts and the PART-OF edges touching them.
+
+    Args:
+        root_ids (list): The identifiers of the root concepts, e.g. ["46884"] for event.
+        graph (callable, optional): The graph factory, called with the comment of the graph.
+            Default is graphviz.Digraph; see kfm.dotwriter for streaming writers.
+
+    Returns:
+        graphviz.Digraph: The resulting Graphviz Digraph object.
+    """
+    branch = branches().extract(root_ids)
+    return create_tree_visualization(branch.trees, branch.attached, graph=graph)
+
+
+def event_branch_figure(graph=graphviz.Digraph):
+    """Builds the 'wordnet_ISA&PARTOF_EVENT' figure."""
+    return branch_figure(["46884"], graph=graph)
+
+
+def location_branch_figure(graph=graphviz.Digraph):
+    """Builds the 'wordnet_ISA&PARTOF_LOCATION' figure."""
+    return branch_figure(["08094"], graph=graph)
+
+
+def person_branch_figure(graph=graphviz.Digraph):
+    """Builds the 'wordnet_ISA&PARTOF_PERSON' figure."""
+    return branch_figure(["10502"], graph=graph)